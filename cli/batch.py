@@ -0,0 +1,81 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of validator-cli
+#
+#   Copyright (C) 2022 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import click
+
+from core.batch import run_batch, sign_batch
+from utils.helper import abort_if_false, transaction_cmd
+from utils.texts import TEXTS as G_TEXTS
+
+
+TEXTS = G_TEXTS['batch']
+
+
+@click.group()
+def batch_cli():
+    pass
+
+
+@batch_cli.group('batch', help=TEXTS['help'])
+def batch():
+    pass
+
+
+@batch.command('run', help=TEXTS['run']['help'])
+@transaction_cmd
+@click.argument('plan_file', type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    '--journal',
+    type=click.Path(dir_okay=False),
+    help=TEXTS['run']['journal']['help']
+)
+@click.option(
+    '--continue-on-error',
+    is_flag=True,
+    help=TEXTS['run']['continue_on_error']['help']
+)
+@click.option('--yes', is_flag=True, callback=abort_if_false,
+              expose_value=False,
+              prompt=TEXTS['run']['confirm'])
+def _run(plan_file, journal, continue_on_error, pk_file, fee):
+    run_batch(
+        plan_filepath=plan_file,
+        pk_file=pk_file,
+        fee=fee,
+        journal_filepath=journal,
+        continue_on_error=continue_on_error
+    )
+
+
+@batch.command('sign', help=TEXTS['sign']['help'])
+@transaction_cmd
+@click.argument('plan_file', type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    '--output', '-o',
+    type=click.Path(dir_okay=False),
+    required=True,
+    help=TEXTS['sign']['output']['help']
+)
+def _sign(plan_file, output, pk_file, fee):
+    sign_batch(
+        plan_filepath=plan_file,
+        pk_file=pk_file,
+        fee=fee,
+        signed_filepath=output
+    )
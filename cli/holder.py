@@ -19,17 +19,16 @@
 
 import click
 
-from utils.texts import Texts
+from utils.texts import TEXTS as G_TEXTS
 from utils.helper import abort_if_false
-from core.holder import (delegate, delegations,
-                         cancel_pending_delegation, locked,
+from core.holder import (delegate, delegate_batch, delegations,
+                         cancel_pending_delegation, locked, sweep_bounties,
                          undelegate, withdraw_bounty, earned_bounties)
-from utils.constants import DELEGATION_PERIOD_OPTIONS
+from utils.constants import BOUNTY_SWEEP_MIN_AMOUNT, DELEGATION_PERIOD_OPTIONS
 from utils.helper import transaction_cmd
 from utils.validations import EthAddressType
 
 
-G_TEXTS = Texts()
 TEXTS = G_TEXTS['holder']
 
 ETH_ADDRESS_TYPE = EthAddressType()
@@ -86,6 +85,25 @@ def _delegate(validator_id, amount, delegation_period, info, pk_file,
     )
 
 
+@holder.command('delegate-batch', help=TEXTS['delegate_batch']['help'])
+@transaction_cmd
+@click.option(
+    '--from-csv',
+    type=click.Path(exists=True, dir_okay=False),
+    required=True,
+    help=TEXTS['delegate_batch']['from_csv']['help']
+)
+@click.option('--yes', is_flag=True, callback=abort_if_false,
+              expose_value=False,
+              prompt=TEXTS['delegate_batch']['confirm'])
+def _delegate_batch(from_csv, pk_file, fee):
+    delegate_batch(
+        csv_filepath=from_csv,
+        pk_file=pk_file,
+        fee=fee
+    )
+
+
 @holder.command('delegations', help=TEXTS['delegations']['help'])
 @click.argument('address')
 @click.option('--wei', '-w', is_flag=True, help=TEXTS['delegations']['wei']['help'])
@@ -142,6 +160,27 @@ def _withdraw_bounty(
     )
 
 
+@holder.command('sweep-bounties', help=TEXTS['sweep_bounties']['help'])
+@transaction_cmd
+@click.argument('recipient_address', type=ETH_ADDRESS_TYPE, required=False)
+@click.option(
+    '--min-amount',
+    type=click.FloatRange(min=0),
+    default=BOUNTY_SWEEP_MIN_AMOUNT,
+    show_default=True,
+    help=TEXTS['sweep_bounties']['min_amount']['help']
+)
+@click.option('--yes', is_flag=True, help=TEXTS['sweep_bounties']['confirm']['help'])
+def _sweep_bounties(recipient_address, min_amount, yes, pk_file, fee):
+    sweep_bounties(
+        recipient_address,
+        min_amount=min_amount,
+        yes=yes,
+        pk_file=pk_file,
+        fee=fee
+    )
+
+
 @holder.command('locked', help=TEXTS['locked']['help'])
 @click.argument('address')
 @click.option('--wei', '-w', is_flag=True, help=TEXTS['locked']['wei']['help'])
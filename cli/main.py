@@ -22,33 +22,58 @@ import logging
 import inspect
 
 import click
-from skale.transactions.exceptions import TransactionError, RevertError
 
 from cli import __version__
-from cli.info import BUILD_DATETIME, COMMIT, BRANCH, OS, VERSION
-from cli.validator import validator_cli
-# from cli.metrics import metrics_cli
-from cli.holder import holder_cli
-from cli.sgx_wallet import sgx_cli
-from cli.wallet import wallet_cli
-from cli.srw import srw_cli
-from utils.validations import UrlType
-from utils.texts import Texts
+from core.daemon import forward_to_daemon
+from utils.abi import AbiBundleError, compile_abi_bundle
+from utils.block_pin import pin_block
+from utils.lazy_group import LazyGroup
+from utils.rpc_profiler import enable_rpc_profiling
+from utils.validations import BlockIdentifierType, UrlType
+from utils.texts import TEXTS
 from utils.logs import init_logger, init_log_dir
 from utils.helper import safe_mk_dirs, write_json, download_file, error_exit
 from utils.exit_codes import CLIExitCodes
 from utils.constants import (SKALE_VAL_CONFIG_FOLDER, SKALE_VAL_CONFIG_FILE,
-                             SKALE_VAL_ABI_FILE, LONG_LINE, WALLET_TYPES)
+                             SKALE_VAL_ABI_FILE, LONG_LINE, WALLET_TYPES, PROFILE_RPC)
 
 
 logger = logging.getLogger(__name__)
+
+# cli/info.py is generated by scripts/build.sh and is not tracked
+try:
+    from cli.info import BUILD_DATETIME, COMMIT, BRANCH, OS, VERSION
+except ImportError:
+    BUILD_DATETIME = COMMIT = BRANCH = OS = 'unknown'
+    VERSION = __version__
+
 URL_TYPE = UrlType()
-TEXTS = Texts()
 
+# Subcommand groups are imported only when invoked: they pull in skale.py, web3 and sgx
+LAZY_COMMANDS = {
+    'validator': ('cli.validator', 'validator', TEXTS['validator']['help']),
+    'holder': ('cli.holder', 'holder', TEXTS['holder']['help']),
+    'sgx': ('cli.sgx_wallet', 'sgx_wallet', TEXTS['sgx']['help']),
+    'wallet': ('cli.wallet', 'wallet', TEXTS['wallet']['help']),
+    'srw': ('cli.srw', 'srw', TEXTS['srw']['help']),
+    'batch': ('cli.batch', 'batch', TEXTS['batch']['help']),
+    'tx': ('cli.tx', 'tx', TEXTS['tx']['help']),
+    # 'metrics': ('cli.metrics', 'metrics', TEXTS['metrics']['help']),
+}
+
+
+def set_global_options(profile_rpc, block):
+    if profile_rpc or PROFILE_RPC:
+        enable_rpc_profiling()
+    # Always set: the daemon and the shell run many commands in one process
+    pin_block(block)
 
-@click.group()
-def cli():
-    pass
+
+@click.group(cls=LazyGroup, lazy_commands=LAZY_COMMANDS)
+@click.option('--profile-rpc', is_flag=True, help=TEXTS['profile_rpc']['help'])
+@click.option('--block', type=BlockIdentifierType(), help=TEXTS['block']['help'])
+def cli(profile_rpc, block):
+    set_global_options(profile_rpc, block)
 
 
 @cli.command('info', help=TEXTS['info']['help'])
@@ -84,17 +109,57 @@ def info():
     help=TEXTS['init']['wallet']['help'],
     prompt=TEXTS['init']['wallet']['prompt']
 )
-def init(endpoint, contracts_url, wallet):
+@click.option(
+    '--hedge-endpoint',
+    type=URL_TYPE,
+    help=TEXTS['init']['hedge_endpoint']['help']
+)
+def init(endpoint, contracts_url, wallet, hedge_endpoint):
     safe_mk_dirs(SKALE_VAL_CONFIG_FOLDER)
-    download_file(contracts_url, SKALE_VAL_ABI_FILE)
+    if download_file(contracts_url, SKALE_VAL_ABI_FILE):
+        try:
+            compile_abi_bundle()
+        except (AbiBundleError, ValueError) as err:
+            logger.warning(f'ABI bundle was not compiled: {err}')
     config = {
         'endpoint': endpoint.strip(),
         'wallet': wallet
     }
+    if hedge_endpoint:
+        config['hedge_endpoint'] = hedge_endpoint.strip()
     write_json(SKALE_VAL_CONFIG_FILE, config)
     print(TEXTS['init']['done'])
 
 
+@cli.command('daemon', help=TEXTS['daemon']['help'])
+@click.option('--stop', is_flag=True, help=TEXTS['daemon']['stop']['help'])
+@click.pass_context
+def daemon(ctx, stop):
+    from core.daemon import run_daemon, stop_daemon
+    if stop:
+        stop_daemon()
+        return
+    for name in LAZY_COMMANDS:
+        cli.get_command(ctx, name)
+    run_daemon(run_cli)
+
+
+@cli.command('shell', help=TEXTS['shell']['help'])
+@click.pass_context
+def shell(ctx):
+    from core.shell import run_shell
+    run_shell(run_cli, cli, ctx)
+
+
+def handle_command_error(err):
+    from skale.transactions.exceptions import TransactionError, RevertError
+    if isinstance(err, RevertError):
+        error_exit(err, exit_code=CLIExitCodes.REVERT_ERROR)
+    if isinstance(err, TransactionError):
+        error_exit(err, exit_code=CLIExitCodes.TRANSACTION_ERROR)
+    error_exit(err)
+
+
 def handle_exception(exc_type, exc_value, exc_traceback):
     if issubclass(exc_type, KeyboardInterrupt):
         sys.__excepthook__(exc_type, exc_value, exc_traceback)
@@ -103,21 +168,22 @@ def handle_exception(exc_type, exc_value, exc_traceback):
                  exc_info=(exc_type, exc_value, exc_traceback))
 
 
+def run_cli(args=None):
+    try:
+        cli(args)
+    except SystemExit as err:
+        raise err
+    except Exception as err:
+        handle_command_error(err)
+
+
 sys.excepthook = handle_exception
 
 if __name__ == '__main__':
     init_log_dir()
     init_logger()
     logger.info(f'cmd: {" ".join(str(x) for x in sys.argv)}, v.{__version__}')
-    cmd_collection = click.CommandCollection(sources=[cli, validator_cli, holder_cli,
-                                                      sgx_cli, wallet_cli, srw_cli])
-    try:
-        cmd_collection()
-    except SystemExit as err:
-        raise err
-    except RevertError as err:
-        error_exit(err, exit_code=CLIExitCodes.REVERT_ERROR)
-    except TransactionError as err:
-        error_exit(err, exit_code=CLIExitCodes.TRANSACTION_ERROR)
-    except Exception as err:
-        error_exit(err)
+    exit_code = forward_to_daemon(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+    run_cli()
@@ -18,18 +18,16 @@
 #   along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import click
-from yaspin import yaspin
 
 from core.metrics import (
     check_if_node_is_registered, check_if_validator_is_registered, get_metrics_for_node,
     get_metrics_for_validator)
-from utils.constants import SPIN_COLOR
+from utils.helper import spinner
 from utils.print_formatters import (
     print_node_metrics, print_validator_metrics, print_validator_node_totals)
-from utils.texts import Texts
+from utils.texts import TEXTS as G_TEXTS
 from utils.web3_utils import init_skale_from_config
 
-G_TEXTS = Texts()
 TEXTS = G_TEXTS['metrics']
 MSGS = G_TEXTS['msg']
 
@@ -79,7 +77,7 @@ def node(node_id, since, till, wei, to_file):
     if not check_if_node_is_registered(skale, node_id):
         print(TEXTS['node']['index']['id_error_msg'])
         return
-    with yaspin(text="Loading", color=SPIN_COLOR) as sp:
+    with spinner("Loading") as sp:
         sp.text = TEXTS['node']['index']['wait_msg']
         metrics, total_bounty = get_metrics_for_node(skale, int(node_id), since, till, wei, to_file)
     if metrics:
@@ -123,7 +121,7 @@ def validator(val_id, since, till, wei, to_file):
     if not check_if_validator_is_registered(skale, val_id):
         print(TEXTS['validator']['index']['id_error_msg'])
         return
-    with yaspin(text="Loading", color=SPIN_COLOR) as sp:
+    with spinner("Loading") as sp:
         sp.text = TEXTS['validator']['index']['wait_msg']
         metrics, total_bounty = get_metrics_for_validator(skale, val_id, since, till, wei, to_file)
     if metrics['rows']:
@@ -23,10 +23,9 @@ import click
 
 from core.sgx_tools import init_sgx_account, get_sgx_info, sgx_inited
 from utils.print_formatters import print_sgx_info
-from utils.texts import Texts
+from utils.texts import TEXTS as G_TEXTS
 
 
-G_TEXTS = Texts()
 TEXTS = G_TEXTS['sgx']
 MSGS = G_TEXTS['msg']
 
@@ -21,11 +21,12 @@ import logging
 import click
 
 from core.srw import recharge, withdraw, balance
-from utils.texts import Texts
+from core.srw_keeper import keeper_status, run_keeper
+from utils.constants import SKALE_VAL_SRW_KEEPER_STATE_FILE, SRW_KEEPER_INTERVAL
+from utils.texts import TEXTS as G_TEXTS
 from utils.helper import transaction_cmd
 
 
-G_TEXTS = Texts()
 TEXTS = G_TEXTS['srw']
 
 logger = logging.getLogger(__name__)
@@ -75,3 +76,53 @@ def _withdraw(amount, pk_file, fee):
 @click.argument('validator_id', type=int)
 def _balance(validator_id, wei):
     balance(validator_id, wei)
+
+
+@srw.command('keeper', help=TEXTS['keeper']['help'])
+@transaction_cmd
+@click.option(
+    '--validator-id',
+    'validator_ids',
+    type=int,
+    multiple=True,
+    required=True,
+    help=TEXTS['keeper']['validator_id']['help']
+)
+@click.option('--threshold', required=True, help=TEXTS['keeper']['threshold']['help'])
+@click.option('--target', required=True, help=TEXTS['keeper']['target']['help'])
+@click.option(
+    '--interval',
+    type=click.FloatRange(min=1),
+    default=SRW_KEEPER_INTERVAL,
+    show_default=True,
+    help=TEXTS['keeper']['interval']['help']
+)
+@click.option(
+    '--state-file',
+    type=click.Path(dir_okay=False),
+    default=SKALE_VAL_SRW_KEEPER_STATE_FILE,
+    help=TEXTS['keeper']['state_file']['help']
+)
+@click.option('--once', is_flag=True, help=TEXTS['keeper']['once']['help'])
+def _keeper(validator_ids, threshold, target, interval, state_file, once, pk_file, fee):
+    run_keeper(
+        validator_ids=validator_ids,
+        threshold=threshold,
+        target=target,
+        interval=interval,
+        state_filepath=state_file,
+        once=once,
+        pk_file=pk_file,
+        fee=fee
+    )
+
+
+@srw.command('keeper-status', help=TEXTS['keeper_status']['help'])
+@click.option(
+    '--state-file',
+    type=click.Path(dir_okay=False),
+    default=SKALE_VAL_SRW_KEEPER_STATE_FILE,
+    help=TEXTS['keeper']['state_file']['help']
+)
+def _keeper_status(state_file):
+    keeper_status(state_file)
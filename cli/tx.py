@@ -0,0 +1,86 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of validator-cli
+#
+#   Copyright (C) 2022 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import click
+
+from core.presign import broadcast_signed
+from core.tx import tx_status, tx_wait
+from utils.constants import TX_WAIT_TIMEOUT
+from utils.texts import TEXTS as G_TEXTS
+
+
+TEXTS = G_TEXTS['tx']
+DEFAULT_LAST = 10
+
+
+@click.group()
+def tx_cli():
+    pass
+
+
+@tx_cli.group('tx', help=TEXTS['help'])
+def tx():
+    pass
+
+
+@tx.command('status', help=TEXTS['status']['help'])
+@click.argument('tx_hashes', nargs=-1)
+@click.option(
+    '--last',
+    type=int,
+    default=DEFAULT_LAST,
+    help=TEXTS['last']['help']
+)
+def _status(tx_hashes, last):
+    tx_status(tx_hashes, last)
+
+
+@tx.command('wait', help=TEXTS['wait']['help'])
+@click.argument('tx_hashes', nargs=-1)
+@click.option(
+    '--last',
+    type=int,
+    default=DEFAULT_LAST,
+    help=TEXTS['last']['help']
+)
+@click.option(
+    '--timeout',
+    type=int,
+    default=TX_WAIT_TIMEOUT,
+    help=TEXTS['wait']['timeout']['help']
+)
+def _wait(tx_hashes, last, timeout):
+    tx_wait(tx_hashes, last, timeout)
+
+
+@tx.command('broadcast', help=TEXTS['broadcast']['help'])
+@click.argument('signed_file', type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    '--no-wait',
+    is_flag=True,
+    help=TEXTS['broadcast']['no_wait']['help']
+)
+@click.option(
+    '--timeout',
+    type=int,
+    default=TX_WAIT_TIMEOUT,
+    help=TEXTS['wait']['timeout']['help']
+)
+def _broadcast(signed_file, no_wait, timeout):
+    broadcast_signed(signed_file, no_wait, timeout)
@@ -18,22 +18,21 @@
 #   along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import click
-from web3 import Web3
 
 from core.validator import (register, validators_list, delegations, accept_pending_delegation,
                             get_bond_amount, link_node_address, unlink_node_address,
                             linked_addresses, info, withdraw_fee, set_mda, change_address,
                             confirm_address, earned_fees, accept_all_delegations, edit)
 from utils.helper import abort_if_false, transaction_cmd
-from utils.validations import EthAddressType, UrlType, FloatPercentageType
-from utils.texts import Texts
+from utils.validations import (EthAddressType, UrlType, FloatPercentageType,
+                               to_checksum_address)
+from utils.texts import TEXTS as G_TEXTS
 
 
 ETH_ADDRESS_TYPE = EthAddressType()
 FLOAT_PERCENTAGE_TYPE = FloatPercentageType()
 URL_TYPE = UrlType()
 
-G_TEXTS = Texts()
 TEXTS = G_TEXTS['validator']
 
 
@@ -42,7 +41,7 @@ def validator_cli():
     pass
 
 
-@validator_cli.group('validator', help="Validator commands")
+@validator_cli.group('validator', help=TEXTS['help'])
 def validator():
     pass
 
@@ -128,10 +127,22 @@ def _accept_delegation(delegation_id, pk_file, fee):
 
 @validator.command('accept-all-delegations', help=TEXTS['accept_all_delegations']['help'])
 @transaction_cmd
-def _accept_all_delegations(pk_file, fee):
+@click.option(
+    '--pipelined',
+    is_flag=True,
+    help=TEXTS['accept_all_delegations']['pipelined']
+)
+@click.option(
+    '--presign',
+    type=click.Path(dir_okay=False),
+    help=TEXTS['accept_all_delegations']['presign']
+)
+def _accept_all_delegations(pk_file, fee, pipelined, presign):
     accept_all_delegations(
         pk_file=pk_file,
-        fee=fee
+        fee=fee,
+        pipelined=pipelined,
+        signed_filepath=presign
     )
 
 
@@ -143,7 +154,7 @@ def _accept_all_delegations(pk_file, fee):
               expose_value=False,
               prompt=TEXTS['link_address']['confirm'])
 def _link_address(node_address, signature, pk_file, fee):
-    node_address = Web3.toChecksumAddress(node_address)
+    node_address = to_checksum_address(node_address)
     link_node_address(
         node_address,
         signature,
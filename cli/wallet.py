@@ -20,12 +20,11 @@
 import logging
 import click
 
-from core.wallet import setup_ledger, transfer_eth, transfer_skl
+from core.wallet import send_payouts, setup_ledger, transfer_eth, transfer_skl
 from utils.helper import abort_if_false, transaction_cmd
-from utils.texts import Texts
+from utils.texts import TEXTS as G_TEXTS
 from utils.constants import LEDGER_KEYS_TYPES
 
-G_TEXTS = Texts()
 TEXTS = G_TEXTS['wallet']
 
 logger = logging.getLogger(__name__)
@@ -61,6 +60,24 @@ def _send_skl(receiver_address, amount, pk_file, fee):
     transfer_skl(receiver_address, amount, pk_file, fee=fee)
 
 
+@wallet.command('send-batch', help=TEXTS['send_batch']['help'])
+@transaction_cmd
+@click.option(
+    '--from-csv',
+    type=click.Path(exists=True, dir_okay=False),
+    required=True,
+    help=TEXTS['send_batch']['from_csv']['help']
+)
+@click.option(
+    '--status-file',
+    type=click.Path(dir_okay=False),
+    help=TEXTS['send_batch']['status_file']['help']
+)
+@click.option('--yes', is_flag=True, help=TEXTS['send_batch']['confirm']['help'])
+def _send_batch(from_csv, status_file, yes, pk_file, fee):
+    send_payouts(from_csv, pk_file, fee, status_filepath=status_file, yes=yes)
+
+
 @wallet.command('setup-ledger', help=TEXTS['setup_ledger']['help'])
 @click.option(
     '--address-index',
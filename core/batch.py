@@ -0,0 +1,316 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of validator-cli
+#
+#   Copyright (C) 2022 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Batch plans: operations of one stage are independent and sent as one pipeline,
+stages are executed one after another.
+
+    stages:
+      - operations:
+          - op: validator accept-delegation
+            delegation_id: 12
+          - op: holder withdraw-bounty
+            validator_id: 1
+            recipient_address: '0x...'
+      - operations:
+          - op: srw recharge
+            validator_id: 1
+            amount: 0.5
+"""
+
+import datetime
+import json
+import logging
+import os
+import sys
+from decimal import Decimal, InvalidOperation
+from typing import List, NamedTuple, Optional, Tuple
+
+import yaml
+
+from core.pipeline import OK_STATUSES, Pipeline, PipelineTx
+from core.presign import presign
+from core.transaction import TxFee
+from core.tx_journal import is_no_wait
+from utils.constants import SKALE_VAL_BATCH_JOURNALS_FOLDER
+from utils.exit_codes import CLIExitCodes
+from utils.helper import safe_mk_dirs, spinner, to_wei
+from utils.print_formatters import print_pipeline_results
+from utils.validations import to_checksum_address
+from utils.web3_utils import init_skale_w_wallet_from_config
+
+logger = logging.getLogger(__name__)
+
+
+class Operation(NamedTuple):
+    contract: str
+    function: str
+    params: Tuple[str, ...]
+    # Params in SKL/ETH that are converted to wei
+    amounts: Tuple[str, ...] = ()
+    addresses: Tuple[str, ...] = ()
+    # Integer params: ids and periods
+    ints: Tuple[str, ...] = ()
+    # Param in ETH sent as transaction value
+    value: Optional[str] = None
+
+
+# Operation names are sk-val commands, params are the same as in core/* functions
+OPERATIONS = {
+    'holder delegate': Operation(
+        'delegation_controller', 'delegate',
+        ('validator_id', 'amount', 'delegation_period', 'info'), amounts=('amount',),
+        ints=('validator_id', 'delegation_period')
+    ),
+    'holder cancel-delegation': Operation(
+        'delegation_controller', 'cancelPendingDelegation', ('delegation_id',),
+        ints=('delegation_id',)
+    ),
+    'holder undelegate': Operation(
+        'delegation_controller', 'requestUndelegation', ('delegation_id',),
+        ints=('delegation_id',)
+    ),
+    'holder withdraw-bounty': Operation(
+        'distributor', 'withdrawBounty', ('validator_id', 'recipient_address'),
+        addresses=('recipient_address',), ints=('validator_id',)
+    ),
+    'validator accept-delegation': Operation(
+        'delegation_controller', 'acceptPendingDelegation', ('delegation_id',),
+        ints=('delegation_id',)
+    ),
+    'validator link-address': Operation(
+        'validator_service', 'linkNodeAddress', ('node_address', 'signature'),
+        addresses=('node_address',)
+    ),
+    'validator unlink-address': Operation(
+        'validator_service', 'unlinkNodeAddress', ('node_address',),
+        addresses=('node_address',)
+    ),
+    'validator withdraw-fee': Operation(
+        'distributor', 'withdrawFee', ('recipient_address',), addresses=('recipient_address',)
+    ),
+    'validator set-mda': Operation(
+        'validator_service', 'setValidatorMDA', ('new_mda',), amounts=('new_mda',)
+    ),
+    'srw recharge': Operation(
+        'wallets', 'rechargeValidatorWallet', ('validator_id',), value='amount',
+        ints=('validator_id',)
+    ),
+    'srw withdraw': Operation(
+        'wallets', 'withdrawFundsFromValidatorWallet', ('amount',), amounts=('amount',)
+    ),
+}
+
+
+class BatchPlanError(Exception):
+    pass
+
+
+def read_plan(plan_filepath: str) -> List[List[dict]]:
+    with open(plan_filepath) as plan_file:
+        try:
+            plan = yaml.safe_load(plan_file)
+        except yaml.YAMLError as err:
+            raise BatchPlanError(f'Plan is not a valid YAML: {err}')
+    if not isinstance(plan, dict):
+        raise BatchPlanError('Plan should be a mapping with `stages` or `operations`')
+    if 'operations' in plan:
+        stages = [{'operations': plan['operations']}]
+    else:
+        stages = plan.get('stages')
+    if not stages or not isinstance(stages, list):
+        raise BatchPlanError('Plan has no stages')
+    if not all(isinstance(stage, dict) and stage.get('operations') for stage in stages):
+        raise BatchPlanError('Each stage should have `operations` list')
+    return [
+        [validate_operation(i, j, operation) for j, operation in enumerate(stage['operations'])]
+        for i, stage in enumerate(stages)
+    ]
+
+
+def validate_operation(stage_index: int, index: int, operation: dict) -> dict:
+    name = f'Operation {stage_index}.{index}'
+    if not isinstance(operation, dict) or operation.get('op') not in OPERATIONS:
+        raise BatchPlanError(f'{name}: `op` should be one of {", ".join(OPERATIONS)}')
+    spec = OPERATIONS[operation['op']]
+    expected = set(spec.params) | ({spec.value} if spec.value else set())
+    params = {key: value for key, value in operation.items() if key != 'op'}
+    if set(params) != expected:
+        raise BatchPlanError(
+            f'{name} ({operation["op"]}): expected params {", ".join(sorted(expected))}, '
+            f'got {", ".join(sorted(params)) or "none"}'
+        )
+    for param in spec.addresses:
+        try:
+            params[param] = to_checksum_address(params[param])
+        except (ValueError, TypeError):
+            raise BatchPlanError(f'{name}: {param} is not a valid address')
+    for param in spec.ints:
+        if not is_int(params[param]):
+            raise BatchPlanError(f'{name}: {param} should be a non-negative integer')
+    for param in spec.amounts + ((spec.value,) if spec.value else ()):
+        if not is_amount(params[param]):
+            raise BatchPlanError(f'{name}: {param} should be a positive number')
+    return {'op': operation['op'], **params}
+
+
+def is_int(value) -> bool:
+    # YAML booleans are ints in Python
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+
+def is_amount(value) -> bool:
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        return False
+    try:
+        amount = Decimal(str(value))
+    except InvalidOperation:
+        return False
+    return amount.is_finite() and amount > 0
+
+
+def operation_label(stage_index: int, index: int, operation: dict) -> str:
+    return f'{stage_index}.{index} {operation["op"]}'
+
+
+def operation_tx(skale, label: str, operation: dict) -> PipelineTx:
+    spec = OPERATIONS[operation['op']]
+    args = [
+        to_wei(operation[param]) if param in spec.amounts else operation[param]
+        for param in spec.params
+    ]
+    contract = getattr(skale, spec.contract).contract
+    return PipelineTx(
+        label=label,
+        method=getattr(contract.functions, spec.function)(*args),
+        value=to_wei(operation[spec.value]) if spec.value else 0
+    )
+
+
+def default_journal_filepath(plan_filepath: str) -> str:
+    plan_name = os.path.splitext(os.path.basename(plan_filepath))[0]
+    timestamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+    return os.path.join(SKALE_VAL_BATCH_JOURNALS_FOLDER, f'{plan_name}-{timestamp}.jsonl')
+
+
+def journal_entry(plan_filepath: str, stage_index: int, index: int, operation: dict,
+                  tx: Optional[PipelineTx]) -> dict:
+    return {
+        'plan': os.path.abspath(plan_filepath),
+        'stage': stage_index,
+        'label': operation_label(stage_index, index, operation),
+        'op': operation['op'],
+        'params': {key: value for key, value in operation.items() if key != 'op'},
+        'status': tx.status.value if tx and tx.status else 'skipped',
+        'nonce': tx.nonce if tx else None,
+        'tx_hash': tx.tx_hash if tx else None,
+        'error': tx.error if tx else None,
+        'timestamp': datetime.datetime.utcnow().isoformat()
+    }
+
+
+def write_journal(journal_filepath: str, entries: List[dict]) -> None:
+    with open(journal_filepath, 'a') as journal_file:
+        for entry in entries:
+            journal_file.write(json.dumps(entry) + '\n')
+
+
+def stages_txs(skale, stages: List[List[dict]]) -> List[List[PipelineTx]]:
+    """ Builds transactions of all stages, so an invalid operation is found before stage 0 """
+    all_txs = []
+    for stage_index, operations in enumerate(stages):
+        txs = []
+        for index, operation in enumerate(operations):
+            label = operation_label(stage_index, index, operation)
+            try:
+                txs.append(operation_tx(skale, label, operation))
+            except Exception as err:
+                raise BatchPlanError(f'Operation {label}: {err}')
+        all_txs.append(txs)
+    return all_txs
+
+
+def run_stages(skale, plan_filepath: str, stages: List[List[dict]], fee: TxFee,
+               journal_filepath: str, continue_on_error: bool = False) -> bool:
+    all_txs = stages_txs(skale, stages)
+    success = True
+    for stage_index, (operations, txs) in enumerate(zip(stages, all_txs)):
+        if not success and not continue_on_error:
+            write_journal(journal_filepath, [
+                journal_entry(plan_filepath, stage_index, index, operation, None)
+                for index, operation in enumerate(operations)
+            ])
+            continue
+        with spinner(f'Executing stage {stage_index} ({len(txs)} operations)'):
+            Pipeline(skale, fee).run(txs)
+        print_pipeline_results(txs, label_header='Operation')
+        write_journal(journal_filepath, [
+            journal_entry(plan_filepath, stage_index, index, operation, tx)
+            for index, (operation, tx) in enumerate(zip(operations, txs))
+        ])
+        success = success and all(tx.status in OK_STATUSES for tx in txs)
+    return success
+
+
+def run_batch(plan_filepath: str, pk_file: str, fee: TxFee,
+              journal_filepath: Optional[str] = None, continue_on_error: bool = False) -> None:
+    try:
+        stages = read_plan(plan_filepath)
+    except BatchPlanError as err:
+        print(f'Wrong batch plan {plan_filepath}: {err}')
+        sys.exit(CLIExitCodes.FAILURE.value)
+    if is_no_wait() and len(stages) > 1:
+        print('--no-wait can be used only with single stage plans: '
+              'next stages are executed after the previous one is mined')
+        sys.exit(CLIExitCodes.FAILURE.value)
+    skale = init_skale_w_wallet_from_config(pk_file)
+    if not skale:
+        return
+    journal_filepath = journal_filepath or default_journal_filepath(plan_filepath)
+    safe_mk_dirs(os.path.dirname(os.path.abspath(journal_filepath)))
+    try:
+        success = run_stages(skale, plan_filepath, stages, fee, journal_filepath,
+                             continue_on_error)
+    except BatchPlanError as err:
+        print(f'Wrong batch plan {plan_filepath}: {err}')
+        sys.exit(CLIExitCodes.FAILURE.value)
+    print(f'Batch journal: {journal_filepath}')
+    if not success:
+        sys.exit(CLIExitCodes.TRANSACTION_ERROR.value)
+
+
+def sign_batch(plan_filepath: str, pk_file: str, fee: TxFee, signed_filepath: str) -> None:
+    try:
+        stages = read_plan(plan_filepath)
+    except BatchPlanError as err:
+        print(f'Wrong batch plan {plan_filepath}: {err}')
+        sys.exit(CLIExitCodes.FAILURE.value)
+    if len(stages) > 1:
+        print('Only single stage plans can be pre-signed: '
+              'next stages are executed after the previous one is mined')
+        sys.exit(CLIExitCodes.FAILURE.value)
+    skale = init_skale_w_wallet_from_config(pk_file)
+    if not skale:
+        return
+    try:
+        txs = stages_txs(skale, stages)[0]
+    except BatchPlanError as err:
+        print(f'Wrong batch plan {plan_filepath}: {err}')
+        sys.exit(CLIExitCodes.FAILURE.value)
+    presign(skale, txs, fee, signed_filepath, label_header='Operation')
@@ -0,0 +1,322 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of validator-cli
+#
+#   Copyright (C) 2022 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import io
+import json
+import logging
+import os
+import socket
+import sys
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+
+from utils.constants import (DAEMON_LOCAL_COMMANDS, DAEMON_MAX_MESSAGE_SIZE, NO_DAEMON,
+                             PROFILE_RPC, SKALE_VAL_DAEMON_SOCKET, WALLET_CONFIG_COMMANDS)
+from utils.exit_codes import CLIExitCodes
+
+logger = logging.getLogger(__name__)
+
+# Global options that take a value, see cli/main.py
+VALUE_OPTIONS = ['--block']
+
+
+class DaemonError(Exception):
+    pass
+
+
+class InputRequired(BaseException):
+    """
+    Forwarded command asked for interactive input. Derived from BaseException
+    so that command error handlers don't turn it into a failed command.
+    """
+
+
+class NoInput(io.StringIO):
+    def readline(self, *args):
+        raise InputRequired()
+
+    read = readline
+
+
+@contextmanager
+def no_stdin():
+    stdin = sys.stdin
+    sys.stdin = NoInput()
+    try:
+        yield
+    finally:
+        sys.stdin = stdin
+
+
+def find_command(args):
+    """Name of the top-level command in sk-val arguments, None for `sk-val --help`"""
+    args = iter(args)
+    for arg in args:
+        if arg in VALUE_OPTIONS:
+            next(args, None)
+        elif not arg.startswith('-'):
+            return arg
+
+
+def matches_command(args, commands):
+    command = find_command(args)
+    if command is None:
+        return False
+    if command in commands:
+        return True
+    subcommand = find_command(args[args.index(command) + 1:])
+    return f'{command} {subcommand}' in commands
+
+
+def is_local_command(args):
+    return find_command(args) is None or matches_command(args, DAEMON_LOCAL_COMMANDS)
+
+
+def drop_wallets_after(args):
+    """Cached wallets would keep signing with the previous key after it's configured again"""
+    if matches_command(args, WALLET_CONFIG_COMMANDS):
+        from utils.web3_utils import drop_skale_instances
+        drop_skale_instances()
+
+
+def send_message(sock, message):
+    sock.sendall(json.dumps(message).encode('utf-8'))
+    sock.shutdown(socket.SHUT_WR)
+
+
+def send_line(sock, message):
+    """Daemon responses are streamed as JSON lines while the command runs"""
+    sock.sendall((json.dumps(message) + '\n').encode('utf-8'))
+
+
+def recv_lines(sock):
+    with sock.makefile('r', encoding='utf-8') as stream:
+        while True:
+            line = stream.readline(DAEMON_MAX_MESSAGE_SIZE + 1)
+            if not line:
+                return
+            if len(line) > DAEMON_MAX_MESSAGE_SIZE:
+                raise DaemonError('Daemon message is too large')
+            yield json.loads(line)
+
+
+def recv_message(sock):
+    chunks, size = [], 0
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > DAEMON_MAX_MESSAGE_SIZE:
+            raise DaemonError('Daemon message is too large')
+        chunks.append(chunk)
+    if not chunks:
+        raise DaemonError('Connection closed without a message')
+    return json.loads(b''.join(chunks))
+
+
+def should_forward(args, socket_path=SKALE_VAL_DAEMON_SOCKET):
+    return not NO_DAEMON and not PROFILE_RPC and '--profile-rpc' not in args and \
+        not is_local_command(args) and \
+        os.path.exists(socket_path)
+
+
+def forward_to_daemon(args, socket_path=SKALE_VAL_DAEMON_SOCKET):
+    """
+    Run command in the resident daemon and print its output as it arrives.
+    Returns exit code or None if the command should be executed locally.
+    """
+    if not should_forward(args, socket_path):
+        return None
+    stdout = sys.stdout
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            sock.connect(socket_path)
+        except OSError as err:
+            logger.info(f'Daemon is not available, running locally: {err}')
+            return None
+        # Once the request is sent the command may have side effects, so no local fallback
+        try:
+            send_message(sock, {'args': list(args), 'cwd': os.getcwd()})
+            for message in recv_lines(sock):
+                if message.get('fallback'):
+                    return None
+                stdout.write(message.get('output', ''))
+                stdout.flush()
+                if 'exit_code' in message:
+                    return message['exit_code']
+            raise DaemonError('Connection closed without an exit code')
+        except (OSError, ValueError, DaemonError) as err:
+            logger.exception(err)
+            print(f'Daemon failed to execute the command: {err}')
+            return CLIExitCodes.FAILURE.value
+    finally:
+        sock.close()
+
+
+def exit_code_from(err, output):
+    if err.code is None:
+        return 0
+    if isinstance(err.code, int):
+        return err.code
+    output.write(f'{err.code}\n')
+    return CLIExitCodes.FAILURE.value
+
+
+class SocketOutput(io.TextIOBase):
+    """
+    Command output that is sent to the client line by line. Unfinished line
+    (e.g. an input prompt) is kept until the command ends, flush() doesn't send it.
+    """
+
+    def __init__(self, conn):
+        super().__init__()
+        self.conn = conn
+        self.pending = ''
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        self.pending += text
+        if '\n' in self.pending:
+            lines, self.pending = self.pending.rsplit('\n', 1)
+            send_line(self.conn, {'output': lines + '\n'})
+        return len(text)
+
+    def send_pending(self):
+        if self.pending:
+            send_line(self.conn, {'output': self.pending})
+            self.pending = ''
+
+
+class Daemon:
+    """
+    Executes forwarded sk-val commands in one long-lived process, so imports,
+    ABI, connections and wallets are initialized only once. Requests are handled
+    one by one because commands share process-wide state (stdout, cwd, options).
+    Output is streamed to the client while the command runs; if the command asks
+    for input it is executed again locally, so the output before the prompt is repeated.
+    """
+
+    def __init__(self, run_command, socket_path=SKALE_VAL_DAEMON_SOCKET):
+        self.run_command = run_command
+        self.socket_path = socket_path
+        self.running = False
+
+    def execute(self, args, cwd, conn):
+        output = SocketOutput(conn)
+        exit_code = 0
+        prev_cwd = os.getcwd()
+        try:
+            os.chdir(cwd)
+            with redirect_stdout(output), redirect_stderr(output), no_stdin():
+                self.run_command(args)
+        except SystemExit as err:
+            exit_code = exit_code_from(err, output)
+        except InputRequired:
+            return {'fallback': True}
+        except Exception as err:
+            logger.exception(err)
+            output.write(f'Command execution failed with {err}\n')
+            exit_code = CLIExitCodes.FAILURE.value
+        finally:
+            os.chdir(prev_cwd)
+            drop_wallets_after(args)
+        output.send_pending()
+        return {'exit_code': exit_code}
+
+    def handle(self, conn):
+        request = recv_message(conn)
+        if request.get('stop'):
+            self.running = False
+            response = {'exit_code': 0, 'output': 'Daemon stopped\n'}
+        else:
+            logger.info(f'Daemon cmd: {" ".join(request["args"])}')
+            response = self.execute(request['args'], request['cwd'], conn)
+        send_line(conn, response)
+
+    def bind(self):
+        if os.path.exists(self.socket_path):
+            if is_daemon_running(self.socket_path):
+                raise DaemonError(f'Daemon is already running on {self.socket_path}')
+            os.remove(self.socket_path)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        umask = os.umask(0o177)
+        try:
+            sock.bind(self.socket_path)
+        finally:
+            os.umask(umask)
+        sock.listen()
+        return sock
+
+    def serve_forever(self, sock):
+        self.running = True
+        try:
+            while self.running:
+                conn, _ = sock.accept()
+                with conn:
+                    try:
+                        self.handle(conn)
+                    except (OSError, ValueError, DaemonError) as err:
+                        logger.warning(f'Daemon request failed: {err}')
+        finally:
+            sock.close()
+            os.remove(self.socket_path)
+
+
+def is_daemon_running(socket_path=SKALE_VAL_DAEMON_SOCKET):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def run_daemon(run_command, socket_path=SKALE_VAL_DAEMON_SOCKET):
+    from utils.helper import disable_spinners
+    from utils.web3_utils import init_resident_skale
+    # Spinner frames would be streamed to the client along with the output
+    disable_spinners()
+    init_resident_skale()
+    daemon = Daemon(run_command, socket_path)
+    try:
+        sock = daemon.bind()
+    except DaemonError as err:
+        print(err)
+        sys.exit(CLIExitCodes.FAILURE.value)
+    print(f'Daemon is listening on {socket_path}')
+    daemon.serve_forever(sock)
+
+
+def stop_daemon(socket_path=SKALE_VAL_DAEMON_SOCKET):
+    if not is_daemon_running(socket_path):
+        print('Daemon is not running')
+        return
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+        send_message(sock, {'stop': True})
+        for message in recv_lines(sock):
+            print(message.get('output', ''), end='')
+    finally:
+        sock.close()
@@ -0,0 +1,95 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of validator-cli
+#
+#   Copyright (C) 2022 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""EIP-1559 fee suggestions from eth_feeHistory, used when no fee is given"""
+
+import logging
+import statistics
+import time
+from typing import Optional
+
+from skale.utils.web3_utils import default_gas_price
+
+from core.transaction import TxFee
+from utils.constants import (FEE_ORACLE_BASE_FEE_MULTIPLIER, FEE_ORACLE_BLOCKS,
+                             FEE_ORACLE_MIN_PRIORITY_FEE, FEE_ORACLE_REWARD_PERCENTILE,
+                             FEE_ORACLE_TTL)
+
+logger = logging.getLogger(__name__)
+
+# (endpoint, blocks, percentile) -> (timestamp, suggested fee)
+_suggestions = {}
+
+
+def web3_cache_key(web3):
+    return getattr(web3.provider, 'endpoint_uri', None) or id(web3)
+
+
+def is_fee_set(fee: Optional[TxFee]) -> bool:
+    return fee is not None and any([
+        fee.gas_price, fee.max_priority_fee_per_gas, fee.max_fee_per_gas
+    ])
+
+
+def fee_from_history(history, base_fee_multiplier=FEE_ORACLE_BASE_FEE_MULTIPLIER,
+                     min_priority_fee=FEE_ORACLE_MIN_PRIORITY_FEE) -> Optional[TxFee]:
+    """
+    Last baseFeePerGas item is the base fee of the next block. Priority fee is the median
+    of rewards at the configured percentile, empty blocks are skipped because they report 0.
+    """
+    base_fees = history.get('baseFeePerGas') or []
+    if not base_fees or not base_fees[-1]:
+        return None
+    rewards = [
+        block_rewards[0]
+        for block_rewards, gas_used_ratio in zip(history.get('reward') or [],
+                                                 history.get('gasUsedRatio') or [])
+        if block_rewards and gas_used_ratio > 0
+    ]
+    priority_fee = max(int(statistics.median(rewards)) if rewards else 0, min_priority_fee)
+    max_fee = int(base_fees[-1] * base_fee_multiplier) + priority_fee
+    return TxFee(max_priority_fee_per_gas=priority_fee, max_fee_per_gas=max_fee)
+
+
+def suggest_fee(web3, blocks=FEE_ORACLE_BLOCKS, percentile=FEE_ORACLE_REWARD_PERCENTILE,
+                ttl=FEE_ORACLE_TTL) -> TxFee:
+    """
+    EIP-1559 fee if the chain and the node support it, legacy gas price otherwise.
+    Suggestion is cached for ttl seconds, so a batch of transactions makes one request.
+    """
+    key = (web3_cache_key(web3), blocks, percentile)
+    cached = _suggestions.get(key)
+    if cached and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+    try:
+        fee = fee_from_history(web3.eth.fee_history(blocks, 'latest', [percentile]))
+    except Exception as err:
+        logger.info(f'eth_feeHistory is not available: {err}')
+        fee = None
+    fee = fee or TxFee(gas_price=default_gas_price(web3))
+    logger.info(f'Fee oracle suggestion: {fee}')
+    _suggestions[key] = (time.monotonic(), fee)
+    return fee
+
+
+def resolve_fee(skale, fee: Optional[TxFee]) -> TxFee:
+    """Fee given by the user, otherwise the fee oracle suggestion"""
+    if is_fee_set(fee):
+        return fee
+    return suggest_fee(skale.web3)
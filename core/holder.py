@@ -17,19 +17,38 @@
 #   You should have received a copy of the GNU Affero General Public License
 #   along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import dataclasses
-from typing import Optional
+import sys
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, NamedTuple, Optional
 
-from yaspin import yaspin
+import click
+from skale.contracts.manager.delegation.delegation_controller import FIELDS as DELEGATION_FIELDS
+from skale.contracts.manager.delegation.validator_service import FIELDS as VALIDATOR_FIELDS
 from skale.utils.web3_utils import to_checksum_address
 
+from core.fee_oracle import resolve_fee
+from core.pipeline import OK_STATUSES, Pipeline, PipelineTx
 from core.transaction import TxFee
-from utils.helper import to_skl
+from core.tx_journal import done_message
+from utils.exit_codes import CLIExitCodes
+from utils.helper import CsvFileError, read_csv_rows, to_skl
+from utils.rpc_batch import batch_call
 from utils.web3_utils import (init_skale_from_config,
                               init_skale_w_wallet_from_config)
-from utils.print_formatters import print_delegations
-from utils.helper import to_wei, from_wei
-from utils.constants import SPIN_COLOR
+from utils.print_formatters import (print_bounty_sweep_results, print_delegation_batch_results,
+                                    print_delegations, print_earned_bounties)
+from utils.helper import to_wei, from_wei, spinner
+from utils.constants import DELEGATION_PERIOD_OPTIONS, ZERO_ADDRESS
+
+DELEGATIONS_CSV_COLUMNS = ('validator_id', 'amount', 'period', 'info')
+
+
+class DelegationRow(NamedTuple):
+    line: int
+    validator_id: int
+    amount: Decimal
+    delegation_period: int
+    info: str
 
 
 def delegations(address, wei):
@@ -49,32 +68,125 @@ def delegate(validator_id: int, amount: int, delegation_period: int, info: str,
     skale = init_skale_w_wallet_from_config(pk_file)
     if not skale:
         return
-    fee = fee or TxFee(gas_price=skale.gas_price)
-    with yaspin(text='Sending delegation request', color=SPIN_COLOR) as sp:
+    fee = resolve_fee(skale, fee)
+    with spinner('Sending delegation request') as sp:
         amount_wei = to_wei(amount)
         tx_res = skale.delegation_controller.delegate(
             validator_id=validator_id,
             amount=amount_wei,
             delegation_period=delegation_period,
             info=info,
-            **dataclasses.asdict(fee)
+            **fee.tx_kwargs()
         )
-        sp.write("✔ Delegation request sent")
+        sp.write(done_message("✔ Delegation request sent"))
         print(f'Transaction hash: {tx_res.tx_hash}')
 
 
+def parse_delegation_row(line: int, row: dict) -> DelegationRow:
+    try:
+        validator_id = int(row['validator_id'])
+    except ValueError:
+        raise CsvFileError(f'Line {line}: validator_id should be an integer')
+    try:
+        amount = Decimal(row['amount'])
+    except InvalidOperation:
+        raise CsvFileError(f'Line {line}: amount should be a number')
+    if amount <= 0:
+        raise CsvFileError(f'Line {line}: amount should be positive')
+    if row['period'] not in DELEGATION_PERIOD_OPTIONS:
+        raise CsvFileError(
+            f'Line {line}: period should be one of {", ".join(DELEGATION_PERIOD_OPTIONS)}')
+    return DelegationRow(line, validator_id, amount, int(row['period']), row['info'])
+
+
+def read_delegations_csv(csv_filepath: str) -> List[DelegationRow]:
+    return [
+        parse_delegation_row(line, row)
+        for line, row in read_csv_rows(csv_filepath, DELEGATIONS_CSV_COLUMNS)
+    ]
+
+
+def check_delegations(skale, rows: List[DelegationRow]) -> List[str]:
+    """
+    Validators, their minimum delegation amounts and the balance are read in one batch.
+    Delegated and locked tokens stay in the balance, so only the rest can be delegated.
+    """
+    address = skale.wallet.address
+    validator_ids = sorted({row.validator_id for row in rows})
+    results = batch_call(skale.web3, [
+        *(skale.validator_service.contract.functions.validators(validator_id)
+          for validator_id in validator_ids),
+        skale.token.contract.functions.balanceOf(address),
+        skale.token_state.contract.functions.getAndUpdateForbiddenForDelegationAmount(address)
+    ], from_address=address)
+    validators = {
+        validator_id: dict(zip(VALIDATOR_FIELDS, result))
+        for validator_id, result in zip(validator_ids, results)
+    }
+    balance, forbidden = results[-2:]
+    available = max(balance - forbidden, 0)
+    errors = []
+    for row in rows:
+        validator = validators[row.validator_id]
+        if int(validator['validator_address'], 16) == int(ZERO_ADDRESS, 16):
+            errors.append(f'Line {row.line}: validator {row.validator_id} does not exist')
+        elif not validator['accept_new_requests']:
+            errors.append(f'Line {row.line}: validator {row.validator_id} '
+                          'doesn\'t accept new delegation requests')
+        elif to_wei(row.amount) < validator['minimum_delegation_amount']:
+            errors.append(
+                f'Line {row.line}: {row.amount} SKL is less than minimum delegation amount '
+                f'of validator {row.validator_id} '
+                f'({from_wei(validator["minimum_delegation_amount"])} SKL)')
+    total = sum(to_wei(row.amount) for row in rows)
+    if total > available:
+        errors.append(f'Total amount {from_wei(total)} SKL exceeds the amount available '
+                      f'for delegation of {address} ({from_wei(available)} SKL, '
+                      f'{from_wei(balance)} SKL balance, {from_wei(forbidden)} SKL '
+                      'already delegated or locked)')
+    return errors
+
+
+def delegate_batch(csv_filepath: str, pk_file: str, fee: Optional[TxFee]) -> None:
+    try:
+        rows = read_delegations_csv(csv_filepath)
+    except CsvFileError as err:
+        print(f'Wrong delegations file {csv_filepath}: {err}')
+        sys.exit(CLIExitCodes.FAILURE.value)
+    skale = init_skale_w_wallet_from_config(pk_file)
+    if not skale:
+        return
+    errors = check_delegations(skale, rows)
+    if errors:
+        print('Delegations can\'t be sent:\n' + '\n'.join(errors))
+        sys.exit(CLIExitCodes.FAILURE.value)
+    txs = [
+        PipelineTx(
+            label=str(row.line),
+            method=skale.delegation_controller.contract.functions.delegate(
+                row.validator_id, to_wei(row.amount), row.delegation_period, row.info)
+        )
+        for row in rows
+    ]
+    with spinner(f'Sending {len(txs)} delegation requests'):
+        Pipeline(skale, fee).run(txs)
+    print_delegation_batch_results(rows, txs)
+    if any(tx.status not in OK_STATUSES for tx in txs):
+        sys.exit(CLIExitCodes.TRANSACTION_ERROR.value)
+
+
 def cancel_pending_delegation(delegation_id: int, pk_file: str,
                               fee: Optional[TxFee]) -> None:
     skale = init_skale_w_wallet_from_config(pk_file)
     if not skale:
         return
-    fee = fee or TxFee(gas_price=skale.gas_price)
-    with yaspin(text='Canceling delegation request', color=SPIN_COLOR) as sp:
+    fee = resolve_fee(skale, fee)
+    with spinner('Canceling delegation request') as sp:
         tx_res = skale.delegation_controller.cancel_pending_delegation(
             delegation_id=delegation_id,
-            **dataclasses.asdict(fee)
+            **fee.tx_kwargs()
         )
-        sp.write("✔ Delegation request canceled")
+        sp.write(done_message("✔ Delegation request canceled"))
         print(f'Transaction hash: {tx_res.tx_hash}')
 
 
@@ -82,13 +194,13 @@ def undelegate(delegation_id: int, pk_file: str, fee: Optional[TxFee]) -> None:
     skale = init_skale_w_wallet_from_config(pk_file)
     if not skale:
         return
-    fee = fee or TxFee(gas_price=skale.gas_price)
-    with yaspin(text='Requesting undelegation', color=SPIN_COLOR) as sp:
+    fee = resolve_fee(skale, fee)
+    with spinner('Requesting undelegation') as sp:
         tx_res = skale.delegation_controller.request_undelegation(
             delegation_id=delegation_id,
-            **dataclasses.asdict(fee)
+            **fee.tx_kwargs()
         )
-        sp.write("✔ Successfully undelegated")
+        sp.write(done_message("✔ Successfully undelegated"))
         print(f'Transaction hash: {tx_res.tx_hash}')
 
 
@@ -97,17 +209,83 @@ def withdraw_bounty(validator_id: int, recipient_address: str,
     skale = init_skale_w_wallet_from_config(pk_file)
     if not skale:
         return
-    fee = fee or TxFee(gas_price=skale.gas_price)
-    with yaspin(text='Withdrawing bounty', color=SPIN_COLOR) as sp:
+    fee = resolve_fee(skale, fee)
+    with spinner('Withdrawing bounty') as sp:
         tx_res = skale.distributor.withdraw_bounty(
             validator_id=validator_id,
             to=recipient_address,
-            **dataclasses.asdict(fee)
+            **fee.tx_kwargs()
         )
-        sp.write(f'✔ Bounty successfully transferred to {recipient_address}')
+        sp.write(done_message(f'✔ Bounty successfully transferred to {recipient_address}'))
         print(f'Transaction hash: {tx_res.tx_hash}')
 
 
+def delegated_validator_ids(skale, address: str, block: int) -> List[int]:
+    """IDs of all validators the address has ever delegated to, delegations are read in batches"""
+    functions = skale.delegation_controller.contract.functions
+    length = functions.getDelegationsByHolderLength(address).call(block_identifier=block)
+    delegation_ids = batch_call(skale.web3, [
+        functions.delegationsByHolder(address, index) for index in range(length)
+    ], block)
+    delegations = batch_call(skale.web3, [
+        functions.getDelegation(delegation_id) for delegation_id in delegation_ids
+    ], block)
+    return sorted({dict(zip(DELEGATION_FIELDS, delegation))['validator_id']
+                   for delegation in delegations})
+
+
+def earned_bounties_by_validator(skale, address: str, validator_ids: List[int],
+                                 block: int) -> Dict[int, int]:
+    """Earned amount depends on msg.sender, so the calls are made from the holder address"""
+    results = batch_call(skale.web3, [
+        skale.distributor.contract.functions.getAndUpdateEarnedBountyAmount(validator_id)
+        for validator_id in validator_ids
+    ], block, from_address=address)
+    return {validator_id: result[0] for validator_id, result in zip(validator_ids, results)}
+
+
+def sweep_bounties(recipient_address: Optional[str], min_amount: float, yes: bool,
+                   pk_file: str, fee: Optional[TxFee]) -> None:
+    skale = init_skale_w_wallet_from_config(pk_file)
+    if not skale:
+        return
+    address = skale.wallet.address
+    recipient_address = to_checksum_address(recipient_address or address)
+    min_amount_wei = to_wei(min_amount)
+    with spinner('Reading earned bounties'):
+        block = skale.web3.eth.block_number
+        validator_ids = delegated_validator_ids(skale, address, block)
+        earned = earned_bounties_by_validator(skale, address, validator_ids, block)
+    print(f'Earned bounties for {address} at block {block}:\n')
+    print_earned_bounties(earned, min_amount_wei)
+    to_withdraw = [
+        validator_id for validator_id, amount in earned.items() if amount > min_amount_wei
+    ]
+    if not to_withdraw:
+        print(f'\nNo bounties above {min_amount} SKL to withdraw')
+        return
+    total = from_wei(sum(earned[validator_id] for validator_id in to_withdraw))
+    if not yes and not click.confirm(
+            f'\n{total} SKL will be withdrawn from {len(to_withdraw)} validator(s) '
+            f'to {recipient_address}. Do you want to continue?'):
+        print('Operation canceled')
+        return
+
+    txs = [
+        PipelineTx(
+            label=str(validator_id),
+            method=skale.distributor.contract.functions.withdrawBounty(
+                validator_id, recipient_address)
+        )
+        for validator_id in to_withdraw
+    ]
+    with spinner(f'Withdrawing bounties from {len(txs)} validator(s)'):
+        Pipeline(skale, fee).run(txs)
+    print_bounty_sweep_results(earned, txs)
+    if any(tx.status not in OK_STATUSES for tx in txs):
+        sys.exit(CLIExitCodes.TRANSACTION_ERROR.value)
+
+
 def locked(address, wei):
     skale = init_skale_from_config()
     if not skale:
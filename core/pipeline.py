@@ -0,0 +1,374 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of validator-cli
+#
+#   Copyright (C) 2022 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Pipelined transactions: nonces are assigned locally, the whole set is signed and
+broadcast back-to-back and receipts are awaited concurrently.
+"""
+
+import dataclasses
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import List, Optional
+
+from skale.transactions.exceptions import TransactionNotMinedError
+from skale.transactions.tools import estimate_gas, transaction_from_method
+from web3.exceptions import TransactionNotFound
+
+from core.fee_oracle import resolve_fee
+from core.transaction import TxFee
+from core.tx_journal import is_no_wait, record_tx
+from utils.constants import PIPELINE_MAX_WORKERS, PIPELINE_RECOVERY_ROUNDS
+from utils.keccak import keccak256
+
+logger = logging.getLogger(__name__)
+
+# Node errors meaning that the nonce is already used by another transaction
+NONCE_ERRORS = (
+    'nonce too low',
+    'replacement transaction underpriced'
+)
+# Node errors meaning that the node already has this exact signed transaction,
+# e.g. eth_sendRawTransaction was retried by the provider
+KNOWN_TX_ERRORS = (
+    'already known',
+    'known transaction'
+)
+# eth_call errors caused by the transaction itself, not by the transport or the node
+EXECUTION_ERRORS = (
+    'revert',
+    'insufficient funds',
+    'out of gas',
+    'invalid opcode',
+    'invalid jump'
+)
+# JSON-RPC error code of a failed execution (EIP-1474)
+EXECUTION_ERROR_CODE = 3
+
+
+class TxStatus(Enum):
+    SUCCESS = 'success'
+    REVERTED = 'reverted'
+    FAILED = 'failed'
+    NOT_MINED = 'not mined'
+    SENT = 'sent'
+    SIGNED = 'signed'
+    SKIPPED = 'skipped'
+
+
+# Sent statuses are final for --no-wait commands
+OK_STATUSES = (TxStatus.SUCCESS, TxStatus.SENT)
+
+
+@dataclasses.dataclass
+class PipelineTx:
+    label: str
+    method: object  # web3 ContractFunction, e.g. contract.functions.acceptPendingDelegation(1)
+    value: int = 0
+    gas_limit: Optional[int] = None
+    nonce: Optional[int] = None
+    raw_tx: Optional[bytes] = None
+    tx_hash: Optional[str] = None
+    status: Optional[TxStatus] = None
+    error: Optional[str] = None
+
+
+class EthTransfer:
+    """Plain ETH transfer with the interface of a contract function used by the pipeline"""
+    fn_name = 'transfer'
+
+    def __init__(self, web3, to_address: str, chain_id: int):
+        self.web3 = web3
+        self.address = to_address
+        self.chain_id = chain_id
+
+    def tx_fields(self, opts: dict) -> dict:
+        return {**opts, 'to': self.address}
+
+    def call(self, opts: dict, block_identifier='latest'):
+        return self.web3.eth.call(self.tx_fields(opts), block_identifier)
+
+    def estimateGas(self, opts: dict, block_identifier='latest'):
+        # Receiver can be a contract, so the gas is estimated too
+        return self.web3.eth.estimate_gas(self.tx_fields(opts), block_identifier)
+
+    def buildTransaction(self, fields: dict) -> dict:
+        return {'to': self.address, 'chainId': self.chain_id, **fields}
+
+
+def error_message(err):
+    if err.args and isinstance(err.args[0], dict):
+        return err.args[0].get('message', str(err))
+    return str(err)
+
+
+def is_nonce_error(err):
+    message = error_message(err).lower()
+    return any(nonce_error in message for nonce_error in NONCE_ERRORS)
+
+
+def is_known_tx_error(err):
+    message = error_message(err).lower()
+    return any(known_error in message for known_error in KNOWN_TX_ERRORS)
+
+
+def is_execution_error(err):
+    if err.args and isinstance(err.args[0], dict) and \
+            err.args[0].get('code') == EXECUTION_ERROR_CODE:
+        return True
+    message = error_message(err).lower()
+    return any(execution_error in message for execution_error in EXECUTION_ERRORS)
+
+
+def raw_tx_hash(raw_tx) -> str:
+    return '0x' + keccak256(bytes(raw_tx)).hex()
+
+
+def call_at_block(method, opts: dict, block: int):
+    return method.call(opts, block_identifier=block)
+
+
+def simulate(skale, txs: List[PipelineTx], max_workers: int = PIPELINE_MAX_WORKERS) -> int:
+    """
+    Pre-flight: every transaction is simulated with eth_call at the same head block,
+    ones that would revert (or fail, e.g. with insufficient funds) are skipped.
+    If the call itself failed (timeout, rate limit) the transaction is marked as failed:
+    it's unknown whether it would succeed.
+    Transactions of the set are simulated independently of each other.
+    """
+    block = skale.web3.eth.block_number
+    address = skale.wallet.address
+
+    def call(tx):
+        try:
+            call_at_block(tx.method, {'from': address, 'value': tx.value}, block)
+        except Exception as err:
+            tx.error = error_message(err)
+            if is_execution_error(err):
+                tx.status = TxStatus.SKIPPED
+                logger.info(f'Pre-flight call for {tx.label} at block {block} failed: {tx.error}')
+            else:
+                tx.status = TxStatus.FAILED
+                logger.warning(f'Pre-flight call for {tx.label} at block {block} '
+                               f'was not made: {tx.error}')
+
+    if txs:
+        with ThreadPoolExecutor(max_workers=min(len(txs), max_workers)) as executor:
+            list(executor.map(call, txs))
+    return block
+
+
+def fee_fields(skale, fee: TxFee) -> dict:
+    fee = resolve_fee(skale, fee)
+    return {key: value for key, value in dataclasses.asdict(fee).items() if value is not None}
+
+
+def max_gas_price(fee: dict) -> int:
+    """Highest price per gas that can be paid with the resolved fee fields"""
+    return fee.get('max_fee_per_gas') or fee.get('gas_price') or 0
+
+
+class Pipeline:
+    def __init__(self, skale, fee: TxFee, gas_limit: Optional[int] = None,
+                 max_workers: int = PIPELINE_MAX_WORKERS):
+        self.skale = skale
+        self.fee = fee_fields(skale, fee)
+        self.gas_limit = gas_limit
+        self.max_workers = max_workers
+
+    @property
+    def address(self):
+        return self.skale.wallet.address
+
+    def pending_nonce(self):
+        return self.skale.web3.eth.get_transaction_count(self.address, 'pending')
+
+    def mined_nonce(self):
+        return self.skale.web3.eth.get_transaction_count(self.address, 'latest')
+
+    def concurrently(self, func, txs):
+        if not txs:
+            return
+        with ThreadPoolExecutor(max_workers=min(len(txs), self.max_workers)) as executor:
+            list(executor.map(func, txs))
+
+    def estimate(self, tx: PipelineTx) -> None:
+        """Gas limit estimation, transactions that fail it are reported and never broadcast"""
+        if self.gas_limit:
+            tx.gas_limit = self.gas_limit
+            return
+        try:
+            tx.gas_limit = estimate_gas(
+                self.skale.web3, tx.method, {'from': self.address, 'value': tx.value})
+        except Exception as err:
+            tx.error = error_message(err)
+            tx.status = TxStatus.REVERTED if 'revert' in tx.error.lower() else TxStatus.FAILED
+            logger.info(f'Dry run for {tx.label} failed: {tx.error}')
+
+    def sign(self, tx: PipelineTx, nonce: int) -> dict:
+        tx_dict = transaction_from_method(
+            tx.method,
+            gas_limit=tx.gas_limit,
+            nonce=nonce,
+            value=tx.value,
+            **self.fee
+        )
+        tx.raw_tx = self.skale.wallet.sign(tx_dict).rawTransaction
+        tx.nonce = nonce
+        return tx_dict
+
+    def sign_concurrently(self, txs: List[PipelineTx], nonce: int) -> dict:
+        """
+        Wallets with concurrent signing (pooled SGX) sign the whole set upfront with
+        consecutive nonces, so signing latency doesn't stretch the broadcast.
+        Returns tx dicts by transaction index, failed ones are signed again inline.
+        """
+        if not getattr(self.skale.wallet, 'concurrent_signing', False):
+            return {}
+        tx_dicts = {}
+
+        def sign(item):
+            index, tx = item
+            try:
+                tx_dicts[index] = self.sign(tx, nonce + index)
+            except Exception as err:
+                tx.raw_tx, tx.nonce = None, None
+                logger.info(f'Signing {tx.label} failed: {error_message(err)}')
+
+        self.concurrently(sign, list(enumerate(txs)))
+        return tx_dicts
+
+    def signed_or_sign(self, tx_dicts: dict, index: int, tx: PipelineTx, nonce: int) -> dict:
+        if index in tx_dicts and tx.nonce == nonce:
+            return tx_dicts[index]
+        return self.sign(tx, nonce)
+
+    def send_raw(self, tx: PipelineTx) -> None:
+        try:
+            tx.tx_hash = self.skale.web3.eth.send_raw_transaction(tx.raw_tx).hex()
+        except Exception as err:
+            if not is_known_tx_error(err):
+                raise
+            # Same signed transaction is already in the pool, so it is sent
+            tx.tx_hash = raw_tx_hash(tx.raw_tx)
+        logger.info(f'Pipelined tx {tx.label} sent, nonce: {tx.nonce}, hash: {tx.tx_hash}')
+
+    def broadcast(self, txs: List[PipelineTx]) -> None:
+        nonce = self.pending_nonce()
+        tx_dicts = self.sign_concurrently(txs, nonce)
+        for index, tx in enumerate(txs):
+            for attempt in range(PIPELINE_RECOVERY_ROUNDS + 1):
+                try:
+                    tx_dict = self.signed_or_sign(tx_dicts, index, tx, nonce)
+                    self.send_raw(tx)
+                    if is_no_wait():
+                        record_tx(tx_dict, tx.tx_hash, self.address, label=tx.label)
+                    nonce += 1
+                    break
+                except Exception as err:
+                    if is_nonce_error(err) and attempt < PIPELINE_RECOVERY_ROUNDS:
+                        logger.info(f'Nonce {nonce} is taken, resyncing: {error_message(err)}')
+                        nonce = max(nonce + 1, self.pending_nonce())
+                        continue
+                    tx.error = error_message(err)
+                    tx.status = TxStatus.FAILED
+                    tx.raw_tx, tx.nonce = None, None
+                    logger.warning(f'Pipelined tx {tx.label} was not sent: {tx.error}')
+                    break
+
+    def wait(self, tx: PipelineTx) -> None:
+        """Errors are recorded per transaction, so results of the whole set can be shown"""
+        try:
+            receipt = self.skale.wallet.wait(tx.tx_hash)
+        except TransactionNotMinedError as err:
+            tx.status, tx.error = TxStatus.NOT_MINED, str(err)
+            return
+        except Exception as err:
+            tx.status, tx.error = TxStatus.NOT_MINED, error_message(err)
+            logger.warning(f'Waiting for {tx.label} ({tx.tx_hash}) failed: {tx.error}')
+            return
+        self.set_receipt_status(tx, receipt)
+
+    def fetch_receipt(self, tx: PipelineTx) -> None:
+        try:
+            receipt = self.skale.web3.eth.get_transaction_receipt(tx.tx_hash)
+        except TransactionNotFound:
+            return
+        except Exception as err:
+            tx.status, tx.error = TxStatus.NOT_MINED, error_message(err)
+            logger.warning(f'Receipt of {tx.label} ({tx.tx_hash}) is not fetched: {tx.error}')
+            return
+        self.set_receipt_status(tx, receipt)
+
+    def set_receipt_status(self, tx: PipelineTx, receipt) -> None:
+        if receipt['status'] == 1:
+            tx.status, tx.error = TxStatus.SUCCESS, None
+        else:
+            tx.status, tx.error = TxStatus.REVERTED, 'Transaction reverted'
+
+    def recover_gaps(self, txs: List[PipelineTx]) -> List[PipelineTx]:
+        """
+        Transactions that are not mined are stuck behind a nonce gap, e.g. one of them
+        was dropped from the pool. Same signed transactions are re-broadcast to fill the gap,
+        transactions which nonces were taken by someone else are re-signed with new nonces.
+        """
+        stuck = sorted((tx for tx in txs if tx.status == TxStatus.NOT_MINED),
+                       key=lambda tx: tx.nonce)
+        if not stuck:
+            return []
+        mined_nonce = self.mined_nonce()
+        taken = []
+        for tx in stuck:
+            tx.status, tx.error = None, None
+            if tx.nonce < mined_nonce:
+                taken.append(tx)
+                continue
+            try:
+                self.send_raw(tx)
+            except Exception as err:
+                if not is_nonce_error(err):
+                    tx.status, tx.error = TxStatus.FAILED, error_message(err)
+                elif 'nonce too low' in error_message(err).lower():
+                    taken.append(tx)
+        # Transaction could be mined after the waiting timeout, otherwise its nonce is lost
+        self.concurrently(self.fetch_receipt, taken)
+        self.broadcast([tx for tx in taken if tx.status is None])
+        return [tx for tx in stuck if tx.status is None]
+
+    def run(self, txs: List[PipelineTx]) -> List[PipelineTx]:
+        simulate(self.skale, txs, self.max_workers)
+        self.concurrently(self.estimate, [tx for tx in txs if tx.status is None])
+        self.broadcast([tx for tx in txs if tx.status is None])
+        pending = [tx for tx in txs if tx.status is None]
+        if is_no_wait():
+            for tx in pending:
+                tx.status = TxStatus.SENT
+            return txs
+        self.concurrently(self.wait, pending)
+        for _ in range(PIPELINE_RECOVERY_ROUNDS):
+            try:
+                pending = self.recover_gaps(pending)
+            except Exception as err:
+                logger.warning(f'Nonce gap recovery failed: {error_message(err)}')
+                break
+            if not pending:
+                break
+            self.concurrently(self.wait, pending)
+        return txs
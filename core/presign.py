@@ -0,0 +1,193 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of validator-cli
+#
+#   Copyright (C) 2022 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Pre-signed transactions: the whole set is signed in one session (one sitting for
+Ledger users) and saved to a file, `sk-val tx broadcast` sends it later in one burst.
+"""
+
+import datetime
+import logging
+import os
+import sys
+from typing import List
+
+
+from core.pipeline import (Pipeline, PipelineTx, TxStatus, error_message, is_known_tx_error,
+                           raw_tx_hash, simulate)
+from core.transaction import TxFee
+from core.tx import SUCCESS, wait_statuses
+from core.tx_journal import TX_FIELDS, record_tx
+from utils.exit_codes import CLIExitCodes
+from utils.helper import read_json, safe_mk_dirs, spinner, write_json
+from utils.print_formatters import print_pipeline_results, print_tx_statuses
+from utils.web3_utils import init_skale_from_config
+
+logger = logging.getLogger(__name__)
+
+
+class SignedFileError(Exception):
+    pass
+
+
+def sign_txs(skale, txs: List[PipelineTx], fee: TxFee) -> List[dict]:
+    """
+    Pre-flight calls and dry runs are made concurrently, then transactions are signed
+    with consecutive nonces starting from the pending nonce of the wallet: one by one
+    (Ledger prompts) or concurrently if the wallet supports it
+    """
+    pipeline = Pipeline(skale, fee)
+    simulate(skale, txs, pipeline.max_workers)
+    pipeline.concurrently(pipeline.estimate, [tx for tx in txs if tx.status is None])
+    txs = [tx for tx in txs if tx.status is None]
+    nonce = pipeline.pending_nonce()
+    tx_dicts = pipeline.sign_concurrently(txs, nonce)
+    signed = []
+    for index, tx in enumerate(txs):
+        try:
+            tx_dict = pipeline.signed_or_sign(tx_dicts, index, tx, nonce)
+        except Exception as err:
+            tx.status, tx.error = TxStatus.FAILED, error_message(err)
+            logger.warning(f'Transaction {tx.label} was not signed: {tx.error}')
+            continue
+        tx.tx_hash = raw_tx_hash(tx.raw_tx)
+        tx.status = TxStatus.SIGNED
+        signed.append({
+            'label': tx.label,
+            'nonce': nonce,
+            'tx_hash': tx.tx_hash,
+            'raw_tx': '0x' + bytes(tx.raw_tx).hex(),
+            'tx': {field: tx_dict.get(field) for field in TX_FIELDS}
+        })
+        nonce += 1
+    return signed
+
+
+def presign(skale, txs: List[PipelineTx], fee: TxFee, signed_filepath: str,
+            label_header: str = 'Label') -> None:
+    with spinner(f'Signing {len(txs)} transaction(s)'):
+        signed = sign_txs(skale, txs, fee)
+    print_pipeline_results(txs, label_header=label_header)
+    if signed:
+        safe_mk_dirs(os.path.dirname(os.path.abspath(signed_filepath)))
+        write_json(signed_filepath, {
+            'chain_id': skale.web3.eth.chain_id,
+            'from': skale.wallet.address,
+            'created': datetime.datetime.utcnow().isoformat(),
+            'transactions': signed
+        })
+        print(f'\n{len(signed)} signed transaction(s) saved to {signed_filepath}, '
+              f'send them with < sk-val tx broadcast {signed_filepath} >')
+    if len(signed) != len(txs):
+        sys.exit(CLIExitCodes.TRANSACTION_ERROR.value)
+
+
+def read_signed(signed_filepath: str) -> dict:
+    try:
+        signed = read_json(signed_filepath)
+    except ValueError as err:
+        raise SignedFileError(f'File is not a valid JSON: {err}')
+    if not isinstance(signed, dict) or not signed.get('transactions') or \
+            not all(key in signed for key in ('chain_id', 'from')):
+        raise SignedFileError('File has no signed transactions')
+    signed['transactions'] = sorted(signed['transactions'], key=lambda tx: tx['nonce'])
+    return signed
+
+
+def check_signed(web3, signed: dict) -> None:
+    chain_id = web3.eth.chain_id
+    if signed['chain_id'] != chain_id:
+        raise SignedFileError(
+            f'Transactions are signed for chain {signed["chain_id"]}, endpoint chain is {chain_id}')
+    mined_nonce = web3.eth.get_transaction_count(signed['from'])
+    first_nonce = signed['transactions'][0]['nonce']
+    if first_nonce < mined_nonce:
+        raise SignedFileError(
+            f'Nonce {first_nonce} is already used by {signed["from"]} '
+            f'(next nonce is {mined_nonce}), sign the transactions again')
+
+
+def send_signed(web3, signed: dict) -> List[dict]:
+    """
+    Raw transactions are sent back-to-back in nonce order. After the first failed one
+    the rest are not sent: their nonces would be stuck behind the gap
+    """
+    entries = []
+    failed = None
+    for signed_tx in signed['transactions']:
+        entry = {
+            'tx_hash': signed_tx['tx_hash'],
+            'from': signed['from'],
+            'nonce': signed_tx['nonce'],
+            'intent': {'label': signed_tx['label']}
+        }
+        if failed:
+            entry['error'] = f'not sent because {failed} failed'
+            entries.append(entry)
+            continue
+        try:
+            entry['tx_hash'] = web3.eth.send_raw_transaction(signed_tx['raw_tx']).hex()
+        except Exception as err:
+            # Same transaction is already in the pool, e.g. the file is broadcast again
+            if not is_known_tx_error(err):
+                entry['error'] = error_message(err)
+                failed = signed_tx['label']
+                logger.warning(
+                    f'Signed tx {signed_tx["label"]} was not sent: {entry["error"]}')
+        entries.append(entry)
+    return entries
+
+
+def broadcast_signed(signed_filepath: str, no_wait: bool, timeout: float) -> None:
+    try:
+        signed = read_signed(signed_filepath)
+    except SignedFileError as err:
+        print(f'Wrong signed transactions file {signed_filepath}: {err}')
+        sys.exit(CLIExitCodes.FAILURE.value)
+    skale = init_skale_from_config()
+    if not skale:
+        return
+    try:
+        check_signed(skale.web3, signed)
+    except SignedFileError as err:
+        print(err)
+        sys.exit(CLIExitCodes.FAILURE.value)
+
+    entries = send_signed(skale.web3, signed)
+    sent = [entry for entry in entries if 'error' not in entry]
+    for entry in entries:
+        if 'error' in entry:
+            print(f'{entry["intent"]["label"]} was not sent: {entry["error"]}')
+
+    if no_wait:
+        intent = {'command': 'tx broadcast', 'params': {'signed_file': signed_filepath}}
+        for entry, signed_tx in zip(entries, signed['transactions']):
+            if 'error' not in entry:
+                record_tx(signed_tx['tx'], entry['tx_hash'], signed['from'],
+                          label=signed_tx['label'], intent=intent)
+        print(f'\n{len(sent)} transaction(s) sent without waiting for receipts, '
+              'check them with < sk-val tx status >')
+    else:
+        with spinner(f'Waiting for {len(sent)} transaction(s)'):
+            statuses = wait_statuses(skale.web3, sent, timeout)
+        print_tx_statuses(sent, statuses)
+        if any(status['status'] != SUCCESS for status in statuses):
+            sys.exit(CLIExitCodes.TRANSACTION_ERROR.value)
+    if len(sent) != len(entries):
+        sys.exit(CLIExitCodes.TRANSACTION_ERROR.value)
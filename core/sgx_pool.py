@@ -0,0 +1,129 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of validator-cli
+#
+#   Copyright (C) 2022 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+SGX signing over a pool of persistent TLS connections. sgx.py opens a new connection
+and re-reads the certificates for every RPC call and requests the public key before
+every signature, so one signature costs two TLS handshakes.
+"""
+
+import itertools
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from sgx import SgxClient
+from sgx.http import SgxUnreachableError, get_cert_provider, get_certificate_credentials
+from sgx.sgx_rpc_handler import SgxRPCHandler, SgxServerError
+from skale.wallets import SgxWallet
+
+from utils.constants import SGX_MAX_CONCURRENT_SIGNS
+
+logger = logging.getLogger(__name__)
+
+
+class PooledSgxRPCHandler(SgxRPCHandler):
+    """Sends signing requests over keep-alive connections, at most max_concurrency at once"""
+
+    def __init__(self, sgx_endpoint, path_to_cert=None,
+                 max_concurrency=SGX_MAX_CONCURRENT_SIGNS):
+        super().__init__(sgx_endpoint, path_to_cert)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency,
+                              pool_block=True)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # sgx.py doesn't verify the server certificate either
+        self.session.verify = False
+        if path_to_cert:
+            self.session.cert = get_certificate_credentials(
+                path_to_cert, get_cert_provider(self.sgx_endpoint))
+        self.semaphore = threading.BoundedSemaphore(max_concurrency)
+        self.request_ids = itertools.count()
+
+    def send(self, method, params=None):
+        call_data = {
+            'id': next(self.request_ids),
+            'jsonrpc': '2.0',
+            'method': method,
+            'params': params
+        }
+        with self.semaphore:
+            try:
+                response = self.session.post(self.sgx_endpoint, json=call_data).json()
+            except requests.exceptions.ConnectionError as err:
+                logger.error('Connection to SGX server failed', exc_info=err)
+                raise SgxUnreachableError(f'SGX server is unreachable: {err}')
+        if response.get('error') is not None:
+            raise SgxServerError(response['error']['message'])
+        if response['result']['status']:
+            raise SgxServerError(response['result']['errorMessage'])
+        return response
+
+    def ecdsa_sign(self, key_name, transaction_hash):
+        response = self.send('ecdsaSignMessageHash', {
+            'base': 10,
+            'keyName': key_name,
+            'messageHash': transaction_hash
+        })
+        signature = response['result']
+        return signature['signature_v'], signature['signature_r'], signature['signature_s']
+
+    def get_public_key(self, key_name):
+        response = self.send('getPublicECDSAKey', {'keyName': key_name})
+        return response['result']['publicKey']
+
+    def close(self):
+        self.session.close()
+
+
+class PooledSgxClient(SgxClient):
+    def __init__(self, sgx_endpoint, path_to_cert=None,
+                 max_concurrency=SGX_MAX_CONCURRENT_SIGNS):
+        self.sgx_endpoint = sgx_endpoint
+        self.sgx_rpc_server = PooledSgxRPCHandler(sgx_endpoint, path_to_cert, max_concurrency)
+        self.accounts = {}
+
+    def get_account(self, key_name):
+        # Key of the account never changes, sgx.py requests it before every signature
+        if key_name not in self.accounts:
+            self.accounts[key_name] = super().get_account(key_name)
+        return self.accounts[key_name]
+
+
+class PooledSgxWallet(SgxWallet):
+    """SgxWallet that can be used to sign many transactions concurrently"""
+    concurrent_signing = True
+
+    def __init__(self, sgx_endpoint, web3, key_name, path_to_cert=None,
+                 max_concurrency=SGX_MAX_CONCURRENT_SIGNS):
+        self.sgx_client = PooledSgxClient(sgx_endpoint, path_to_cert, max_concurrency)
+        self._web3 = web3
+        self._key_name = key_name
+        self._address, self._public_key = self._get_account(key_name)
+        self._chain_id = None
+
+    def sign(self, tx_dict):
+        # Chain id is requested before every signature by the base wallet
+        if not tx_dict.get('chainId'):
+            if self._chain_id is None:
+                self._chain_id = self._web3.eth.chain_id
+            tx_dict['chainId'] = self._chain_id
+        return super().sign(tx_dict)
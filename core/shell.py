@@ -0,0 +1,161 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of validator-cli
+#
+#   Copyright (C) 2022 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import cmd
+import logging
+import shlex
+
+import click
+
+from core.daemon import drop_wallets_after
+from utils.constants import (SHELL_EXCLUDED_COMMANDS, SHELL_HISTORY_LENGTH,
+                             SKALE_VAL_SHELL_HISTORY_FILE)
+
+try:
+    import readline
+except ImportError:  # pragma: no cover - not available on some platforms
+    readline = None
+
+logger = logging.getLogger(__name__)
+
+SHELL_COMMANDS = ['exit', 'help', 'quit']
+
+
+def complete_args(group, ctx, args, incomplete):
+    """Completion candidates for the last word of sk-val arguments"""
+    command = group
+    for arg in args:
+        if isinstance(command, click.MultiCommand) and not arg.startswith('-'):
+            command = command.get_command(ctx, arg) or command
+    options = [param for param in command.params if isinstance(param, click.Option)]
+    if args:
+        prev_option = next((o for o in options if args[-1] in o.opts and not o.is_flag), None)
+        if prev_option is not None:
+            choices = getattr(prev_option.type, 'choices', [])
+            return [c for c in choices if c.startswith(incomplete)]
+    candidates = []
+    if isinstance(command, click.MultiCommand):
+        candidates.extend(
+            name for name in command.list_commands(ctx)
+            if command is not group or name not in SHELL_EXCLUDED_COMMANDS
+        )
+    if incomplete.startswith('-') or not candidates:
+        candidates.extend(opt for option in options for opt in option.opts + option.secondary_opts)
+    return sorted(c for c in candidates if c.startswith(incomplete))
+
+
+class SkValShell(cmd.Cmd):
+    """Runs sk-val commands in one process, so connections and wallets are reused"""
+
+    prompt = 'sk-val> '
+    intro = 'Validator CLI interactive shell. Type `help` to list commands, `exit` to quit.'
+
+    def __init__(self, run_command, group, ctx):
+        super().__init__()
+        self.run_command = run_command
+        self.group = group
+        self.ctx = ctx
+
+    def default(self, line):
+        try:
+            args = shlex.split(line)
+        except ValueError as err:
+            print(f'Wrong input: {err}')
+            return
+        if args[0] in SHELL_EXCLUDED_COMMANDS:
+            print(f'{args[0]} is not available in the shell')
+            return
+        try:
+            self.run_command(args)
+        except SystemExit as err:
+            if err.code:
+                logger.info(f'Shell command {line} exited with {err.code}')
+        except KeyboardInterrupt:
+            print('\nInterrupted')
+        finally:
+            drop_wallets_after(args)
+
+    def do_help(self, arg):
+        self.default(f'{arg} --help' if arg else '--help')
+
+    def do_exit(self, arg):
+        return True
+
+    do_quit = do_exit
+
+    def do_EOF(self, arg):
+        print()
+        return True
+
+    def emptyline(self):
+        pass
+
+    def completenames(self, text, *ignored):
+        shell_commands = [name for name in SHELL_COMMANDS if name.startswith(text)]
+        return self.complete_line(text, '') + shell_commands
+
+    def complete_help(self, text, line, begidx, endidx):
+        return self.complete_line(text, line[len('help'):begidx])
+
+    def completedefault(self, text, line, begidx, endidx):
+        return self.complete_line(text, line[:begidx])
+
+    def complete_line(self, text, line_before):
+        try:
+            args = shlex.split(line_before)
+        except ValueError:
+            return []
+        return complete_args(self.group, self.ctx, args, text)
+
+
+def load_history():
+    if readline is None:
+        return
+    readline.set_completer_delims(' \t\n')
+    readline.set_history_length(SHELL_HISTORY_LENGTH)
+    try:
+        readline.read_history_file(SKALE_VAL_SHELL_HISTORY_FILE)
+    except OSError:
+        pass
+
+
+def save_history():
+    if readline is None:
+        return
+    try:
+        readline.write_history_file(SKALE_VAL_SHELL_HISTORY_FILE)
+    except OSError as err:
+        logger.warning(f'Shell history was not saved: {err}')
+
+
+def run_shell(run_command, group, ctx):
+    from utils.web3_utils import init_resident_skale
+    init_resident_skale()
+    load_history()
+    shell = SkValShell(run_command, group, ctx)
+    try:
+        while True:
+            try:
+                shell.cmdloop()
+                break
+            except KeyboardInterrupt:
+                shell.intro = ''
+                print()
+    finally:
+        save_history()
@@ -17,16 +17,15 @@
 #   You should have received a copy of the GNU Affero General Public License
 #   along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import dataclasses
 import sys
 from typing import Optional
 
 import click
-from yaspin import yaspin
 
+from core.fee_oracle import resolve_fee
 from core.transaction import TxFee
-from utils.constants import SPIN_COLOR
-from utils.helper import to_wei
+from core.tx_journal import done_message
+from utils.helper import spinner, to_wei
 from utils.print_formatters import print_srw_balance
 from utils.web3_utils import init_skale_from_config, init_skale_w_wallet_from_config
 
@@ -43,7 +42,7 @@ def recharge(amount: str, validator_id: int, pk_file: str, fee: Optional[TxFee])
     skale = init_skale_w_wallet_from_config(pk_file)
     if not skale:
         return
-    fee = fee or TxFee(gas_price=skale.gas_price)
+    fee = resolve_fee(skale, fee)
 
     if not validator_id:
         validator_id = validator_id_by_address(skale, skale.wallet.address)
@@ -54,13 +53,13 @@ def recharge(amount: str, validator_id: int, pk_file: str, fee: Optional[TxFee])
         print('Operation canceled')
         return
 
-    with yaspin(text='Recharging ETH from validator SRW wallet', color=SPIN_COLOR) as sp:
+    with spinner('Recharging ETH from validator SRW wallet') as sp:
         tx_res = skale.wallets.recharge_validator_wallet(
             validator_id=validator_id,
             value=amount_wei,
-            **dataclasses.asdict(fee)
+            **fee.tx_kwargs()
         )
-        sp.write("✔ Wallet recharged")
+        sp.write(done_message("✔ Wallet recharged"))
         print(f'Transaction hash: {tx_res.tx_hash}')
 
 
@@ -68,7 +67,7 @@ def withdraw(amount: str, pk_file: str, fee: Optional[TxFee]) -> None:
     skale = init_skale_w_wallet_from_config(pk_file)
     if not skale:
         return
-    fee = fee or TxFee(gas_price=skale.gas_price)
+    fee = resolve_fee(skale, fee)
     validator_id = validator_id_by_address(skale, skale.wallet.address)
     amount_wei = to_wei(amount)
     print(f'{amount} ETH ({amount_wei} WEI) will be withdrawn from validator ID {validator_id}')
@@ -76,12 +75,12 @@ def withdraw(amount: str, pk_file: str, fee: Optional[TxFee]) -> None:
         print('Operation canceled')
         return
 
-    with yaspin(text='Withdrawing ETH from validator SRW wallet', color=SPIN_COLOR) as sp:
+    with spinner('Withdrawing ETH from validator SRW wallet') as sp:
         tx_res = skale.wallets.withdraw_funds_from_validator_wallet(
             amount=amount_wei,
-            **dataclasses.asdict(fee)
+            **fee.tx_kwargs()
         )
-        sp.write("✔ ETH withdrawn")
+        sp.write(done_message("✔ ETH withdrawn"))
         print(f'Transaction hash: {tx_res.tx_hash}')
 
 
@@ -0,0 +1,336 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of validator-cli
+#
+#   Copyright (C) 2022 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+SRW keeper: every interval SRW balances of all watched validators are read in one
+batch request at the same block. Wallets below the threshold are topped up to the
+target amount by one pipeline, so recharges are sent back-to-back and land in the
+same block when it has room for them. State and decisions of every round are written
+to the JSON state file which can be read by monitoring or `sk-val srw keeper-status`.
+"""
+
+import datetime
+import logging
+import os
+import sys
+import time
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from web3.exceptions import TransactionNotFound
+
+from core.pipeline import Pipeline, PipelineTx, TxStatus, max_gas_price
+from core.transaction import TxFee
+from core.tx_journal import is_no_wait
+from utils.constants import SRW_KEEPER_HISTORY_LENGTH, SRW_KEEPER_RECHARGE_GAS
+from utils.exit_codes import CLIExitCodes
+from utils.helper import from_wei, read_json, safe_mk_dirs, to_wei, write_json
+from utils.print_formatters import print_srw_keeper_state
+from utils.rpc_batch import batch_call
+from utils.web3_utils import init_skale_w_wallet_from_config
+
+logger = logging.getLogger(__name__)
+
+OK = 'ok'
+RECHARGE = 'recharge'
+INSUFFICIENT_FUNDS = 'insufficient funds'
+PENDING = 'pending'
+# Recharges that are sent but not mined yet
+UNRESOLVED_STATUSES = (TxStatus.NOT_MINED, TxStatus.SENT, None)
+
+
+class KeeperError(Exception):
+    pass
+
+
+class Decision(NamedTuple):
+    validator_id: int
+    balance: int
+    action: str
+    amount: int = 0
+
+
+def parse_amounts(threshold: str, target: str) -> Tuple[int, int]:
+    try:
+        threshold_wei, target_wei = to_wei(Decimal(threshold)), to_wei(Decimal(target))
+    except InvalidOperation:
+        raise KeeperError('Threshold and target should be numbers')
+    if threshold_wei <= 0 or target_wei < threshold_wei:
+        raise KeeperError('Threshold should be positive and target should not be less than it')
+    return threshold_wei, target_wei
+
+
+def read_balances(skale, validator_ids: List[int]) -> Tuple[int, Dict[int, int]]:
+    block = skale.web3.eth.block_number
+    balances = batch_call(skale.web3, [
+        skale.wallets.contract.functions.getValidatorBalance(validator_id)
+        for validator_id in validator_ids
+    ], block)
+    return block, dict(zip(validator_ids, balances))
+
+
+def plan_recharges(balances: Dict[int, int], threshold: int, target: int,
+                   available: int, gas_cost: int = 0,
+                   pending: Optional[Dict[int, int]] = None) -> List[Decision]:
+    """
+    Wallets with a recharge in flight are left alone until it is resolved.
+    Emptiest wallets are recharged first if the keeper can't afford all recharges,
+    each recharge also needs gas_cost.
+    """
+    pending = pending or {}
+    decisions = []
+    for validator_id, balance in sorted(balances.items(), key=lambda item: item[1]):
+        if validator_id in pending:
+            decisions.append(Decision(validator_id, balance, PENDING, pending[validator_id]))
+            continue
+        if balance >= threshold:
+            decisions.append(Decision(validator_id, balance, OK))
+            continue
+        amount = target - balance
+        if amount + gas_cost > available:
+            decisions.append(Decision(validator_id, balance, INSUFFICIENT_FUNDS, amount))
+            continue
+        available -= amount + gas_cost
+        decisions.append(Decision(validator_id, balance, RECHARGE, amount))
+    return sorted(decisions, key=lambda decision: decision.validator_id)
+
+
+def recharge_gas_cost(fee: dict) -> int:
+    return SRW_KEEPER_RECHARGE_GAS * max_gas_price(fee)
+
+
+def decision_entry(decision: Decision, tx: Optional[PipelineTx]) -> dict:
+    entry = decision._asdict()
+    if tx:
+        entry.update({
+            'status': tx.status.value if tx.status else None,
+            'tx_hash': tx.tx_hash,
+            'error': tx.error
+        })
+    return entry
+
+
+class SrwKeeper:
+    def __init__(self, skale, validator_ids: List[int], threshold: int, target: int,
+                 fee: TxFee, state_filepath: str):
+        self.skale = skale
+        self.validator_ids = sorted(set(validator_ids))
+        self.threshold = threshold
+        self.target = target
+        self.fee = fee
+        self.state_filepath = state_filepath
+        self.state = {
+            'address': skale.wallet.address,
+            'validator_ids': self.validator_ids,
+            'threshold': threshold,
+            'target': target,
+            'started': now(),
+            'rounds': 0,
+            'recharges': 0,
+            'errors': 0,
+            'last_round': None,
+            'last_error': None,
+            'validators': {},
+            # Recharges sent but not mined yet by validator ID, kept across restarts
+            'pending': load_pending(state_filepath, skale.wallet.address),
+            'history': []
+        }
+
+    @property
+    def address(self):
+        return self.skale.wallet.address
+
+    def resolve_pending(self) -> None:
+        """Pending recharges that are mined or which nonce is used by another tx are resolved"""
+        pending = self.state['pending']
+        if not pending:
+            return
+        mined_nonce = self.skale.web3.eth.get_transaction_count(self.address, 'latest')
+        for validator_id, entry in list(pending.items()):
+            try:
+                receipt = self.skale.web3.eth.get_transaction_receipt(entry['tx_hash'])
+            except TransactionNotFound:
+                receipt = None
+            if receipt is not None:
+                status = TxStatus.SUCCESS if receipt['status'] == 1 else TxStatus.REVERTED
+            elif mined_nonce > entry['nonce']:
+                status = TxStatus.FAILED
+                logger.warning(f'SRW recharge {entry["tx_hash"]} of validator {validator_id} '
+                               f'was replaced by another transaction with nonce {entry["nonce"]}')
+            else:
+                continue
+            del pending[validator_id]
+            if status == TxStatus.SUCCESS:
+                self.state['recharges'] += 1
+            recharge = self.state['validators'].get(validator_id, {}).get('last_recharge')
+            if recharge and recharge.get('tx_hash') == entry['tx_hash']:
+                recharge['status'] = status.value
+
+    def track_pending(self, txs: Dict[int, PipelineTx]) -> None:
+        for validator_id, tx in txs.items():
+            if tx.tx_hash and tx.status in UNRESOLVED_STATUSES:
+                self.state['pending'][str(validator_id)] = {
+                    'tx_hash': tx.tx_hash,
+                    'nonce': tx.nonce,
+                    'amount': tx.value,
+                    'time': now()
+                }
+
+    def run_round(self) -> dict:
+        self.resolve_pending()
+        pending = {
+            int(validator_id): entry['amount']
+            for validator_id, entry in self.state['pending'].items()
+        }
+        block, balances = read_balances(self.skale, self.validator_ids)
+        # Value of in-flight recharges is still on the keeper balance
+        available = self.skale.web3.eth.get_balance(self.address, block) - sum(pending.values())
+        pipeline = Pipeline(self.skale, self.fee)
+        decisions = plan_recharges(balances, self.threshold, self.target, available,
+                                   recharge_gas_cost(pipeline.fee), pending)
+        txs = {
+            decision.validator_id: PipelineTx(
+                label=str(decision.validator_id),
+                method=self.skale.wallets.contract.functions.rechargeValidatorWallet(
+                    decision.validator_id),
+                value=decision.amount
+            )
+            for decision in decisions if decision.action == RECHARGE
+        }
+        try:
+            if txs:
+                pipeline.run(list(txs.values()))
+        finally:
+            # Round can fail after broadcast, sent recharges must not be repeated
+            self.track_pending(txs)
+        for decision in decisions:
+            logger.info(f'SRW keeper, validator {decision.validator_id}: {decision.action}, '
+                        f'balance {decision.balance}, amount {decision.amount}')
+        return {
+            'time': now(),
+            'block': block,
+            'keeper_balance': available,
+            'decisions': [
+                decision_entry(decision, txs.get(decision.validator_id))
+                for decision in decisions
+            ]
+        }
+
+    def update_state(self, round_state: dict) -> None:
+        self.state['rounds'] += 1
+        self.state['last_round'] = round_state
+        for entry in round_state['decisions']:
+            validator = self.state['validators'].setdefault(str(entry['validator_id']), {})
+            validator['balance'] = entry['balance']
+            validator['last_action'] = entry['action']
+            if entry['action'] == RECHARGE:
+                validator['last_recharge'] = {'time': round_state['time'], **entry}
+                if entry.get('status') == TxStatus.SUCCESS.value:
+                    self.state['recharges'] += 1
+        actions = [entry for entry in round_state['decisions'] if entry['action'] != OK]
+        if actions:
+            self.state['history'].append({**round_state, 'decisions': actions})
+            self.state['history'] = self.state['history'][-SRW_KEEPER_HISTORY_LENGTH:]
+
+    def tick(self) -> None:
+        try:
+            round_state = self.run_round()
+        except Exception as err:
+            logger.exception('SRW keeper round failed')
+            self.state['errors'] += 1
+            self.state['last_error'] = {'time': now(), 'error': str(err)}
+            print(f'{now()} SRW keeper round failed: {err}')
+        else:
+            self.update_state(round_state)
+            print(round_summary(round_state))
+        write_state(self.state_filepath, self.state)
+
+    def run(self, interval: float, once: bool = False) -> None:
+        while True:
+            started = time.monotonic()
+            self.tick()
+            if once:
+                return
+            time.sleep(max(0, interval - (time.monotonic() - started)))
+
+
+def now() -> str:
+    return datetime.datetime.utcnow().isoformat()
+
+
+def round_summary(round_state: dict) -> str:
+    decisions = round_state['decisions']
+    recharged = [entry for entry in decisions if entry.get('tx_hash')]
+    unfunded = [entry for entry in decisions if entry['action'] == INSUFFICIENT_FUNDS]
+    summary = f'{round_state["time"]} block {round_state["block"]}: ' \
+        f'{len(recharged)} of {len(decisions)} SRW wallets recharged'
+    if recharged:
+        summary += f' with {from_wei(sum(entry["amount"] for entry in recharged))} ETH'
+    if unfunded:
+        summary += f', {len(unfunded)} not recharged due to insufficient keeper balance'
+    return summary
+
+
+def load_pending(state_filepath: str, address: str) -> dict:
+    if not os.path.exists(state_filepath):
+        return {}
+    try:
+        state = read_json(state_filepath)
+    except ValueError as err:
+        logger.warning(f'SRW keeper state file {state_filepath} is not valid: {err}')
+        return {}
+    return state.get('pending') or {} if state.get('address') == address else {}
+
+
+def write_state(state_filepath: str, state: dict) -> None:
+    """State file is replaced atomically, so readers never see a partial file"""
+    safe_mk_dirs(os.path.dirname(os.path.abspath(state_filepath)))
+    tmp_filepath = f'{state_filepath}.tmp'
+    write_json(tmp_filepath, state)
+    os.replace(tmp_filepath, state_filepath)
+
+
+def run_keeper(validator_ids: List[int], threshold: str, target: str, interval: float,
+               state_filepath: str, once: bool, pk_file: str, fee: TxFee) -> None:
+    try:
+        threshold_wei, target_wei = parse_amounts(threshold, target)
+    except KeeperError as err:
+        print(err)
+        sys.exit(CLIExitCodes.FAILURE.value)
+    if is_no_wait():
+        print('--no-wait can\'t be used with the keeper: '
+              'a wallet could be recharged again before the previous recharge is mined')
+        sys.exit(CLIExitCodes.FAILURE.value)
+    skale = init_skale_w_wallet_from_config(pk_file)
+    if not skale:
+        return
+    keeper = SrwKeeper(skale, validator_ids, threshold_wei, target_wei, fee, state_filepath)
+    print(f'SRW keeper is watching validators {", ".join(map(str, keeper.validator_ids))}, '
+          f'state file: {state_filepath}')
+    try:
+        keeper.run(interval, once)
+    except KeyboardInterrupt:
+        print('SRW keeper stopped')
+
+
+def keeper_status(state_filepath: str) -> None:
+    if not os.path.exists(state_filepath):
+        print(f'SRW keeper state file {state_filepath} not found')
+        sys.exit(CLIExitCodes.FAILURE.value)
+    print_srw_keeper_state(read_json(state_filepath))
@@ -1,3 +1,4 @@
+import dataclasses
 from dataclasses import dataclass
 from typing import Optional
 
@@ -15,3 +16,14 @@ class TxFee:
                    f'maxPriorityFeePerGas: {self.max_priority_fee_per_gas}'
         else:
             return f'[Fee] gasPrice: {self.gas_price}'
+
+    def tx_kwargs(self) -> dict:
+        """
+        Fee arguments of skale.py transaction methods. They request eth_gasPrice
+        when gas_price is not passed even if EIP-1559 fields are set, these take
+        precedence, so max fee is passed as gas price to skip the request.
+        """
+        kwargs = dataclasses.asdict(self)
+        if kwargs['gas_price'] is None and self.max_priority_fee_per_gas:
+            kwargs['gas_price'] = self.max_fee_per_gas
+        return kwargs
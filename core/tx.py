@@ -0,0 +1,132 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of validator-cli
+#
+#   Copyright (C) 2022 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from web3.exceptions import TransactionNotFound
+
+from core.tx_journal import read_tx_journal
+from utils.constants import TX_RESOLVE_MAX_WORKERS, TX_WAIT_POLL_INTERVAL
+from utils.exit_codes import CLIExitCodes
+from utils.helper import get_config, spinner
+from utils.print_formatters import print_tx_statuses
+from utils.web3_utils import init_skale_from_config
+from utils.ws_subscriptions import pushed_heads
+
+logger = logging.getLogger(__name__)
+
+SUCCESS = 'success'
+REVERTED = 'reverted'
+PENDING = 'pending'
+REPLACED = 'replaced'
+NOT_FOUND = 'not found'
+FINAL_STATUSES = (SUCCESS, REVERTED, REPLACED)
+
+
+def find_entries(tx_hashes: List[str], last: int) -> List[dict]:
+    """Journal entries for given hashes (unknown hashes are looked up too) or the last ones"""
+    entries = read_tx_journal()
+    if not tx_hashes:
+        return entries[-last:] if last else entries
+    by_hash = {entry['tx_hash'].lower(): entry for entry in entries}
+    return [by_hash.get(tx_hash.lower(), {'tx_hash': tx_hash}) for tx_hash in tx_hashes]
+
+
+def resolve_status(web3, entry: dict) -> dict:
+    tx_hash = entry['tx_hash']
+    try:
+        receipt = web3.eth.get_transaction_receipt(tx_hash)
+    except TransactionNotFound:
+        receipt = None
+    if receipt is not None:
+        status = SUCCESS if receipt['status'] == 1 else REVERTED
+        return {'status': status, 'block': receipt['blockNumber']}
+    try:
+        web3.eth.get_transaction(tx_hash)
+        return {'status': PENDING, 'block': None}
+    except TransactionNotFound:
+        pass
+    # Nonce is used by another transaction, e.g. this one was sped up or canceled
+    if entry.get('from') and entry.get('nonce') is not None and \
+            web3.eth.get_transaction_count(entry['from']) > entry['nonce']:
+        return {'status': REPLACED, 'block': None}
+    return {'status': NOT_FOUND, 'block': None}
+
+
+def resolve_statuses(web3, entries: List[dict]) -> List[dict]:
+    if not entries:
+        return []
+    workers = min(len(entries), TX_RESOLVE_MAX_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda entry: resolve_status(web3, entry), entries))
+
+
+def wait_statuses(web3, entries: List[dict], timeout: float,
+                  poll_interval: float = TX_WAIT_POLL_INTERVAL, heads=None) -> List[dict]:
+    """
+    Resolve statuses of all unfinished transactions every poll interval until timeout.
+    With pushed heads (websocket endpoint) statuses are resolved on every new block.
+    """
+    statuses = [None] * len(entries)
+    deadline = time.monotonic() + timeout
+    while True:
+        unfinished = [
+            i for i, status in enumerate(statuses)
+            if status is None or status['status'] not in FINAL_STATUSES
+        ]
+        for i, status in zip(unfinished, resolve_statuses(web3, [entries[i] for i in unfinished])):
+            statuses[i] = status
+        if all(status['status'] in FINAL_STATUSES for status in statuses) or \
+                time.monotonic() + poll_interval > deadline:
+            return statuses
+        if heads is None:
+            time.sleep(poll_interval)
+        else:
+            heads.get(timeout=poll_interval)
+
+
+def tx_status(tx_hashes: List[str], last: int) -> None:
+    entries = find_entries(tx_hashes, last)
+    if not entries:
+        print('No transactions in the journal')
+        return
+    skale = init_skale_from_config()
+    if not skale:
+        return
+    print_tx_statuses(entries, resolve_statuses(skale.web3, entries))
+
+
+def tx_wait(tx_hashes: List[str], last: int, timeout: float) -> None:
+    entries = find_entries(tx_hashes, last)
+    if not entries:
+        print('No transactions in the journal')
+        return
+    skale = init_skale_from_config()
+    if not skale:
+        return
+    with spinner(f'Waiting for {len(entries)} transaction(s)'), \
+            pushed_heads(get_config()['endpoint']) as heads:
+        statuses = wait_statuses(skale.web3, entries, timeout, heads=heads)
+    print_tx_statuses(entries, statuses)
+    if any(status['status'] != SUCCESS for status in statuses):
+        sys.exit(CLIExitCodes.TRANSACTION_ERROR.value)
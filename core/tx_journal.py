@@ -0,0 +1,156 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of validator-cli
+#
+#   Copyright (C) 2022 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Local journal of transactions sent with --no-wait. Imported on every start,
+so it should not import skale.py or web3.
+"""
+
+import datetime
+import json
+import logging
+import os
+from typing import List, Optional
+
+from utils.constants import SKALE_VAL_TX_JOURNAL_FILE
+
+logger = logging.getLogger(__name__)
+
+# Intent of the current --no-wait command, None when the command waits for receipts
+_intent = None
+# Hashes of transactions recorded by the current command
+_recorded = []
+
+# Transaction dict fields that are saved to the journal
+TX_FIELDS = {
+    'to': 'to',
+    'nonce': 'nonce',
+    'gas': 'gas',
+    'gasPrice': 'gas_price',
+    'maxFeePerGas': 'max_fee_per_gas',
+    'maxPriorityFeePerGas': 'max_priority_fee_per_gas',
+    'value': 'value',
+}
+
+
+def set_no_wait(intent: Optional[dict]) -> None:
+    global _intent
+    _intent = intent
+    _recorded.clear()
+
+
+def recorded_hashes() -> List[str]:
+    return list(_recorded)
+
+
+def is_no_wait() -> bool:
+    return _intent is not None
+
+
+def done_message(message: str) -> str:
+    """With --no-wait the transaction is only sent, so the success message would be premature"""
+    if is_no_wait():
+        return '✔ Transaction sent, check its status with < sk-val tx status >'
+    return message
+
+
+def record_tx(tx_dict: dict, tx_hash: str, sender: str, label: Optional[str] = None,
+              intent: Optional[dict] = None,
+              journal_filepath: str = SKALE_VAL_TX_JOURNAL_FILE) -> dict:
+    intent = intent or _intent
+    entry = {
+        'tx_hash': tx_hash,
+        'from': sender,
+        **{key: tx_dict.get(field) for field, key in TX_FIELDS.items()},
+        'intent': {**(intent or {}), 'label': label} if label else intent,
+        'timestamp': datetime.datetime.utcnow().isoformat()
+    }
+    os.makedirs(os.path.dirname(journal_filepath), exist_ok=True)
+    with open(journal_filepath, 'a') as journal_file:
+        journal_file.write(json.dumps(entry, default=str) + '\n')
+    _recorded.append(tx_hash)
+    logger.info(f'Transaction {tx_hash} recorded to {journal_filepath}')
+    return entry
+
+
+def read_tx_journal(journal_filepath: str = SKALE_VAL_TX_JOURNAL_FILE) -> List[dict]:
+    if not os.path.isfile(journal_filepath):
+        return []
+    entries = []
+    with open(journal_filepath) as journal_file:
+        for line in journal_file:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                logger.warning(f'Skipping broken tx journal line: {line!r}')
+    return entries
+
+
+def last_journal_nonce(sender: str,
+                       journal_filepath: str = SKALE_VAL_TX_JOURNAL_FILE) -> Optional[int]:
+    nonces = [entry['nonce'] for entry in read_tx_journal(journal_filepath)
+              if entry.get('from') == sender and entry.get('nonce') is not None]
+    return max(nonces, default=None)
+
+
+def no_wait_nonce(web3, sender: str, nonce: Optional[int],
+                  journal_filepath: str = SKALE_VAL_TX_JOURNAL_FILE) -> int:
+    """
+    skale.py takes the nonce from the latest block, so without waiting for receipts
+    the next transaction would reuse the nonce of the one that is still pending
+    """
+    nonces = [web3.eth.get_transaction_count(sender, 'pending')]
+    if nonce is not None:
+        nonces.append(nonce)
+    last_nonce = last_journal_nonce(sender, journal_filepath)
+    if last_nonce is not None:
+        nonces.append(last_nonce + 1)
+    return max(nonces)
+
+
+def journal_wallet(wallet, web3, journal_filepath: str = SKALE_VAL_TX_JOURNAL_FILE):
+    """
+    Record transactions sent by the wallet and skip waiting for receipts while
+    --no-wait is set. Mode is checked on every call because wallets are reused
+    by the daemon and the shell.
+    """
+    if getattr(wallet, 'journaled', False):
+        return wallet
+    sign_and_send, wait = wallet.sign_and_send, wallet.wait
+
+    def journaled_sign_and_send(tx_dict, *args, **kwargs):
+        if not is_no_wait():
+            return sign_and_send(tx_dict, *args, **kwargs)
+        tx_dict = {
+            **tx_dict,
+            'nonce': no_wait_nonce(web3, wallet.address, tx_dict.get('nonce'), journal_filepath)
+        }
+        tx_hash = sign_and_send(tx_dict, *args, **kwargs)
+        record_tx(tx_dict, tx_hash, wallet.address, journal_filepath=journal_filepath)
+        return tx_hash
+
+    def journaled_wait(tx_hash, *args, **kwargs):
+        if is_no_wait():
+            return None
+        return wait(tx_hash, *args, **kwargs)
+
+    wallet.sign_and_send = journaled_sign_and_send
+    wallet.wait = journaled_wait
+    wallet.journaled = True
+    return wallet
@@ -17,21 +17,24 @@
 #   You should have received a copy of the GNU Affero General Public License
 #   along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import dataclasses
 import sys
 from typing import Optional
 
 import click
-from yaspin import yaspin
 from terminaltables import SingleTable
 
+from core.fee_oracle import resolve_fee
+from core.pipeline import OK_STATUSES, Pipeline, PipelineTx, simulate
+from core.presign import presign
 from core.transaction import TxFee
+from core.tx_journal import done_message
 from utils.web3_utils import (
     init_skale_from_config, init_skale_w_wallet_from_config)
 from utils.print_formatters import (print_bond_amount, print_validators,
-                                    print_delegations, print_linked_addresses)
-from utils.helper import to_wei, from_wei, percent_to_permille, permille_to_percent
-from utils.constants import SPIN_COLOR
+                                    print_delegations, print_linked_addresses,
+                                    print_pipeline_results)
+from utils.helper import to_wei, from_wei, percent_to_permille, permille_to_percent, spinner
+from utils.exit_codes import CLIExitCodes
 
 
 def register(name: str, description: str, commission_rate: float, min_delegation: int,
@@ -39,8 +42,8 @@ def register(name: str, description: str, commission_rate: float, min_delegation
     skale = init_skale_w_wallet_from_config(pk_file)
     if not skale:
         return
-    fee = fee or TxFee(gas_price=skale.gas_price)
-    with yaspin(text='Registering new validator', color=SPIN_COLOR) as sp:
+    fee = resolve_fee(skale, fee)
+    with spinner('Registering new validator') as sp:
         min_delegation_wei = to_wei(min_delegation)
         commission_rate_permille = percent_to_permille(commission_rate)
         tx_res = skale.validator_service.register_validator(
@@ -48,9 +51,9 @@ def register(name: str, description: str, commission_rate: float, min_delegation
             description=description,
             fee_rate=commission_rate_permille,
             min_delegation_amount=min_delegation_wei,
-            **dataclasses.asdict(fee)
+            **fee.tx_kwargs()
         )
-        sp.write("✔ New validator registered")
+        sp.write(done_message("✔ New validator registered"))
         print(f'Transaction hash: {tx_res.tx_hash}')
 
 
@@ -81,21 +84,22 @@ def accept_pending_delegation(
     skale = init_skale_w_wallet_from_config(pk_file)
     if not skale:
         return
-    fee = fee or TxFee(gas_price=skale.gas_price)
-    with yaspin(text='Accepting delegation request', color=SPIN_COLOR) as sp:
+    fee = resolve_fee(skale, fee)
+    with spinner('Accepting delegation request') as sp:
         tx_res = skale.delegation_controller.accept_pending_delegation(
             delegation_id=delegation_id,
-            **dataclasses.asdict(fee)
+            **fee.tx_kwargs()
         )
-        sp.write(f'✔ Delegation request with ID {delegation_id} accepted')
+        sp.write(done_message(f'✔ Delegation request with ID {delegation_id} accepted'))
         print(f'Transaction hash: {tx_res.tx_hash}')
 
 
-def accept_all_delegations(pk_file: str, fee: Optional[TxFee]) -> None:
+def accept_all_delegations(pk_file: str, fee: Optional[TxFee], pipelined: bool = False,
+                           signed_filepath: Optional[str] = None) -> None:
     skale = init_skale_w_wallet_from_config(pk_file)
     if not skale:
         return
-    fee = fee or TxFee(gas_price=skale.gas_price)
+    fee = resolve_fee(skale, fee)
     validator_id = skale.validator_service.validator_id_by_address(
         skale.wallet.address)
     delegations_list = skale.delegation_controller.get_all_delegations_by_validator(
@@ -115,15 +119,56 @@ def accept_all_delegations(pk_file: str, fee: Optional[TxFee]) -> None:
         print('Operation canceled')
         return
 
-    with yaspin(text='Accepting ALL delegation requests', color=SPIN_COLOR) as sp:
-        for delegation in pending_delegations:
+    if signed_filepath:
+        presign(skale, accept_delegation_txs(skale, pending_delegations), fee, signed_filepath,
+                label_header='Delegation Id')
+        return
+    if pipelined:
+        accept_delegations_pipelined(skale, pending_delegations, fee)
+        return
+
+    txs = accept_delegation_txs(skale, pending_delegations)
+    block = simulate(skale, txs)
+    # Skipped by the pre-flight call or failed to simulate
+    skipped = [tx for tx in txs if tx.status is not None]
+    if skipped:
+        print(f'\n{len(skipped)} delegation(s) can\'t be accepted at block {block} '
+              'and will be skipped:\n')
+        print_pipeline_results(skipped, label_header='Delegation Id')
+
+    with spinner('Accepting ALL delegation requests') as sp:
+        for delegation, tx in zip(pending_delegations, txs):
+            if tx.status is not None:
+                continue
             tx_res = skale.delegation_controller.accept_pending_delegation(
                 delegation_id=delegation['id'],
-                **dataclasses.asdict(fee)
+                **fee.tx_kwargs()
             )
-            sp.write(
-                f'✔ Delegation request with ID {delegation["id"]} accepted')
+            sp.write(done_message(
+                f'✔ Delegation request with ID {delegation["id"]} accepted'))
             print(f'Transaction hash: {tx_res.tx_hash}')
+    if skipped:
+        sys.exit(CLIExitCodes.TRANSACTION_ERROR.value)
+
+
+def accept_delegation_txs(skale, pending_delegations: list) -> list:
+    return [
+        PipelineTx(
+            label=str(delegation['id']),
+            method=skale.delegation_controller.contract.functions.acceptPendingDelegation(
+                delegation['id'])
+        )
+        for delegation in pending_delegations
+    ]
+
+
+def accept_delegations_pipelined(skale, pending_delegations: list, fee: TxFee) -> None:
+    txs = accept_delegation_txs(skale, pending_delegations)
+    with spinner(f'Accepting {len(txs)} delegation requests'):
+        Pipeline(skale, fee).run(txs)
+    print_pipeline_results(txs, label_header='Delegation Id')
+    if any(tx.status not in OK_STATUSES for tx in txs):
+        sys.exit(CLIExitCodes.TRANSACTION_ERROR.value)
 
 
 def link_node_address(node_address: str,
@@ -133,15 +178,15 @@ def link_node_address(node_address: str,
     skale = init_skale_w_wallet_from_config(pk_file)
     if not skale:
         return
-    fee = fee or TxFee(gas_price=skale.gas_price)
-    with yaspin(text='Linking node address', color=SPIN_COLOR) as sp:
+    fee = resolve_fee(skale, fee)
+    with spinner('Linking node address') as sp:
         tx_res = skale.validator_service.link_node_address(
             node_address=node_address,
             signature=signature,
-            **dataclasses.asdict(fee)
+            **fee.tx_kwargs()
         )
-        sp.write(
-            f'✔ Node address {node_address} linked to your validator address')
+        sp.write(done_message(
+            f'✔ Node address {node_address} linked to your validator address'))
         print(f'Transaction hash: {tx_res.tx_hash}')
 
 
@@ -149,14 +194,14 @@ def unlink_node_address(node_address: str, pk_file: str, fee: Optional[TxFee]) -
     skale = init_skale_w_wallet_from_config(pk_file)
     if not skale:
         return
-    fee = fee or TxFee(gas_price=skale.gas_price)
-    with yaspin(text='Unlinking node address', color=SPIN_COLOR) as sp:
+    fee = resolve_fee(skale, fee)
+    with spinner('Unlinking node address') as sp:
         tx_res = skale.validator_service.unlink_node_address(
             node_address=node_address,
-            **dataclasses.asdict(fee)
+            **fee.tx_kwargs()
         )
-        sp.write(
-            f'✔ Node address {node_address} unlinked from your validator address')
+        sp.write(done_message(
+            f'✔ Node address {node_address} unlinked from your validator address'))
         print(f'Transaction hash: {tx_res.tx_hash}')
 
 
@@ -208,14 +253,14 @@ def withdraw_fee(recipient_address: str, pk_file: str, fee: Optional[TxFee]) ->
     skale = init_skale_w_wallet_from_config(pk_file)
     if not skale:
         return
-    fee = fee or TxFee(gas_price=skale.gas_price)
-    with yaspin(text='Withdrawing fee', color=SPIN_COLOR) as sp:
+    fee = resolve_fee(skale, fee)
+    with spinner('Withdrawing fee') as sp:
         tx_res = skale.distributor.withdraw_fee(
             to=recipient_address,
-            **dataclasses.asdict(fee)
+            **fee.tx_kwargs()
         )
-        sp.write(
-            f'✔ Earned fees successfully transferred to {recipient_address}')
+        sp.write(done_message(
+            f'✔ Earned fees successfully transferred to {recipient_address}'))
         print(f'Transaction hash: {tx_res.tx_hash}')
 
 
@@ -231,15 +276,15 @@ def set_mda(new_mda: int, pk_file: str, fee: Optional[TxFee]) -> None:
     skale = init_skale_w_wallet_from_config(pk_file)
     if not skale:
         return
-    fee = fee or TxFee(gas_price=skale.gas_price)
-    with yaspin(text='Changing minimum delegation amount', color=SPIN_COLOR) as sp:
+    fee = resolve_fee(skale, fee)
+    with spinner('Changing minimum delegation amount') as sp:
         new_mda_wei = to_wei(new_mda)
         tx_res = skale.validator_service.set_validator_mda(
             minimum_delegation_amount=new_mda_wei,
-            **dataclasses.asdict(fee)
+            **fee.tx_kwargs()
         )
-        sp.write(
-            f'✔ Minimum delegation amount for your validator ID changed to {new_mda}')
+        sp.write(done_message(
+            f'✔ Minimum delegation amount for your validator ID changed to {new_mda}'))
         print(f'Transaction hash: {tx_res.tx_hash}')
 
 
@@ -247,17 +292,17 @@ def change_address(address: str, pk_file: str, fee: Optional[TxFee]) -> None:
     skale = init_skale_w_wallet_from_config(pk_file)
     if not skale:
         return
-    fee = fee or TxFee(gas_price=skale.gas_price)
-    with yaspin(text='Requesting new validator address', color=SPIN_COLOR) as sp:
+    fee = resolve_fee(skale, fee)
+    with spinner('Requesting new validator address') as sp:
         tx_res = skale.validator_service.request_for_new_address(
             new_validator_address=address,
-            **dataclasses.asdict(fee)
+            **fee.tx_kwargs()
         )
-        sp.write(
+        sp.write(done_message(
             f'✔ Requested new address for your validator ID: {address}.\n'
             'You can finish the procedure by running < sk-val validator confirm-address > '
             'using the new key.'
-        )
+        ))
         print(f'Transaction hash: {tx_res.tx_hash}')
 
 
@@ -265,13 +310,13 @@ def confirm_address(validator_id: int, pk_file: str, fee: Optional[TxFee]) -> No
     skale = init_skale_w_wallet_from_config(pk_file)
     if not skale:
         return
-    fee = fee or TxFee(gas_price=skale.gas_price)
-    with yaspin(text='Confirming validator address change', color=SPIN_COLOR) as sp:
+    fee = resolve_fee(skale, fee)
+    with spinner('Confirming validator address change') as sp:
         tx_res = skale.validator_service.confirm_new_address(
             validator_id=validator_id,
-            **dataclasses.asdict(fee)
+            **fee.tx_kwargs()
         )
-        sp.write('✔ Validator address changed')
+        sp.write(done_message('✔ Validator address changed'))
         print(f'Transaction hash: {tx_res.tx_hash}')
 
 
@@ -295,7 +340,7 @@ def edit(name: str, description: str, pk_file: str, fee: Optional[TxFee]) -> Non
     if not skale:
         return
 
-    fee = fee or TxFee(gas_price=skale.gas_price)
+    fee = resolve_fee(skale, fee)
     if not name and not description:
         print('You didn\'t provide name or description, nothing will be changed')
         return
@@ -318,24 +363,24 @@ def edit(name: str, description: str, pk_file: str, fee: Optional[TxFee]) -> Non
 
 def change_validator_name(name, skale, validator, fee):
     msg = f'Changing name for validator ID {validator["id"]}: {validator["name"]} -> {name}'
-    with yaspin(text=msg, color=SPIN_COLOR) as sp:
+    with spinner(msg) as sp:
         tx_res = skale.validator_service.set_validator_name(
             new_name=name,
-            **dataclasses.asdict(fee)
+            **fee.tx_kwargs()
         )
-        sp.write(
-            f'✔ Validator name for ID {validator["id"]} changed to {name}')
+        sp.write(done_message(
+            f'✔ Validator name for ID {validator["id"]} changed to {name}'))
         print(f'Transaction hash: {tx_res.tx_hash}')
 
 
 def change_validator_description(description, skale, validator, fee):
     msg = f'Changing description for validator ID {validator["id"]}: \
 {validator["description"]} -> {description}'
-    with yaspin(text=msg, color=SPIN_COLOR) as sp:
+    with spinner(msg) as sp:
         tx_res = skale.validator_service.set_validator_description(
             new_description=description,
-            **dataclasses.asdict(fee)
+            **fee.tx_kwargs()
         )
-        sp.write(
-            f'✔ Validator description for ID {validator["id"]} changed to {description}')
+        sp.write(done_message(
+            f'✔ Validator description for ID {validator["id"]} changed to {description}'))
         print(f'Transaction hash: {tx_res.tx_hash}')
@@ -17,23 +17,47 @@
 #   You should have received a copy of the GNU Affero General Public License
 #   along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import dataclasses
+import csv
+import datetime
 import logging
-from typing import Optional
+import os
+import sys
+from decimal import Decimal, InvalidOperation
+from typing import List, NamedTuple, Optional
 
+import click
+from skale.transactions.tools import compose_eth_transfer_tx
 from skale.utils.account_tools import send_eth, send_tokens
 from skale.utils.web3_utils import to_checksum_address
-from yaspin import yaspin
 
+from core.fee_oracle import resolve_fee
+from core.pipeline import EthTransfer, OK_STATUSES, Pipeline, PipelineTx, max_gas_price
 from core.transaction import TxFee
+from core.tx_journal import done_message, is_no_wait
 from core.wallet_tools import save_ledger_wallet_info
 
-from utils.constants import SPIN_COLOR
+from utils.constants import PAYOUT_TRANSFER_GAS, SKALE_VAL_PAYOUTS_FOLDER
+from utils.exit_codes import CLIExitCodes
+from utils.print_formatters import print_payout_results
 from utils.web3_utils import init_skale_w_wallet_from_config
-from utils.helper import print_err_with_log_path, get_config
+from utils.helper import (CsvFileError, print_err_with_log_path, get_config, from_wei,
+                          read_csv_rows, safe_mk_dirs, spinner, to_wei)
 
 logger = logging.getLogger(__name__)
 
+PAYOUTS_CSV_COLUMNS = ('address', 'amount', 'token')
+PAYOUT_TOKENS = ('eth', 'skl')
+PAYOUT_STATUS_COLUMNS = (
+    'line', 'address', 'amount', 'token', 'status', 'nonce', 'tx_hash', 'error'
+)
+
+
+class PayoutRow(NamedTuple):
+    line: int
+    address: str
+    amount: Decimal
+    token: str
+
 
 def transfer_eth(receiver_address, amount, pk_file, fee: Optional[TxFee]):
     transfer_funds(
@@ -58,25 +82,28 @@ def transfer_skl(receiver_address, amount, pk_file, fee: Optional[TxFee]):
 def transfer_funds(receiver_address, amount, pk_file, fee: Optional[TxFee], token_type):
     skale = init_skale_w_wallet_from_config(pk_file)
     receiver_address = to_checksum_address(receiver_address)
-    fee = fee or TxFee(gas_price=skale.gas_price)
-    with yaspin(text='Transferring funds', color=SPIN_COLOR) as sp:
+    fee = resolve_fee(skale, fee)
+    with spinner('Transferring funds') as sp:
         try:
-            if token_type == 'eth':
+            if token_type == 'eth' and is_no_wait():
+                # send_eth always checks the receipt
+                send_eth_no_wait(skale, receiver_address, amount, fee)
+            elif token_type == 'eth':
                 send_eth(
                     skale.web3,
                     skale.wallet,
                     receiver_address,
                     amount,
-                    **dataclasses.asdict(fee)
+                    **fee.tx_kwargs()
                 )
             elif token_type == 'skl':
                 send_tokens(
                     skale,
                     receiver_address,
                     amount,
-                    **dataclasses.asdict(fee)
+                    **fee.tx_kwargs()
                 )
-            msg = '✔ Funds were successfully transferred'
+            msg = done_message('✔ Funds were successfully transferred')
             logger.info(msg)
             sp.write(msg)
         except Exception as err:
@@ -85,6 +112,149 @@ def transfer_funds(receiver_address, amount, pk_file, fee: Optional[TxFee], toke
             print_err_with_log_path()
 
 
+def send_eth_no_wait(skale, receiver_address, amount, fee: TxFee) -> str:
+    tx = compose_eth_transfer_tx(
+        web3=skale.web3,
+        from_address=skale.wallet.address,
+        to_address=receiver_address,
+        value=to_wei(amount),
+        **fee.tx_kwargs()
+    )
+    return skale.wallet.sign_and_send(tx)
+
+
+def parse_payout_row(line: int, row: dict) -> PayoutRow:
+    try:
+        address = to_checksum_address(row['address'])
+    except (ValueError, TypeError):
+        raise CsvFileError(f'Line {line}: {row["address"]} is not a valid address')
+    try:
+        amount = Decimal(row['amount'])
+    except InvalidOperation:
+        raise CsvFileError(f'Line {line}: amount should be a number')
+    if amount <= 0:
+        raise CsvFileError(f'Line {line}: amount should be positive')
+    token = row['token'].lower()
+    if token not in PAYOUT_TOKENS:
+        raise CsvFileError(f'Line {line}: token should be one of {", ".join(PAYOUT_TOKENS)}')
+    return PayoutRow(line, address, amount, token)
+
+
+def read_payouts_csv(csv_filepath: str) -> List[PayoutRow]:
+    """All rows are parsed and addresses checksummed before anything is sent"""
+    return [
+        parse_payout_row(line, row)
+        for line, row in read_csv_rows(csv_filepath, PAYOUTS_CSV_COLUMNS)
+    ]
+
+
+def payout_totals(rows: List[PayoutRow]) -> dict:
+    return {
+        token: sum(row.amount for row in rows if row.token == token)
+        for token in PAYOUT_TOKENS
+        if any(row.token == token for row in rows)
+    }
+
+
+def payouts_gas_cost(rows: List[PayoutRow], fee: dict) -> int:
+    return sum(PAYOUT_TRANSFER_GAS[row.token] for row in rows) * max_gas_price(fee)
+
+
+def check_payouts(skale, rows: List[PayoutRow], fee: dict) -> List[str]:
+    """
+    ETH and SKL balances are read once and compared with the totals of the file,
+    gas of all transfers at the resolved fee is added to the ETH total
+    """
+    address = skale.wallet.address
+    errors = []
+    gas_cost = payouts_gas_cost(rows, fee)
+    eth_total = sum(to_wei(row.amount) for row in rows if row.token == 'eth') + gas_cost
+    eth_balance = skale.web3.eth.get_balance(address)
+    if eth_total > eth_balance:
+        errors.append(f'Total amount {from_wei(eth_total)} ETH (including up to '
+                      f'{from_wei(gas_cost)} ETH of fees) exceeds the balance '
+                      f'of {address} ({from_wei(eth_balance)} ETH)')
+    skl_total = sum(to_wei(row.amount) for row in rows if row.token == 'skl')
+    if skl_total:
+        skl_balance = skale.token.contract.functions.balanceOf(address).call()
+        if skl_total > skl_balance:
+            errors.append(f'Total amount {from_wei(skl_total)} SKL exceeds the balance '
+                          f'of {address} ({from_wei(skl_balance)} SKL)')
+    return errors
+
+
+def payout_tx(skale, row: PayoutRow, chain_id: int) -> PipelineTx:
+    label = str(row.line)
+    if row.token == 'eth':
+        return PipelineTx(label=label, method=EthTransfer(skale.web3, row.address, chain_id),
+                          value=to_wei(row.amount))
+    return PipelineTx(
+        label=label,
+        method=skale.token.contract.functions.transfer(row.address, to_wei(row.amount))
+    )
+
+
+def default_status_filepath(csv_filepath: str) -> str:
+    name = os.path.splitext(os.path.basename(csv_filepath))[0]
+    timestamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+    return os.path.join(SKALE_VAL_PAYOUTS_FOLDER, f'{name}-{timestamp}.csv')
+
+
+def write_payout_statuses(status_filepath: str, rows: List[PayoutRow],
+                          txs: List[PipelineTx]) -> None:
+    safe_mk_dirs(os.path.dirname(os.path.abspath(status_filepath)))
+    with open(status_filepath, 'w', newline='') as status_file:
+        writer = csv.writer(status_file)
+        writer.writerow(PAYOUT_STATUS_COLUMNS)
+        for row, tx in zip(rows, txs):
+            writer.writerow([
+                row.line, row.address, row.amount, row.token,
+                tx.status.value if tx.status else '',
+                '' if tx.nonce is None else tx.nonce,
+                tx.tx_hash or '',
+                tx.error or ''
+            ])
+
+
+def send_payouts(csv_filepath: str, pk_file: str, fee: Optional[TxFee],
+                 status_filepath: Optional[str] = None, yes: bool = False) -> None:
+    try:
+        rows = read_payouts_csv(csv_filepath)
+    except CsvFileError as err:
+        print(f'Wrong payouts file {csv_filepath}: {err}')
+        sys.exit(CLIExitCodes.FAILURE.value)
+    skale = init_skale_w_wallet_from_config(pk_file)
+    if not skale:
+        return
+    pipeline = Pipeline(skale, fee)
+    errors = check_payouts(skale, rows, pipeline.fee)
+    if errors:
+        print('Payouts can\'t be sent:\n' + '\n'.join(errors))
+        sys.exit(CLIExitCodes.FAILURE.value)
+    totals = ', '.join(
+        f'{amount} {token.upper()}' for token, amount in payout_totals(rows).items()
+    )
+    if not yes and not click.confirm(
+            f'{len(rows)} transfer(s) of {totals} will be sent from {skale.wallet.address}. '
+            'Do you want to continue?'):
+        print('Operation canceled')
+        return
+
+    chain_id = skale.web3.eth.chain_id
+    txs = [payout_tx(skale, row, chain_id) for row in rows]
+    status_filepath = status_filepath or default_status_filepath(csv_filepath)
+    # Statuses are saved even if sending is interrupted, so sent rows are not paid twice
+    try:
+        with spinner(f'Sending {len(txs)} transfers'):
+            pipeline.run(txs)
+    finally:
+        write_payout_statuses(status_filepath, rows, txs)
+        print(f'Payout statuses: {status_filepath}')
+    print_payout_results(rows, txs)
+    if any(tx.status not in OK_STATUSES for tx in txs):
+        sys.exit(CLIExitCodes.TRANSACTION_ERROR.value)
+
+
 def setup_ledger(address_index, keys_type):
     config = get_config()
     if not config:
@@ -11,6 +11,10 @@ import sys
 
 import wcwidth
 
+# onefile (default) - single executable unpacked to a temp dir on every run
+# onedir - executable with its libraries in one directory, nothing is unpacked at start-up
+BUILD_MODE = os.getenv('BUILD_MODE', 'onefile')
+
 package_imports = [['sgx', ['generate.sh']]]
 
 external_data = []
@@ -39,6 +43,7 @@ a = Analysis(
     binaries=binaries,
     datas=[
         ("./text.yml", "data"),
+        ("./text.bundle", "data"),
         (os.path.dirname(wcwidth.__file__), 'wcwidth'),
         *external_data
     ],
@@ -62,18 +67,41 @@ pyz = PYZ(
     cipher=block_cipher
 )
 
-exe = EXE(
-    pyz,
-    a.scripts,
-    a.binaries,
-    a.zipfiles,
-    a.datas,
-    [],
-    name='main',
-    debug=False,
-    bootloader_ignore_signals=False,
-    strip=False,
-    upx=True,
-    runtime_tmpdir=None,
-    console=True 
-)
+if BUILD_MODE == 'onedir':
+    exe = EXE(
+        pyz,
+        a.scripts,
+        [],
+        exclude_binaries=True,
+        name='sk-val',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=False,
+        console=True
+    )
+    coll = COLLECT(
+        exe,
+        a.binaries,
+        a.zipfiles,
+        a.datas,
+        strip=False,
+        upx=False,
+        name='main'
+    )
+else:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        a.binaries,
+        a.zipfiles,
+        a.datas,
+        [],
+        name='main',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=True,
+        runtime_tmpdir=None,
+        console=True
+    )
@@ -4,8 +4,9 @@ set -e
 
 VERSION=$1
 BRANCH=$2
+export BUILD_MODE=${BUILD_MODE:-onefile}
 
-USAGE_MSG='Usage: build.sh [VERSION] [BRANCH]'
+USAGE_MSG='Usage: [BUILD_MODE=onefile|onedir] build.sh [VERSION] [BRANCH]'
 
 if [ -z "$1" ]
 then
@@ -39,12 +40,28 @@ echo "VERSION = '$VERSION'" >> $DIST_INFO_FILEPATH
 
 EXECUTABLE_NAME=sk-val-$VERSION-$OS
 
+(cd $PARENT_DIR && python -c 'from utils.texts import compile_text_bundle; compile_text_bundle()')
+(cd $PARENT_DIR && python -c 'from cli.main import cli; from utils.completion import write_completion_scripts; write_completion_scripts(cli, "dist/completion")')
+tar -czf $PARENT_DIR/dist/sk-val-$VERSION-completion.tar.gz -C $PARENT_DIR/dist completion
+
 UNAME_RES="$(uname -s)"
 
-pyinstaller main.spec
+if [ "$BUILD_MODE" = "onedir" ]
+then
+    EXECUTABLE_NAME=$EXECUTABLE_NAME-onedir
+fi
+
+pyinstaller --noconfirm main.spec
 
+rm -rf $PARENT_DIR/dist/$EXECUTABLE_NAME
 mv $PARENT_DIR/dist/main $PARENT_DIR/dist/$EXECUTABLE_NAME
 
+if [ "$BUILD_MODE" = "onedir" ]
+then
+    tar -czf $PARENT_DIR/dist/$EXECUTABLE_NAME.tar.gz -C $PARENT_DIR/dist $EXECUTABLE_NAME
+    EXECUTABLE_NAME=$EXECUTABLE_NAME/sk-val
+fi
+
 echo "========================================================================================="
 echo "Built validator-cli v$VERSION, branch: $BRANCH"
 echo "Executable: $EXECUTABLE_NAME"
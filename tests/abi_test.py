@@ -0,0 +1,73 @@
+""" Tests for utils/abi.py module """
+
+import json
+import os
+
+import mock
+
+import utils.abi as utils_abi
+from utils.abi import compile_abi_bundle, load_abi, load_abi_bundle, read_abi_bundle
+
+TEST_ADDRESS = '0x1057dc7765e76cd4f4f9c8bb0e57f2f7cb1d0a6c'
+TEST_ABI = {
+    'validator_service_address': TEST_ADDRESS,
+    'validator_service_abi': [
+        {
+            'type': 'function',
+            'name': 'getValidator',
+            'inputs': [{'name': 'validatorId', 'type': 'uint256'}],
+            'outputs': []
+        },
+        {
+            'type': 'event',
+            'name': 'ValidatorRegistered',
+            'anonymous': False,
+            'inputs': [{'indexed': False, 'name': 'validatorId', 'type': 'uint256'}]
+        }
+    ],
+    'schains_address': '0x0000000000000000000000000000000000000001',
+    'schains_abi': []
+}
+
+
+def write_abi(path, abi):
+    with open(path, 'w') as abi_file:
+        json.dump(abi, abi_file)
+
+
+def test_compile_abi_bundle(tmp_path):
+    abi_filepath = os.path.join(tmp_path, 'abi.json')
+    bundle_filepath = os.path.join(tmp_path, 'abi.bundle')
+    write_abi(abi_filepath, TEST_ABI)
+
+    bundle = compile_abi_bundle(abi_filepath, bundle_filepath)
+    assert bundle == read_abi_bundle(bundle_filepath)
+    assert set(bundle['abi']) == {'validator_service_address', 'validator_service_abi'}
+    assert bundle['selectors']['validator_service'] == {'0xb5d89627': 'getValidator'}
+    assert list(bundle['topics']['validator_service'].values()) == ['ValidatorRegistered']
+    assert bundle['addresses'] == {TEST_ADDRESS: 'validator_service'}
+
+
+def test_load_abi_recompiles_stale_bundle(tmp_path):
+    abi_filepath = os.path.join(tmp_path, 'abi.json')
+    bundle_filepath = os.path.join(tmp_path, 'abi.bundle')
+    write_abi(abi_filepath, TEST_ABI)
+    assert load_abi(abi_filepath, bundle_filepath)['validator_service_address'] == TEST_ADDRESS
+
+    new_address = '0x0000000000000000000000000000000000000002'
+    write_abi(abi_filepath, {**TEST_ABI, 'validator_service_address': new_address})
+    bundle = load_abi_bundle(abi_filepath, bundle_filepath)
+    assert bundle['abi']['validator_service_address'] == new_address
+    assert read_abi_bundle(bundle_filepath)['source_hash'] == bundle['source_hash']
+
+
+def test_load_abi_bundle_skips_hashing_for_same_stamp(tmp_path):
+    abi_filepath = os.path.join(tmp_path, 'abi.json')
+    bundle_filepath = os.path.join(tmp_path, 'abi.bundle')
+    write_abi(abi_filepath, TEST_ABI)
+    bundle = load_abi_bundle(abi_filepath, bundle_filepath)
+    with mock.patch('utils.abi.file_hash') as file_hash_mock:
+        assert load_abi_bundle(abi_filepath, bundle_filepath) is bundle
+        utils_abi._loaded_bundles.clear()
+        assert load_abi_bundle(abi_filepath, bundle_filepath) == bundle
+        file_hash_mock.assert_not_called()
@@ -0,0 +1,163 @@
+""" Tests for core/batch.py module """
+
+import json
+from unittest import mock
+
+import pytest
+
+from core.batch import BatchPlanError, operation_tx, read_plan, run_stages
+from core.pipeline import TxStatus
+from core.transaction import TxFee
+from tests.utils import fake_to_wei
+from utils.validations import to_checksum_address
+
+RECIPIENT = '0x' + 'ab' * 20
+CHECKSUM_RECIPIENT = to_checksum_address(RECIPIENT)
+
+
+def write_plan(tmp_path, content):
+    plan_filepath = tmp_path / 'plan.yaml'
+    plan_filepath.write_text(content)
+    return str(plan_filepath)
+
+
+def test_read_plan_stages(tmp_path):
+    plan_filepath = write_plan(tmp_path, f'''
+stages:
+  - operations:
+      - op: validator accept-delegation
+        delegation_id: 1
+      - op: holder withdraw-bounty
+        validator_id: 1
+        recipient_address: '{RECIPIENT}'
+  - operations:
+      - op: srw recharge
+        validator_id: 1
+        amount: 0.5
+''')
+    assert read_plan(plan_filepath) == [
+        [
+            {'op': 'validator accept-delegation', 'delegation_id': 1},
+            {'op': 'holder withdraw-bounty', 'validator_id': 1,
+             'recipient_address': CHECKSUM_RECIPIENT}
+        ],
+        [{'op': 'srw recharge', 'validator_id': 1, 'amount': 0.5}]
+    ]
+
+
+def test_read_plan_operations(tmp_path):
+    plan_filepath = write_plan(tmp_path, '''
+operations:
+  - op: holder undelegate
+    delegation_id: 3
+''')
+    assert read_plan(plan_filepath) == [[{'op': 'holder undelegate', 'delegation_id': 3}]]
+
+
+@pytest.mark.parametrize('content,message', [
+    ('stages: []', 'Plan has no stages'),
+    ('- op: holder undelegate', 'should be a mapping'),
+    ('stages:\n  - op: holder undelegate', 'should have `operations` list'),
+    ('operations:\n  - op: holder steal', '`op` should be one of'),
+    ('operations:\n  - op: holder undelegate', 'expected params delegation_id, got none'),
+    ('operations:\n  - op: holder undelegate\n    delegation_id: 1\n    amount: 2',
+     'got amount, delegation_id'),
+    ('operations:\n  - op: validator withdraw-fee\n    recipient_address: 0x12',
+     'recipient_address is not a valid address'),
+    ('operations:\n  - op: holder undelegate\n    delegation_id: \'1\'',
+     'delegation_id should be a non-negative integer'),
+    ('operations:\n  - op: validator accept-delegation\n    delegation_id: true',
+     'delegation_id should be a non-negative integer'),
+    ('operations:\n  - op: srw recharge\n    validator_id: 1\n    amount: lots',
+     'amount should be a positive number'),
+    ('operations:\n  - op: srw withdraw\n    amount: -1',
+     'amount should be a positive number'),
+])
+def test_read_plan_errors(tmp_path, content, message):
+    with pytest.raises(BatchPlanError, match=message):
+        read_plan(write_plan(tmp_path, content))
+
+
+@mock.patch('core.batch.to_wei', fake_to_wei)
+def test_operation_tx():
+    skale = mock.Mock()
+    tx = operation_tx(skale, '0.0 holder delegate', {
+        'op': 'holder delegate', 'validator_id': 1, 'amount': 100,
+        'delegation_period': 2, 'info': 'test'
+    })
+    skale.delegation_controller.contract.functions.delegate.assert_called_once_with(
+        1, 100 * 10 ** 18, 2, 'test')
+    assert tx.value == 0
+
+    tx = operation_tx(skale, '0.1 srw recharge', {
+        'op': 'srw recharge', 'validator_id': 1, 'amount': 0.5
+    })
+    skale.wallets.contract.functions.rechargeValidatorWallet.assert_called_once_with(1)
+    assert tx.value == 5 * 10 ** 17
+    assert tx.label == '0.1 srw recharge'
+
+
+def fake_pipeline_run(failed_labels):
+    def run(self, txs):
+        for nonce, tx in enumerate(txs):
+            failed = tx.label in failed_labels
+            tx.status = TxStatus.REVERTED if failed else TxStatus.SUCCESS
+            tx.nonce, tx.tx_hash = nonce, f'0x{nonce}'
+        return txs
+    return run
+
+
+def read_journal(journal_filepath):
+    with open(journal_filepath) as journal_file:
+        return [json.loads(line) for line in journal_file]
+
+
+STAGES = [
+    [{'op': 'validator accept-delegation', 'delegation_id': 1},
+     {'op': 'validator accept-delegation', 'delegation_id': 2}],
+    [{'op': 'holder undelegate', 'delegation_id': 3}]
+]
+
+
+def test_run_stages(tmp_path):
+    journal_filepath = str(tmp_path / 'journal.jsonl')
+    with mock.patch('core.batch.Pipeline.run', fake_pipeline_run([])):
+        success = run_stages(mock.Mock(), 'plan.yaml', STAGES, TxFee(gas_price=1),
+                             journal_filepath)
+    assert success
+    journal = read_journal(journal_filepath)
+    assert [entry['label'] for entry in journal] == [
+        '0.0 validator accept-delegation',
+        '0.1 validator accept-delegation',
+        '1.0 holder undelegate'
+    ]
+    assert [entry['status'] for entry in journal] == ['success'] * 3
+    assert journal[1]['params'] == {'delegation_id': 2}
+    assert journal[1]['tx_hash'] == '0x1'
+
+
+@pytest.mark.parametrize('continue_on_error,last_status', [
+    (False, 'skipped'),
+    (True, 'success'),
+])
+def test_run_stages_failed(tmp_path, continue_on_error, last_status):
+    journal_filepath = str(tmp_path / 'journal.jsonl')
+    failed = ['0.1 validator accept-delegation']
+    with mock.patch('core.batch.Pipeline.run', fake_pipeline_run(failed)):
+        success = run_stages(mock.Mock(), 'plan.yaml', STAGES, TxFee(gas_price=1),
+                             journal_filepath, continue_on_error=continue_on_error)
+    assert not success
+    journal = read_journal(journal_filepath)
+    assert [entry['status'] for entry in journal] == ['success', 'reverted', last_status]
+    assert journal[2]['label'] == '1.0 holder undelegate'
+
+
+def test_run_stages_invalid_later_stage(tmp_path):
+    journal_filepath = str(tmp_path / 'journal.jsonl')
+    skale = mock.Mock()
+    skale.delegation_controller.contract.functions.requestUndelegation.side_effect = \
+        ValueError('Could not identify the intended function')
+    with mock.patch('core.batch.Pipeline.run') as run:
+        with pytest.raises(BatchPlanError, match='1.0 holder undelegate: Could not identify'):
+            run_stages(skale, 'plan.yaml', STAGES, TxFee(gas_price=1), journal_filepath)
+    run.assert_not_called()
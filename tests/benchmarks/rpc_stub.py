@@ -0,0 +1,70 @@
+""" Local stand-in JSON-RPC endpoint for start-up benchmarks """
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHAIN_ID = 1337
+# Decodes as 0 for static return types and as an empty list for dynamic ones
+EMPTY_CALL_RESULT = '0x' + '00' * 64
+
+RESULTS = {
+    'eth_chainId': hex(CHAIN_ID),
+    'net_version': str(CHAIN_ID),
+    'eth_blockNumber': '0x1',
+    'eth_gasPrice': '0x3b9aca00',
+    'eth_getBalance': '0x0',
+    'eth_getTransactionCount': '0x0',
+    'eth_getCode': '0x00',
+    'eth_call': EMPTY_CALL_RESULT,
+    'eth_getBlockByNumber': {
+        'number': '0x1', 'hash': '0x' + '00' * 32, 'parentHash': '0x' + '00' * 32,
+        'timestamp': '0x0', 'gasLimit': '0x1c9c380', 'gasUsed': '0x0',
+        'baseFeePerGas': '0x1', 'transactions': []
+    },
+}
+
+
+class RpcStubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        request = json.loads(body)
+        if isinstance(request, list):
+            response = [self.respond(item) for item in request]
+        else:
+            response = self.respond(request)
+        data = json.dumps(response).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def respond(self, request):
+        self.server.calls += 1
+        return {'jsonrpc': '2.0', 'id': request.get('id'),
+                'result': RESULTS.get(request['method'])}
+
+    def log_message(self, *args):
+        pass
+
+
+class RpcStub:
+    """Serves fixed answers so start-up numbers don't depend on a real node"""
+
+    def __init__(self, host='127.0.0.1', port=0):
+        self.server = ThreadingHTTPServer((host, port), RpcStubHandler)
+        self.server.calls = 0
+
+    @property
+    def endpoint(self):
+        host, port = self.server.server_address
+        return f'http://{host}:{port}'
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
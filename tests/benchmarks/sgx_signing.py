@@ -0,0 +1,80 @@
+""" SGX signing throughput: sgx.py client vs pooled concurrent client
+
+Usage:
+    python -m tests.benchmarks.sgx_signing [--endpoint URL] [--certs DIR] [--signatures N]
+
+Without --endpoint (or SGX_SERVER_URL) a local stand-in server is used. To measure
+against the SGX simulator started by scripts/run_sgx_simulator.sh pass its https endpoint.
+"""
+
+import argparse
+import os
+import secrets
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sgx.sgx_rpc_handler import SgxRPCHandler
+
+from core.sgx_pool import PooledSgxRPCHandler
+from tests.benchmarks.sgx_stub import SgxStub
+from tests.constants import SGX_SERVER_URL
+from utils.constants import SGX_MAX_CONCURRENT_SIGNS
+
+DEFAULT_SIGNATURES = 100
+
+
+def random_hashes(count):
+    return [hex(int.from_bytes(secrets.token_bytes(32), 'big')) for _ in range(count)]
+
+
+def measure(sign, key_name, hashes, workers):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(lambda message_hash: sign(key_name, message_hash), hashes))
+    elapsed = time.perf_counter() - start
+    return elapsed, len(hashes) / elapsed
+
+
+def run_benchmark(endpoint, certs_dir, signatures, max_concurrency):
+    baseline = SgxRPCHandler(endpoint, certs_dir)
+    key_name, _ = baseline.generate_key()
+    pooled = PooledSgxRPCHandler(endpoint, certs_dir, max_concurrency)
+    hashes = random_hashes(signatures)
+    results = {
+        'sgx.py, sequential': measure(baseline.ecdsa_sign, key_name, hashes, 1),
+        'pooled, sequential': measure(pooled.ecdsa_sign, key_name, hashes, 1),
+        f'pooled, {max_concurrency} concurrent': measure(
+            pooled.ecdsa_sign, key_name, hashes, max_concurrency),
+    }
+    pooled.close()
+    for name, (elapsed, throughput) in results.items():
+        print(f'{name:<28} {elapsed:>8.2f} s {throughput:>9.1f} signatures/s')
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SGX signing throughput benchmark')
+    parser.add_argument('--endpoint', default=SGX_SERVER_URL,
+                        help='SGX server endpoint (local stand-in is used if not set)')
+    parser.add_argument('--certs', help='Directory for client certificates (https endpoints)')
+    parser.add_argument('--signatures', type=int, default=DEFAULT_SIGNATURES)
+    parser.add_argument('--concurrency', type=int, default=SGX_MAX_CONCURRENT_SIGNS)
+    args = parser.parse_args()
+
+    if not args.endpoint:
+        with SgxStub() as stub:
+            print(f'Using local SGX stand-in {stub.endpoint}')
+            run_benchmark(stub.endpoint, None, args.signatures, args.concurrency)
+        return
+    with tempfile.TemporaryDirectory() as tmp_certs_dir:
+        certs_dir = args.certs or tmp_certs_dir
+        if not args.endpoint.startswith('https'):
+            certs_dir = None
+        elif not os.path.isdir(certs_dir):
+            os.makedirs(certs_dir)
+        run_benchmark(args.endpoint, certs_dir, args.signatures, args.concurrency)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+""" Local stand-in SGX server for signing tests and benchmarks """
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+KEY_NAME = 'NEK:0001'
+PUBLIC_KEY = 'ab' * 64
+SIGNATURE = {'signature_v': '0', 'signature_r': '1', 'signature_s': '2'}
+
+
+class SgxStubHandler(BaseHTTPRequestHandler):
+    # Keep-alive connections, as the real SGX server
+    protocol_version = 'HTTP/1.1'
+    # Headers and body in one segment, otherwise delayed ACKs stall kept-alive connections
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        data = json.dumps(self.server.stub.respond(self.client_address, request)).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class SgxStub:
+    """Answers ECDSA RPC calls after a fixed delay and counts connections and concurrent calls"""
+
+    def __init__(self, sign_delay=0.01, host='127.0.0.1', port=0):
+        self.server = ThreadingHTTPServer((host, port), SgxStubHandler)
+        self.server.daemon_threads = True
+        self.server.stub = self
+        self.sign_delay = sign_delay
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.connections = set()
+        self.in_flight = self.max_in_flight = 0
+
+    @property
+    def endpoint(self):
+        host, port = self.server.server_address
+        return f'http://{host}:{port}'
+
+    def respond(self, client_address, request):
+        method = request['method']
+        with self.lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+            self.connections.add(client_address)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if method == 'ecdsaSignMessageHash':
+                time.sleep(self.sign_delay)
+                result = {'status': 0, **SIGNATURE}
+            elif method == 'getPublicECDSAKey':
+                result = {'status': 0, 'publicKey': PUBLIC_KEY}
+            elif method == 'generateECDSAKey':
+                result = {'status': 0, 'keyName': KEY_NAME, 'publicKey': PUBLIC_KEY}
+            elif method == 'getServerStatus':
+                result = {'status': 0}
+            else:
+                return {'jsonrpc': '2.0', 'id': request['id'],
+                        'error': {'code': -32601, 'message': f'Unknown method {method}'}}
+            return {'jsonrpc': '2.0', 'id': request['id'], 'result': result}
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
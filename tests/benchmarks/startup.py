@@ -0,0 +1,208 @@
+""" Cold and warm start-up benchmarks for sk-val commands
+
+Usage:
+    python -m tests.benchmarks.startup [--binary PATH] [--abi PATH] [--update-baseline]
+    python -m tests.benchmarks.startup --modules-only
+
+Exits with code 1 if any measured number exceeds its baseline by more than the tolerance.
+Timings depend on the machine, so the committed baseline has only the imported modules
+count of source runs, which is checked in CI with --modules-only. The count depends on
+the interpreter too, so the comparison is skipped when the baseline was measured on
+another Python version.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+from tests.benchmarks.rpc_stub import RpcStub
+from tests.constants import DIST_DIR, EXEC_PLATFORM, PROJECT_DIR
+
+HERE = os.path.dirname(os.path.realpath(__file__))
+BASELINE_FILE = os.path.join(HERE, 'startup_baseline.json')
+# tests.utils.get_executable_path is not used here: it imports the whole CLI
+DEFAULT_BINARIES = {
+    'binary': os.path.join(DIST_DIR, f'sk-val-0.0.0-{EXEC_PLATFORM}'),
+    'onedir': os.path.join(DIST_DIR, f'sk-val-0.0.0-{EXEC_PLATFORM}-onedir', 'sk-val')
+}
+ZERO_ADDRESS = '0x' + '0' * 40
+
+DEFAULT_RUNS = 5
+DEFAULT_TOLERANCE = 0.25
+TOP_IMPORTS = 15
+
+# case name -> (sk-val arguments, whether the case talks to the RPC endpoint)
+CASES = {
+    'help': (['--help'], False),
+    'info': (['info'], False),
+    'validator-help': (['validator', '--help'], False),
+    'holder-help': (['holder', '--help'], False),
+    'sgx-help': (['sgx', '--help'], False),
+    'wallet-help': (['wallet', '--help'], False),
+    'srw-help': (['srw', '--help'], False),
+    'batch-help': (['batch', '--help'], False),
+    'tx-help': (['tx', '--help'], False),
+    'validator-ls': (['validator', 'ls'], True),
+    'validator-linked-addresses': (['validator', 'linked-addresses', ZERO_ADDRESS], True),
+    'holder-locked': (['holder', 'locked', ZERO_ADDRESS], True),
+}
+
+
+def source_command(args, python_opts=()):
+    return [sys.executable, *python_opts, os.path.join(PROJECT_DIR, 'cli', 'main.py'), *args]
+
+
+def binary_command(binary, args):
+    return [binary, *args]
+
+
+def prepare_home(home_dir, endpoint, abi_filepath=None):
+    config_dir = os.path.join(home_dir, '.skale-val-cli')
+    os.makedirs(config_dir, exist_ok=True)
+    with open(os.path.join(config_dir, 'config.json'), 'w') as f:
+        json.dump({'endpoint': endpoint, 'wallet': 'software'}, f)
+    if abi_filepath:
+        shutil.copy(abi_filepath, os.path.join(config_dir, 'abi.json'))
+
+
+def run_once(cmd, env):
+    start = time.perf_counter()
+    res = subprocess.run(cmd, env=env, cwd=PROJECT_DIR,
+                         stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    return time.perf_counter() - start, res
+
+
+def measure(cmd, env, runs):
+    """First run is cold (empty bytecode cache for source runs), the rest are warm"""
+    timings = []
+    with tempfile.TemporaryDirectory() as pycache_dir:
+        env = {**env, 'PYTHONPYCACHEPREFIX': pycache_dir}
+        for _ in range(runs + 1):
+            elapsed, res = run_once(cmd, env)
+            if res.returncode != 0:
+                raise RuntimeError(f'{" ".join(cmd)} failed: {res.stderr.decode()[-500:]}')
+            timings.append(elapsed)
+    return {'cold': round(timings[0], 4), 'warm': round(statistics.median(timings[1:]), 4)}
+
+
+def parse_importtime(output):
+    """-X importtime output -> (self time in ms per top-level package, imported modules count)"""
+    packages = defaultdict(float)
+    modules = 0
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        packages[name.strip().split('.')[0]] += int(self_us) / 1000
+        modules += 1
+    return dict(packages), modules
+
+
+def import_breakdown(args, env):
+    _, res = run_once(source_command(args, python_opts=['-X', 'importtime']), env)
+    return parse_importtime(res.stderr.decode())
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for target, cases in results.items():
+        for case, numbers in cases.items():
+            expected = baseline.get(target, {}).get(case, {})
+            for key, value in numbers.items():
+                if key in expected and value > expected[key] * (1 + tolerance):
+                    regressions.append(f'{target}/{case} {key}: {value} > {expected[key]}')
+    return regressions
+
+
+def python_version():
+    return f'{sys.version_info.major}.{sys.version_info.minor}'
+
+
+def print_breakdown(case, packages, modules):
+    print(f'\n{case}: {modules} modules imported, top packages by self import time:')
+    top = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:TOP_IMPORTS]
+    for package, ms in top:
+        print(f'  {package:<30} {ms:>9.1f} ms')
+
+
+def run_benchmarks(cases, binaries=None, abi_filepath=None, runs=DEFAULT_RUNS,
+                   modules_only=False):
+    """binaries maps result key (binary - one-file build, onedir - one-dir build) to path"""
+    binaries = {} if modules_only else binaries or {}
+    results = {'source': {}, **{target: {} for target in binaries}}
+    with RpcStub() as stub, tempfile.TemporaryDirectory() as home_dir:
+        prepare_home(home_dir, stub.endpoint, abi_filepath)
+        env = {**os.environ, 'HOME': home_dir, 'PYTHONPATH': PROJECT_DIR, 'DISABLE_SPIN': 'True'}
+        for case in cases:
+            args, needs_rpc = CASES[case]
+            if needs_rpc and not abi_filepath:
+                print(f'Skipping {case}: --abi is required for RPC cases')
+                continue
+            packages, modules = import_breakdown(args, env)
+            print_breakdown(case, packages, modules)
+            if modules_only:
+                results['source'][case] = {'modules': modules}
+                continue
+            results['source'][case] = {**measure(source_command(args), env, runs),
+                                       'modules': modules}
+            for target, binary in binaries.items():
+                results[target][case] = measure(binary_command(binary, args), env, runs)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='sk-val start-up benchmarks')
+    parser.add_argument('--binary', help='One-file binary built by scripts/build.sh')
+    parser.add_argument('--onedir-binary',
+                        help='Executable from the BUILD_MODE=onedir scripts/build.sh bundle')
+    parser.add_argument('--abi', help='SKALE Manager abi.json, enables the RPC cases')
+    parser.add_argument('--case', action='append', choices=sorted(CASES),
+                        help='Run only selected cases (can be repeated)')
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS)
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--modules-only', action='store_true',
+                        help='Only count modules imported by source runs, skip timings')
+    args = parser.parse_args()
+
+    binaries = {
+        target: path for target, path in DEFAULT_BINARIES.items() if os.path.isfile(path)
+    }
+    if args.binary:
+        binaries['binary'] = args.binary
+    if args.onedir_binary:
+        binaries['onedir'] = args.onedir_binary
+    results = run_benchmarks(args.case or list(CASES), binaries, args.abi, args.runs,
+                             args.modules_only)
+    print('\n' + json.dumps(results, indent=4))
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({'python': python_version(), **results}, f, indent=4, sort_keys=True)
+        print(f'Baseline saved to {args.baseline}')
+        return
+    if not os.path.isfile(args.baseline):
+        print(f'No baseline found at {args.baseline}, run with --update-baseline')
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get('python') != python_version():
+        print(f'Baseline was measured on Python {baseline.get("python")}, '
+              f'current is {python_version()}, skipping comparison')
+        return
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f'Regression: {regression}')
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,23 @@
+""" Tests for tests/benchmarks/startup.py module """
+
+from tests.benchmarks.startup import compare, parse_importtime
+
+IMPORTTIME_OUTPUT = '''import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      1500 |       1500 |     click.core
+import time:       500 |       2000 |   click
+import time:      3000 |       3000 | yaml
+'''
+
+
+def test_parse_importtime():
+    packages, modules = parse_importtime(IMPORTTIME_OUTPUT)
+    assert modules == 4
+    assert packages == {'_io': 0.12, 'click': 2.0, 'yaml': 3.0}
+
+
+def test_compare():
+    baseline = {'source': {'info': {'cold': 1.0, 'warm': 0.5, 'modules': 100}}}
+    results = {'source': {'info': {'cold': 1.1, 'warm': 0.7, 'modules': 100}},
+               'binary': {'info': {'cold': 9.0, 'warm': 9.0}}}
+    assert compare(results, baseline, tolerance=0.25) == ['source/info warm: 0.7 > 0.5']
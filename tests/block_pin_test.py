@@ -0,0 +1,28 @@
+""" Tests for utils/block_pin.py module """
+
+from utils.block_pin import make_block_pin_middleware
+
+TEST_TX = {'to': '0x0000000000000000000000000000000000000001', 'data': '0x'}
+
+
+def test_block_pin_middleware():
+    requests = []
+
+    def make_request(method, params):
+        requests.append((method, params))
+        return {'result': '0x0'}
+
+    middleware = make_block_pin_middleware(100)(make_request, None)
+    middleware('eth_call', [TEST_TX, 'latest'])
+    middleware('eth_call', [TEST_TX, '0x10'])
+    middleware('eth_getStorageAt', [TEST_TX['to'], '0x0', 'latest'])
+    middleware('eth_getTransactionCount', [TEST_TX['to'], 'latest'])
+    middleware('eth_blockNumber', [])
+
+    assert requests == [
+        ('eth_call', [TEST_TX, '0x64']),
+        ('eth_call', [TEST_TX, '0x10']),
+        ('eth_getStorageAt', [TEST_TX['to'], '0x0', '0x64']),
+        ('eth_getTransactionCount', [TEST_TX['to'], 'latest']),
+        ('eth_blockNumber', [])
+    ]
@@ -0,0 +1,66 @@
+""" Tests for cli/batch.py module """
+
+import json
+
+import pytest
+from skale.utils.contracts_provision.main import _skip_evm_time
+from skale.utils.contracts_provision import MONTH_IN_SECONDS
+
+from cli.batch import _run
+from tests.constants import (
+    D_DELEGATION_AMOUNT,
+    D_DELEGATION_PERIOD,
+    D_DELEGATION_INFO,
+    TEST_PK_FILE
+)
+from tests.utils import TEST_FEE_OPTIONS
+
+
+@pytest.mark.parametrize('fee_options', TEST_FEE_OPTIONS)
+def test_batch_run(runner, validator, skale, tmp_path, fee_options):
+    validator_id = validator
+    for _ in range(3):
+        skale.delegation_controller.delegate(
+            validator_id=validator_id,
+            amount=D_DELEGATION_AMOUNT,
+            delegation_period=D_DELEGATION_PERIOD,
+            info=D_DELEGATION_INFO,
+            wait_for=True
+        )
+    delegations = skale.delegation_controller.get_all_delegations_by_validator(
+        validator_id=validator_id
+    )
+    delegation_ids = [delegation['id'] for delegation in delegations[-3:]]
+    plan_filepath = tmp_path / 'plan.yaml'
+    plan_filepath.write_text('\n'.join([
+        'stages:',
+        '  - operations:',
+        *[
+            f'      - op: validator accept-delegation\n        delegation_id: {delegation_id}'
+            for delegation_id in delegation_ids[:2]
+        ],
+        '  - operations:',
+        f'      - op: holder cancel-delegation\n        delegation_id: {delegation_ids[2]}',
+    ]))
+    journal_filepath = tmp_path / 'journal.jsonl'
+
+    result = runner.invoke(
+        _run,
+        [
+            str(plan_filepath),
+            '--journal', str(journal_filepath),
+            '--pk-file', TEST_PK_FILE,
+            *fee_options,
+            '--yes'
+        ]
+    )
+
+    journal = [json.loads(line) for line in journal_filepath.read_text().splitlines()]
+    assert [entry['status'] for entry in journal] == ['success'] * 3
+    statuses = [
+        skale.delegation_controller.get_delegation_full(delegation_id)['status']
+        for delegation_id in delegation_ids
+    ]
+    assert statuses == ['ACCEPTED', 'ACCEPTED', 'CANCELED']
+    assert result.exit_code == 0
+    _skip_evm_time(skale.web3, MONTH_IN_SECONDS)
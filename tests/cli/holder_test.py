@@ -7,8 +7,8 @@ from skale.utils.contracts_provision.main import _skip_evm_time
 from skale.utils.contracts_provision import MONTH_IN_SECONDS
 
 from cli.holder import (
-    _delegate, _delegations, _cancel_delegation,
-    _undelegate, _locked, _withdraw_bounty, _earned_bounties
+    _delegate, _delegate_batch, _delegations, _cancel_delegation,
+    _undelegate, _locked, _withdraw_bounty, _earned_bounties, _sweep_bounties
 )
 from utils.helper import to_wei
 from tests.constants import (
@@ -62,6 +62,49 @@ def test_delegate(runner, skale, validator):
     assert result.exit_code == 0
 
 
+def test_delegate_batch(runner, skale, validator, tmp_path):
+    validator_id = validator
+    num_of_delegations_before = _get_number_of_delegations(skale, validator_id)
+    csv_filepath = tmp_path / 'delegations.csv'
+    csv_filepath.write_text(
+        'validator_id,amount,period,info\n'
+        f'{validator_id},{DELEGATION_AMOUNT_SKL},{D_DELEGATION_PERIOD},first\n'
+        f'{validator_id},{DELEGATION_AMOUNT_SKL},{D_DELEGATION_PERIOD},"second, batch"\n'
+    )
+    result = runner.invoke(
+        _delegate_batch,
+        ['--from-csv', str(csv_filepath), '--pk-file', TEST_PK_FILE, '--yes']
+    )
+    assert result.exit_code == 0
+    assert str_contains(result.output, [
+        '2 of 2 delegation requests sent', f'{2 * DELEGATION_AMOUNT_SKL} SKL'
+    ])
+    num_of_delegations_after = _get_number_of_delegations(skale, validator_id)
+    assert num_of_delegations_after == num_of_delegations_before + 2
+    delegations = skale.delegation_controller.get_all_delegations_by_validator(
+        validator_id=validator_id
+    )
+    assert [delegation['info'] for delegation in delegations[-2:]] == ['first', 'second, batch']
+
+
+def test_delegate_batch_wrong_validator(runner, skale, validator, tmp_path):
+    validator_id = validator
+    missing_validator_id = skale.validator_service.number_of_validators() + 1
+    num_of_delegations_before = _get_number_of_delegations(skale, validator_id)
+    csv_filepath = tmp_path / 'delegations.csv'
+    csv_filepath.write_text(
+        f'{validator_id},{DELEGATION_AMOUNT_SKL},{D_DELEGATION_PERIOD},\n'
+        f'{missing_validator_id},{DELEGATION_AMOUNT_SKL},{D_DELEGATION_PERIOD},\n'
+    )
+    result = runner.invoke(
+        _delegate_batch,
+        ['--from-csv', str(csv_filepath), '--pk-file', TEST_PK_FILE, '--yes']
+    )
+    assert result.exit_code == 1
+    assert f'Line 2: validator {missing_validator_id} does not exist' in result.output
+    assert _get_number_of_delegations(skale, validator_id) == num_of_delegations_before
+
+
 def test_delegations_skl(runner, skale):
     result = runner.invoke(
         _delegations,
@@ -207,6 +250,28 @@ def test_withdraw_bounty(runner, skale, validator, fee_options):
     assert result.exit_code == 0
 
 
+def test_sweep_bounties(runner, skale, validator):
+    validator_id = validator
+    _skip_evm_time(skale.web3, MONTH_IN_SECONDS * 3)
+    earned = skale.distributor.get_earned_bounty_amount(validator_id, skale.wallet.address)
+    result = runner.invoke(
+        _sweep_bounties,
+        ['--min-amount', '1000000000', '--pk-file', TEST_PK_FILE, '--yes']
+    )
+    assert result.exit_code == 0
+    assert str_contains(result.output, [
+        f'Earned bounties for {skale.wallet.address}', 'skip (below minimum)',
+        'No bounties above 1000000000.0 SKL to withdraw'
+    ])
+    result = runner.invoke(_sweep_bounties, ['--pk-file', TEST_PK_FILE, '--yes'])
+    assert result.exit_code == 0
+    if earned['earned']:
+        assert 'bounty withdrawals sent' in result.output
+        earned_after = skale.distributor.get_earned_bounty_amount(
+            validator_id, skale.wallet.address)
+        assert earned_after['earned'] == 0
+
+
 def test_earned_bounties(runner, skale, validator):
     validator_id = validator
     earned_bounties = skale.distributor.get_earned_bounty_amount(
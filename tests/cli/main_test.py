@@ -1,15 +1,44 @@
 """ Tests for cli/main.py module """
 
 import os
+import sys
 import json
+import time
 import shutil
+import subprocess
 from distutils.dir_util import copy_tree
 
 from click.testing import CliRunner
 from cli.main import init
 from utils.constants import SKALE_VAL_CONFIG_FOLDER, SKALE_VAL_CONFIG_FILE, SKALE_VAL_ABI_FILE
+from tests.constants import PROJECT_DIR
 
 TMP_CONFIG_FOLDER = '/tmp/.skale-val-config'
+HEAVY_MODULES = ('skale', 'web3', 'sgx', 'pandas', 'yaspin', 'terminaltables')
+STARTUP_TIME_LIMIT = 3
+
+
+def run_with_importtime(*args):
+    start = time.time()
+    res = subprocess.run(
+        [sys.executable, '-X', 'importtime', os.path.join('cli', 'main.py'), *args],
+        cwd=PROJECT_DIR, env={**os.environ, 'PYTHONPATH': PROJECT_DIR},
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True
+    )
+    elapsed = time.time() - start
+    imported = {
+        line.rsplit('|', 1)[-1].strip()
+        for line in res.stderr.splitlines() if line.startswith('import time:')
+    }
+    return res, imported, elapsed
+
+
+def test_startup_does_not_import_heavy_modules():
+    for args in (['info'], ['--help']):
+        res, imported, elapsed = run_with_importtime(*args)
+        assert res.returncode == 0
+        assert not [m for m in imported if m.split('.')[0] in HEAVY_MODULES]
+        assert elapsed < STARTUP_TIME_LIMIT
 
 
 def test_init_fail():
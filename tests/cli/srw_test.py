@@ -1,7 +1,9 @@
+import json
+
 import mock
 from web3 import Web3
 
-from cli.srw import _balance, _recharge, _withdraw
+from cli.srw import _balance, _keeper, _keeper_status, _recharge, _withdraw
 from utils.helper import to_wei
 from tests.constants import TEST_PK_FILE
 from tests.utils import create_new_validator_wallet_pk
@@ -102,3 +104,31 @@ def test_withdraw(runner, skale, validator):
     assert amount_after == amount_before - to_wei(TEST_RECHARGE_VALUE_ETH)
     assert '✔ ETH withdrawn' in result.output
     assert result.exit_code == 0
+
+
+def test_keeper(runner, skale, validator, tmp_path):
+    validator_id = validator
+    balance_before = skale.wallets.get_validator_balance(validator_id)
+    target = Web3.fromWei(balance_before + to_wei(TEST_RECHARGE_VALUE_ETH), 'ether')
+    state_filepath = tmp_path / 'srw_keeper.json'
+    result = runner.invoke(
+        _keeper,
+        [
+            '--validator-id', str(validator_id),
+            '--threshold', str(target),
+            '--target', str(target),
+            '--state-file', str(state_filepath),
+            '--once',
+            '--pk-file', TEST_PK_FILE
+        ]
+    )
+    assert result.exit_code == 0
+    assert '1 of 1 SRW wallets recharged with 0.1 ETH' in result.output
+    assert skale.wallets.get_validator_balance(validator_id) == to_wei(target)
+    state = json.loads(state_filepath.read_text())
+    recharge = state['validators'][str(validator_id)]['last_recharge']
+    assert (recharge['amount'], recharge['status']) == (to_wei(TEST_RECHARGE_VALUE_ETH), 'success')
+
+    result = runner.invoke(_keeper_status, ['--state-file', str(state_filepath)])
+    assert result.exit_code == 0
+    assert 'Rounds: 1, recharges: 1, errors: 0' in result.output
@@ -14,6 +14,7 @@ from skale.utils.contracts_provision.main import _skip_evm_time
 from skale.utils.contracts_provision import MONTH_IN_SECONDS
 from utils.helper import from_wei, permille_to_percent
 
+from cli.tx import _broadcast
 from cli.validator import (_bond_amount, _register, _ls, _delegations, _accept_delegation,
                            _link_address, _unlink_address, _linked_addresses,
                            _info, _withdraw_fee, _set_mda, _change_address, _confirm_address,
@@ -254,6 +255,74 @@ def test_accept_all_delegations(runner, validator, skale, fee_options):
     _skip_evm_time(skale.web3, MONTH_IN_SECONDS)
 
 
+@pytest.mark.parametrize('fee_options', TEST_FEE_OPTIONS)
+def test_accept_all_delegations_pipelined(runner, validator, skale, fee_options):
+    n_of_delegations = 3
+    validator_id = validator
+    for _ in range(n_of_delegations):
+        skale.delegation_controller.delegate(
+            validator_id=validator_id,
+            amount=D_DELEGATION_AMOUNT,
+            delegation_period=D_DELEGATION_PERIOD,
+            info=D_DELEGATION_INFO,
+            wait_for=True
+        )
+    delegations = skale.delegation_controller.get_all_delegations_by_validator(
+        validator_id=validator_id
+    )
+    delegation_ids = [delegation['id'] for delegation in delegations[-n_of_delegations:]]
+
+    with mock.patch('click.confirm', return_value=True):
+        result = runner.invoke(
+            _accept_all_delegations,
+            [
+                '--pk-file', TEST_PK_FILE,
+                '--pipelined',
+                *fee_options,
+            ]
+        )
+
+    delegations = skale.delegation_controller.get_all_delegations_by_validator(
+        validator_id=validator_id
+    )
+    for delegation in delegations[-n_of_delegations:]:
+        assert delegation['id'] in delegation_ids
+        assert delegation['status'] == 'ACCEPTED'
+    assert str_contains(result.output, ['success'])
+    assert result.exit_code == 0
+    _skip_evm_time(skale.web3, MONTH_IN_SECONDS)
+
+
+def test_accept_all_delegations_presign(runner, validator, skale, tmp_path):
+    validator_id = validator
+    skale.delegation_controller.delegate(
+        validator_id=validator_id,
+        amount=D_DELEGATION_AMOUNT,
+        delegation_period=D_DELEGATION_PERIOD,
+        info=D_DELEGATION_INFO,
+        wait_for=True
+    )
+    delegation_id = skale.delegation_controller.get_all_delegations_by_validator(
+        validator_id=validator_id
+    )[-1]['id']
+    signed_filepath = str(tmp_path / 'signed.json')
+
+    with mock.patch('click.confirm', return_value=True):
+        result = runner.invoke(
+            _accept_all_delegations,
+            ['--pk-file', TEST_PK_FILE, '--presign', signed_filepath]
+        )
+    assert result.exit_code == 0
+    assert str_contains(result.output, ['signed', signed_filepath])
+    assert skale.delegation_controller.get_delegation(delegation_id)['status'] == 'PROPOSED'
+
+    result = runner.invoke(_broadcast, [signed_filepath])
+    assert result.exit_code == 0
+    assert str_contains(result.output, ['success'])
+    assert skale.delegation_controller.get_delegation(delegation_id)['status'] == 'ACCEPTED'
+    _skip_evm_time(skale.web3, MONTH_IN_SECONDS)
+
+
 @pytest.mark.parametrize('fee_options', TEST_FEE_OPTIONS)
 def test_link_address(runner, validator, skale, new_wallet_pk, fee_options):
     node_wallet, _ = new_wallet_pk
@@ -1,9 +1,9 @@
 import pytest
 from skale.utils.web3_utils import to_checksum_address
 
-from cli.wallet import _send_eth, _send_skl
+from cli.wallet import _send_batch, _send_eth, _send_skl
 from tests.constants import TEST_PK_FILE
-from tests.utils import TEST_FEE_OPTIONS
+from tests.utils import TEST_FEE_OPTIONS, str_contains
 
 
 @pytest.mark.parametrize('fee_options', TEST_FEE_OPTIONS)
@@ -50,3 +50,48 @@ def test_send_skl(runner, fee_options):
     output_list = result.output.splitlines()
     assert result.exit_code == 0
     assert '✔ Funds were successfully transferred' in str(output_list)
+
+
+def test_send_batch(runner, skale, tmp_path):
+    receivers = [
+        to_checksum_address('0xf38b5dddd74b8901c9b5fb3ebd60bf5e7c1e9763'),
+        '0x01C19c5d3Ad1C3014145fC82263Fbae09e23924A'
+    ]
+    eth_balances_0 = [skale.web3.eth.get_balance(receiver) for receiver in receivers]
+    skl_balance_0 = skale.token.get_balance(receivers[1])
+    csv_filepath = tmp_path / 'payouts.csv'
+    csv_filepath.write_text(
+        'address,amount,token\n'
+        f'{receivers[0].lower()},0.01,eth\n'
+        f'{receivers[1]},0.02,ETH\n'
+        f'{receivers[1]},0.5,skl\n'
+    )
+    status_filepath = tmp_path / 'statuses.csv'
+    result = runner.invoke(
+        _send_batch,
+        [
+            '--from-csv', str(csv_filepath),
+            '--status-file', str(status_filepath),
+            '--pk-file', TEST_PK_FILE,
+            '--yes'
+        ]
+    )
+    assert result.exit_code == 0
+    assert str_contains(result.output, ['3 of 3 transfers sent', '0.03 ETH, 0.5 SKL'])
+    assert [
+        skale.web3.eth.get_balance(receiver) - balance_0
+        for receiver, balance_0 in zip(receivers, eth_balances_0)
+    ] == [skale.web3.toWei('0.01', 'ether'), skale.web3.toWei('0.02', 'ether')]
+    assert skale.token.get_balance(receivers[1]) - skl_balance_0 == skale.web3.toWei('0.5', 'ether')
+    assert status_filepath.read_text().count('success') == 3
+
+
+def test_send_batch_insufficient_balance(runner, skale, tmp_path):
+    csv_filepath = tmp_path / 'payouts.csv'
+    csv_filepath.write_text(f'0x01C19c5d3Ad1C3014145fC82263Fbae09e23924A,{10 ** 12},eth\n')
+    result = runner.invoke(
+        _send_batch,
+        ['--from-csv', str(csv_filepath), '--pk-file', TEST_PK_FILE, '--yes']
+    )
+    assert result.exit_code == 1
+    assert 'ETH exceeds the balance' in result.output
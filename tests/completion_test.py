@@ -0,0 +1,105 @@
+""" Tests for utils/completion.py module """
+
+import os
+import shutil
+import subprocess
+
+import click
+import pytest
+
+from utils.completion import collect_specs, render_fish, render_zsh, write_completion_scripts
+
+
+@click.group()
+@click.option('--block', help='Block number')
+def fake_cli(block):
+    pass
+
+
+@fake_cli.command('init', help='Init CLI')
+@click.option('--wallet', '-w', type=click.Choice(['software', 'ledger', 'sgx']))
+def fake_init(wallet):
+    pass
+
+
+@fake_cli.group('holder', help='Holder commands')
+def fake_holder():
+    pass
+
+
+@fake_holder.command('delegate', help="Delegate tokens")
+@click.option('--delegation-period', type=click.Choice(['2']))
+@click.option('--pk-file', help='Path to file with private key')
+@click.option('--yes', is_flag=True)
+def fake_delegate(delegation_period, pk_file, yes):
+    pass
+
+
+def bash_complete(script, words):
+    cmd = f'''
+        source {script}
+        COMP_WORDS=({" ".join(words)}); COMP_CWORD={len(words) - 1}
+        _sk_val
+        echo "${{COMPREPLY[@]}}"
+    '''
+    return subprocess.run(['bash', '-c', cmd], stdout=subprocess.PIPE,
+                          universal_newlines=True).stdout.split()
+
+
+def zsh_complete(completion_dir, words):
+    """Runs the autoloaded function with completion builtins replaced by printing ones"""
+    cmd = f'''
+        compadd() {{ shift ${{@[(i)--]}}; local -a c; c=("$@"); print -l -- ${{(M)c:#$PREFIX*}} }}
+        _describe() {{ local -a c; c=("${{(@P)4}}"); c=("${{(@)c%%:*}}"); compadd -- $c }}
+        _files() {{ print -- FILES }}
+        fpath=({completion_dir} $fpath)
+        autoload -U _sk-val
+        words=({" ".join(words)}); CURRENT={len(words)}; PREFIX="${{words[CURRENT]}}"
+        _sk-val
+    '''
+    return subprocess.run(['zsh', '-f', '-c', cmd], stdout=subprocess.PIPE,
+                          universal_newlines=True).stdout.split()
+
+
+def test_collect_specs():
+    specs = collect_specs(fake_cli)
+    assert specs[''].commands == ['holder', 'init']
+    assert specs['holder'].commands == ['delegate']
+    assert [o.name for o in specs['holder delegate'].options] == \
+        ['delegation_period', 'pk_file', 'yes']
+
+
+def test_bash_completion(tmp_path):
+    write_completion_scripts(fake_cli, str(tmp_path))
+    script = os.path.join(tmp_path, 'sk-val.bash')
+    assert bash_complete(script, ['sk-val', '']) == ['holder', 'init']
+    assert bash_complete(script, ['sk-val', '--block', '1', 'h']) == ['holder']
+    assert bash_complete(script, ['sk-val', 'init', '--wallet', 's']) == ['software', 'sgx']
+    assert bash_complete(script, ['sk-val', 'holder', 'delegate', '--delegation-period', '']) \
+        == ['2']
+    assert bash_complete(script, ['sk-val', 'holder', 'delegate', '--p']) == ['--pk-file']
+
+
+def test_zsh_script():
+    script = render_zsh(collect_specs(fake_cli))
+    assert script.startswith('#compdef sk-val\n')
+    assert 'bashcompinit' not in script
+    assert """"") reply=('holder:Holder commands' 'init:Init CLI') ;;""" in script
+
+
+@pytest.mark.skipif(shutil.which('zsh') is None, reason='zsh is not installed')
+def test_zsh_completion(tmp_path):
+    write_completion_scripts(fake_cli, str(tmp_path))
+    assert zsh_complete(tmp_path, ['sk-val', '']) == ['holder', 'init']
+    assert zsh_complete(tmp_path, ['sk-val', '--block', '1', 'h']) == ['holder']
+    assert zsh_complete(tmp_path, ['sk-val', 'init', '--wallet', 's']) == ['software', 'sgx']
+    assert zsh_complete(tmp_path, ['sk-val', 'holder', 'delegate', '--p']) == ['--pk-file']
+    assert zsh_complete(tmp_path, ['sk-val', 'holder', 'delegate', '--pk-file', '']) == ['FILES']
+
+
+def test_fish_completion():
+    script = render_fish(collect_specs(fake_cli))
+    assert "-n '__sk_val_path_is' -a holder -d 'Holder commands'" in script
+    assert "-n '__sk_val_path_is holder' -a delegate" in script
+    assert "-l wallet -s w -x -a 'software ledger sgx'" in script
+    assert "-l pk-file -r -F -d 'Path to file with private key'" in script
@@ -0,0 +1,37 @@
+""" Tests for utils/constants.py module """
+
+import importlib
+import os
+import sys
+
+import utils.constants
+
+
+def reload_constants(monkeypatch, frozen, meipass=None):
+    if frozen:
+        monkeypatch.setattr(sys, 'frozen', True, raising=False)
+    else:
+        monkeypatch.delattr(sys, 'frozen', raising=False)
+    if meipass:
+        monkeypatch.setattr(sys, '_MEIPASS', meipass, raising=False)
+    else:
+        monkeypatch.delattr(sys, '_MEIPASS', raising=False)
+    return importlib.reload(utils.constants)
+
+
+def test_root_dir(monkeypatch):
+    try:
+        constants = reload_constants(monkeypatch, frozen=False)
+        assert constants.ENV == 'dev'
+        assert os.path.isfile(constants.TEXT_FILE)
+
+        constants = reload_constants(monkeypatch, frozen=True, meipass='/tmp/_MEI123')
+        assert constants.ENV == 'prod'
+        assert constants.TEXT_FILE == '/tmp/_MEI123/data/text.yml'
+
+        monkeypatch.setattr(sys, 'executable', '/opt/sk-val/sk-val')
+        constants = reload_constants(monkeypatch, frozen=True)
+        assert constants.ROOT_DIR == '/opt/sk-val/data'
+    finally:
+        monkeypatch.undo()
+        importlib.reload(utils.constants)
@@ -0,0 +1,174 @@
+""" Tests for core/daemon.py module """
+
+import io
+import sys
+import threading
+import time
+
+import click
+import mock
+import pytest
+
+from core.daemon import (Daemon, find_command, forward_to_daemon, is_daemon_running,
+                         is_local_command, matches_command, stop_daemon)
+from utils.web3_utils import init_skale_w_wallet_from_config, reuse_skale_instances
+
+
+@click.group()
+def fake_cli():
+    pass
+
+
+@fake_cli.command('echo')
+@click.argument('words', nargs=-1)
+def fake_echo(words):
+    print(' '.join(words))
+
+
+@fake_cli.command('fail')
+def fake_fail():
+    sys.exit(3)
+
+
+@fake_cli.command('confirm')
+@click.option('--yes', is_flag=True, prompt='Are you sure?')
+def fake_confirm(yes):
+    print('confirmed')
+
+
+STREAMED = threading.Event()
+
+
+@fake_cli.command('stream')
+def fake_stream():
+    print('started')
+    # Finishes only when the client has received the first line
+    print('streamed' if STREAMED.wait(5) else 'buffered')
+
+
+SGX_INFO = {'key': 'NEK:1', 'server_url': 'https://1.1.1.1:1026'}
+
+
+@fake_cli.group('sgx')
+def fake_sgx():
+    pass
+
+
+@fake_sgx.command('init')
+@click.argument('key')
+def fake_sgx_init(key):
+    SGX_INFO['key'] = key
+
+
+@fake_cli.command('address')
+def fake_address():
+    print(init_skale_w_wallet_from_config().wallet.address)
+
+
+def run_fake_cli(args):
+    fake_cli(args)
+
+
+@pytest.fixture
+def daemon_socket(tmp_path):
+    socket_path = str(tmp_path / 'daemon.sock')
+    daemon = Daemon(run_fake_cli, socket_path)
+    sock = daemon.bind()
+    thread = threading.Thread(target=daemon.serve_forever, args=(sock,), daemon=True)
+    thread.start()
+    yield socket_path
+    if is_daemon_running(socket_path):
+        stop_daemon(socket_path)
+    thread.join(timeout=5)
+
+
+def test_find_command():
+    assert find_command(['validator', 'ls']) == 'validator'
+    assert find_command(['--block', '100', '--profile-rpc', 'holder', 'locked']) == 'holder'
+    assert find_command(['--help']) is None
+
+
+def test_is_local_command():
+    assert is_local_command(['--help'])
+    assert is_local_command(['shell'])
+    assert is_local_command(['srw', 'keeper', '--validator-id', '1'])
+    assert not is_local_command(['srw', 'balance', '1'])
+    assert not is_local_command(['--block', '100', 'validator', 'ls'])
+
+
+def test_matches_command():
+    assert matches_command(['sgx', 'init', '--force'], ['init', 'sgx init'])
+    assert matches_command(['--block', '1', 'init'], ['init', 'sgx init'])
+    assert not matches_command(['sgx', 'info'], ['init', 'sgx init'])
+    assert not matches_command(['--help'], ['init'])
+
+
+def test_forward_to_daemon(daemon_socket, capsys):
+    assert forward_to_daemon(['echo', 'hello', 'daemon'], daemon_socket) == 0
+    assert capsys.readouterr().out == 'hello daemon\n'
+    assert forward_to_daemon(['fail'], daemon_socket) == 3
+
+
+def test_forward_falls_back_on_prompt(daemon_socket, capsys):
+    assert forward_to_daemon(['confirm'], daemon_socket) is None
+    assert forward_to_daemon(['confirm', '--yes'], daemon_socket) == 0
+    assert capsys.readouterr().out == 'confirmed\n'
+
+
+def test_local_commands_and_stopped_daemon(daemon_socket, capsys):
+    assert forward_to_daemon(['init'], daemon_socket) is None
+    assert forward_to_daemon(['--help'], daemon_socket) is None
+    stop_daemon(daemon_socket)
+    time.sleep(0.1)
+    assert not is_daemon_running(daemon_socket)
+    assert forward_to_daemon(['echo', 'x'], daemon_socket) is None
+
+
+class ClientStdout(io.StringIO):
+    def write(self, text):
+        if 'started' in text:
+            STREAMED.set()
+        return super().write(text)
+
+
+def test_forward_streams_output(daemon_socket):
+    stdout = ClientStdout()
+    with mock.patch('sys.stdout', stdout):
+        assert forward_to_daemon(['stream'], daemon_socket) == 0
+    assert stdout.getvalue() == 'started\nstreamed\n'
+
+
+def fake_skale_w_wallet(*args, **kwargs):
+    skale = mock.Mock()
+    skale.wallet.address = SGX_INFO['key']
+    return skale
+
+
+def test_daemon_drops_wallets_on_sgx_init(daemon_socket, capsys):
+    reuse_skale_instances()
+    try:
+        with mock.patch('utils.web3_utils.get_config',
+                        return_value={'endpoint': 'http://localhost', 'wallet': 'sgx'}), \
+                mock.patch('utils.web3_utils.get_ledger_wallet_info', return_value={}), \
+                mock.patch('utils.web3_utils.sgx_inited', return_value=True), \
+                mock.patch('utils.web3_utils.print_wallet_info'), \
+                mock.patch('utils.web3_utils.get_sgx_info', side_effect=lambda: dict(SGX_INFO)), \
+                mock.patch('utils.web3_utils.init_skale_w_wallet',
+                           side_effect=fake_skale_w_wallet) as init_mock:
+            assert forward_to_daemon(['address'], daemon_socket) == 0
+            assert forward_to_daemon(['address'], daemon_socket) == 0
+            assert init_mock.call_count == 1
+            # Key is re-generated by the daemon
+            assert forward_to_daemon(['sgx', 'init', 'NEK:2'], daemon_socket) == 0
+            assert forward_to_daemon(['address'], daemon_socket) == 0
+            # Same key, but the wallet is initialized again after `sgx init`
+            assert forward_to_daemon(['sgx', 'init', 'NEK:2'], daemon_socket) == 0
+            assert forward_to_daemon(['address'], daemon_socket) == 0
+            # Key is re-generated out of the daemon
+            SGX_INFO['key'] = 'NEK:3'
+            assert forward_to_daemon(['address'], daemon_socket) == 0
+            assert init_mock.call_count == 4
+    finally:
+        reuse_skale_instances(False)
+        SGX_INFO['key'] = 'NEK:1'
+    assert capsys.readouterr().out.split() == ['NEK:1', 'NEK:1', 'NEK:2', 'NEK:2', 'NEK:3']
@@ -0,0 +1,91 @@
+""" Tests for core/fee_oracle.py module """
+
+from unittest import mock
+
+import pytest
+
+from core.fee_oracle import fee_from_history, is_fee_set, resolve_fee, suggest_fee
+from core.transaction import TxFee
+
+GWEI = 10 ** 9
+
+FEE_HISTORY = {
+    'oldestBlock': 100,
+    'baseFeePerGas': [10 * GWEI, 11 * GWEI, 12 * GWEI, 20 * GWEI],
+    'gasUsedRatio': [0.5, 0, 0.9],
+    'reward': [[2 * GWEI], [0], [3 * GWEI]]
+}
+
+
+def fake_web3(history=FEE_HISTORY, gas_price=7 * GWEI):
+    web3 = mock.Mock()
+    web3.provider.endpoint_uri = f'http://localhost:{id(web3)}'
+    web3.eth.gas_price = gas_price
+    if isinstance(history, Exception):
+        web3.eth.fee_history.side_effect = history
+    else:
+        web3.eth.fee_history.return_value = history
+    return web3
+
+
+def test_fee_from_history():
+    fee = fee_from_history(FEE_HISTORY, base_fee_multiplier=1.5, min_priority_fee=1)
+    # Empty block reward is skipped: median of 2 and 3 gwei
+    assert fee.max_priority_fee_per_gas == int(2.5 * GWEI)
+    assert fee.max_fee_per_gas == 30 * GWEI + int(2.5 * GWEI)
+    assert fee.gas_price is None
+
+
+def test_fee_from_history_min_priority_fee():
+    history = {**FEE_HISTORY, 'gasUsedRatio': [0, 0, 0]}
+    fee = fee_from_history(history, base_fee_multiplier=1, min_priority_fee=GWEI)
+    assert fee.max_priority_fee_per_gas == GWEI
+    assert fee.max_fee_per_gas == 21 * GWEI
+
+
+def test_fee_from_history_without_base_fee():
+    assert fee_from_history({**FEE_HISTORY, 'baseFeePerGas': [0, 0, 0, 0]}) is None
+    assert fee_from_history({}) is None
+
+
+def test_suggest_fee_cached():
+    web3 = fake_web3()
+    fee = suggest_fee(web3, ttl=60)
+    assert fee.max_fee_per_gas
+    assert suggest_fee(web3, ttl=60) is fee
+    assert web3.eth.fee_history.call_count == 1
+    suggest_fee(web3, ttl=0)
+    assert web3.eth.fee_history.call_count == 2
+
+
+@mock.patch('core.fee_oracle.default_gas_price', lambda web3: web3.eth.gas_price * 2)
+def test_suggest_fee_legacy_fallback():
+    fee = suggest_fee(fake_web3(history=ValueError('the method eth_feeHistory does not exist')))
+    assert fee == TxFee(gas_price=14 * GWEI)
+
+
+@pytest.mark.parametrize('fee,expected', [
+    (None, False),
+    (TxFee(), False),
+    (TxFee(gas_price=1), True),
+    (TxFee(max_priority_fee_per_gas=1, max_fee_per_gas=2), True),
+])
+def test_is_fee_set(fee, expected):
+    assert is_fee_set(fee) == expected
+
+
+def test_resolve_fee():
+    skale = mock.Mock(web3=fake_web3())
+    user_fee = TxFee(gas_price=GWEI)
+    assert resolve_fee(skale, user_fee) is user_fee
+    assert resolve_fee(skale, TxFee()).max_priority_fee_per_gas
+
+
+def test_tx_kwargs():
+    assert TxFee(gas_price=GWEI).tx_kwargs() == {
+        'gas_price': GWEI, 'max_priority_fee_per_gas': None, 'max_fee_per_gas': None
+    }
+    # Gas price is ignored when EIP-1559 fields are set, but skips the eth_gasPrice request
+    assert TxFee(max_priority_fee_per_gas=1, max_fee_per_gas=2).tx_kwargs() == {
+        'gas_price': 2, 'max_priority_fee_per_gas': 1, 'max_fee_per_gas': 2
+    }
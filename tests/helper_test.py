@@ -0,0 +1,57 @@
+""" Tests for utils/helper.py module """
+
+import json
+import os
+
+import mock
+import pytest
+
+from utils.helper import (Config, CsvFileError, NoSpinner, read_csv_rows, read_json_cached,
+                          spinner)
+
+
+def test_read_json_cached(tmp_path):
+    path = os.path.join(tmp_path, 'config.json')
+    with open(path, 'w') as f:
+        json.dump({'endpoint': 'http://a'}, f)
+    assert read_json_cached(path) == {'endpoint': 'http://a'}
+    with mock.patch('utils.helper.read_json') as read_json_mock:
+        config = read_json_cached(path)
+        config['endpoint'] = 'changed'
+        assert read_json_cached(path) == {'endpoint': 'http://a'}
+        read_json_mock.assert_not_called()
+    with open(path, 'w') as f:
+        json.dump({'endpoint': 'http://bb'}, f)
+    assert read_json_cached(path) == {'endpoint': 'http://bb'}
+
+
+def test_config_loads_abi_lazily():
+    with mock.patch('utils.helper.load_abi', return_value={'a_abi': []}) as load_abi_mock:
+        config = Config({'endpoint': 'http://a', 'wallet': 'software'})
+        assert config['wallet'] == 'software'
+        assert config.get('hedge_endpoint') is None
+        load_abi_mock.assert_not_called()
+        assert config['abi'] == {'a_abi': []}
+        assert config.get('abi') == {'a_abi': []}
+        load_abi_mock.assert_called_once()
+
+
+def test_read_csv_rows(tmp_path):
+    path = os.path.join(tmp_path, 'rows.csv')
+    with open(path, 'w') as f:
+        f.write('address,amount\n# comment\n\n0x1, 10\n"0x2",5,\n')
+    assert read_csv_rows(path, ('address', 'amount', 'info')) == [
+        (4, {'address': '0x1', 'amount': '10', 'info': ''}),
+        (5, {'address': '0x2', 'amount': '5', 'info': ''})
+    ]
+    with pytest.raises(CsvFileError, match='Line 4: expected at most 1 columns'):
+        read_csv_rows(path, ('address',))
+
+
+def test_disabled_spinner(capsys):
+    with mock.patch('utils.helper._spinners_disabled', True):
+        with spinner('Sending') as sp:
+            assert isinstance(sp, NoSpinner)
+            sp.text = 'Still sending'
+            sp.write('✔ Sent')
+    assert capsys.readouterr().out == '✔ Sent\n'
@@ -0,0 +1,169 @@
+""" Tests for core/holder.py module """
+
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+
+from core.holder import (DelegationRow, check_delegations, delegate, delegated_validator_ids,
+                         earned_bounties_by_validator, read_delegations_csv, sweep_bounties)
+from core.pipeline import TxStatus
+from tests.utils import fake_from_wei, fake_to_wei, write_csv
+from utils.helper import CsvFileError
+
+ADDRESS = '0x' + '11' * 20
+ZERO = '0x' + '00' * 20
+SKL = 10 ** 18
+
+
+def test_read_delegations_csv(tmp_path):
+    csv_filepath = write_csv(tmp_path, '\n'.join([
+        'validator_id,amount,period,info',
+        '# treasury spread',
+        '1,1000,2,"main, first"',
+        '',
+        '2, 2500.5 ,2',
+    ]))
+    assert read_delegations_csv(csv_filepath) == [
+        DelegationRow(3, 1, Decimal(1000), 2, 'main, first'),
+        DelegationRow(5, 2, Decimal('2500.5'), 2, '')
+    ]
+
+
+@pytest.mark.parametrize('content,message', [
+    ('', 'File has no rows'),
+    ('x,1000,2,info', 'Line 1: validator_id should be an integer'),
+    ('1,a lot,2,info', 'amount should be a number'),
+    ('1,-5,2,info', 'amount should be positive'),
+    ('1,1000,7,info', 'period should be one of'),
+    ('1,1000,2,info,extra', 'expected at most 4 columns'),
+])
+def test_read_delegations_csv_errors(tmp_path, content, message):
+    with pytest.raises(CsvFileError, match=message):
+        read_delegations_csv(write_csv(tmp_path, content))
+
+
+def validator(address=ADDRESS, minimum=100 * SKL, accept=True):
+    return ['name', address, ZERO, 'description', 10, 0, minimum, accept]
+
+
+@mock.patch('core.holder.to_wei', fake_to_wei)
+@mock.patch('core.holder.from_wei', fake_from_wei)
+def test_check_delegations():
+    skale = mock.Mock()
+    rows = [
+        DelegationRow(1, 1, Decimal(1000), 2, ''),
+        DelegationRow(2, 1, Decimal(50), 2, ''),
+        DelegationRow(3, 2, Decimal(1000), 2, ''),
+        DelegationRow(4, 3, Decimal(1000), 2, ''),
+        DelegationRow(5, 1, Decimal(1000), 2, ''),
+    ]
+    results = [validator(), validator(accept=False), validator(address=ZERO), 5000 * SKL,
+               3000 * SKL]
+    with mock.patch('core.holder.batch_call', return_value=results) as batch_call_mock:
+        errors = check_delegations(skale, rows)
+    # One batch: 3 unique validators, the balance and the forbidden for delegation amount
+    assert batch_call_mock.call_count == 1
+    assert len(batch_call_mock.call_args[0][1]) == 5
+    assert batch_call_mock.call_args[1] == {'from_address': skale.wallet.address}
+    skale.token_state.contract.functions.getAndUpdateForbiddenForDelegationAmount \
+        .assert_called_once_with(skale.wallet.address)
+    assert errors == [
+        'Line 2: 50 SKL is less than minimum delegation amount of validator 1 (100 SKL)',
+        'Line 3: validator 2 doesn\'t accept new delegation requests',
+        'Line 4: validator 3 does not exist',
+        f'Total amount 4050 SKL exceeds the amount available for delegation of '
+        f'{skale.wallet.address} (2000 SKL, 5000 SKL balance, '
+        '3000 SKL already delegated or locked)'
+    ]
+
+
+@mock.patch('core.holder.to_wei', fake_to_wei)
+@mock.patch('core.holder.from_wei', fake_from_wei)
+def test_check_delegations_already_delegated():
+    skale = mock.Mock()
+    rows = [DelegationRow(1, 1, Decimal(1000), 2, '')]
+    # Balance covers the row, but most of it is already delegated
+    with mock.patch('core.holder.batch_call', return_value=[validator(), 1500 * SKL, 1000 * SKL]):
+        assert len(check_delegations(skale, rows)) == 1
+    with mock.patch('core.holder.batch_call', return_value=[validator(), 2000 * SKL, 1000 * SKL]):
+        assert check_delegations(skale, rows) == []
+
+
+def test_delegated_validator_ids():
+    skale = mock.Mock()
+    functions = skale.delegation_controller.contract.functions
+    functions.getDelegationsByHolderLength.return_value.call.return_value = 3
+    delegations = [
+        [ADDRESS, validator_id, 100 * SKL, 2, 0, 0, 0, ''] for validator_id in (4, 1, 4)
+    ]
+    with mock.patch('core.holder.batch_call', side_effect=[[7, 8, 9], delegations]) as batch:
+        assert delegated_validator_ids(skale, ADDRESS, 100) == [1, 4]
+    functions.delegationsByHolder.assert_has_calls([
+        mock.call(ADDRESS, 0), mock.call(ADDRESS, 1), mock.call(ADDRESS, 2)
+    ])
+    functions.getDelegation.assert_has_calls([mock.call(7), mock.call(8), mock.call(9)])
+    assert [call[0][2] for call in batch.call_args_list] == [100, 100]
+
+
+def test_earned_bounties_by_validator():
+    skale = mock.Mock()
+    with mock.patch('core.holder.batch_call', return_value=[[5, 10], [0, 10]]) as batch:
+        assert earned_bounties_by_validator(skale, ADDRESS, [1, 4], 100) == {1: 5, 4: 0}
+    assert batch.call_args[1] == {'from_address': ADDRESS}
+
+
+@mock.patch('core.holder.to_wei', fake_to_wei)
+@mock.patch('core.holder.from_wei', fake_from_wei)
+@mock.patch('utils.print_formatters.from_wei', fake_from_wei)
+def test_sweep_bounties(capsys):
+    skale = mock.Mock()
+    skale.wallet.address = ADDRESS
+    earned = {1: 5 * SKL, 2: SKL // 10, 3: 0, 4: 2 * SKL}
+
+    def run(txs):
+        for tx in txs:
+            tx.status, tx.tx_hash = TxStatus.SUCCESS, f'0x{tx.label}'
+
+    with mock.patch('core.holder.init_skale_w_wallet_from_config', return_value=skale), \
+            mock.patch('core.holder.delegated_validator_ids', return_value=list(earned)), \
+            mock.patch('core.holder.earned_bounties_by_validator', return_value=earned), \
+            mock.patch('core.holder.Pipeline') as pipeline:
+        pipeline.return_value.run.side_effect = run
+        sweep_bounties(None, 0.5, True, None, None)
+    skale.distributor.contract.functions.withdrawBounty.assert_has_calls([
+        mock.call(1, ADDRESS), mock.call(4, ADDRESS)
+    ])
+    txs = pipeline.return_value.run.call_args[0][0]
+    assert [tx.label for tx in txs] == ['1', '4']
+    assert '2 of 2 bounty withdrawals sent, total amount: 7 SKL' in capsys.readouterr().out
+
+
+@mock.patch('core.holder.to_wei', fake_to_wei)
+def test_delegate_rpc_requests():
+    requests = []
+    skale = mock.Mock()
+    skale.web3.provider.endpoint_uri = 'http://localhost:1'
+
+    def fee_history(*args):
+        requests.append('eth_feeHistory')
+        return {'baseFeePerGas': [10, 10], 'gasUsedRatio': [0.5], 'reward': [[2]]}
+
+    def gas_price():
+        requests.append('eth_gasPrice')
+        return 10
+
+    def transaction_method(*args, gas_price=None, **kwargs):
+        # skale.py requests the gas price unless it's given
+        gas_price = gas_price or skale.gas_price
+        requests.append('eth_sendRawTransaction')
+        return mock.Mock(tx_hash='0x1')
+
+    skale.web3.eth.fee_history.side_effect = fee_history
+    type(skale).gas_price = mock.PropertyMock(side_effect=gas_price)
+    skale.delegation_controller.delegate.side_effect = transaction_method
+    with mock.patch('core.holder.init_skale_w_wallet_from_config', return_value=skale):
+        delegate(1, 100, 2, '', None, None)
+    assert requests == ['eth_feeHistory', 'eth_sendRawTransaction']
+    kwargs = skale.delegation_controller.delegate.call_args[1]
+    assert kwargs['gas_price'] == kwargs['max_fee_per_gas']
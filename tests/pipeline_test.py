@@ -0,0 +1,255 @@
+""" Tests for core/pipeline.py module """
+
+import threading
+from unittest import mock
+
+import pytest
+from skale.transactions.exceptions import TransactionNotMinedError
+from web3.exceptions import TransactionNotFound
+
+from core.pipeline import EthTransfer, Pipeline, PipelineTx, TxStatus, is_execution_error
+from core.transaction import TxFee
+from tests.utils import fake_call_at_block, fake_estimate_gas, fake_transaction_from_method
+
+TEST_GAS_PRICE = 10 ** 9
+
+
+class FakeChain:
+    """Mines pooled transactions in nonce order, so a dropped one blocks the rest"""
+
+    block_number = 100
+
+    def __init__(self, nonce=5, reverted=(), taken=(), dropped=(), retried=()):
+        self.pending = self.mined = nonce
+        # Sent, but the client gets `already known` from the retried request
+        self.retried = set(retried)
+        self.reverted = set(reverted)
+        self.taken = set(taken)
+        self.dropped = set(dropped)
+        self.sent = []
+        self.pool = {}
+        self.receipts = {}
+        self.lock = threading.Lock()
+
+    def get_transaction_count(self, address, block):
+        return self.pending if block == 'pending' else self.mined
+
+    def send_raw_transaction(self, raw_tx):
+        label, nonce = raw_tx.decode().split(':')
+        nonce = int(nonce)
+        if nonce in self.taken:
+            self.taken.remove(nonce)
+            self.pool[nonce] = f'external:{nonce}'.encode()
+            self.pending += 1
+            raise ValueError({'code': -32000, 'message': 'nonce too low'})
+        if self.pool.get(nonce) == raw_tx:
+            raise ValueError({'code': -32000, 'message': 'already known'})
+        self.sent.append(raw_tx)
+        if label in self.dropped:
+            self.dropped.remove(label)
+        else:
+            self.pool[nonce] = raw_tx
+        self.pending = max(self.pending, nonce + 1)
+        if label in self.retried:
+            self.retried.remove(label)
+            raise ValueError({'code': -32000, 'message': 'already known'})
+        return raw_tx
+
+    def mine(self):
+        with self.lock:
+            while self.mined in self.pool:
+                raw_tx = self.pool.pop(self.mined)
+                label = raw_tx.decode().split(':')[0]
+                self.receipts[raw_tx.hex()] = {'status': 0 if label in self.reverted else 1}
+                self.mined += 1
+
+    def get_transaction_receipt(self, tx_hash):
+        self.mine()
+        if tx_hash not in self.receipts:
+            raise TransactionNotFound(tx_hash)
+        return self.receipts[tx_hash]
+
+    def wait(self, tx_hash):
+        self.mine()
+        if tx_hash not in self.receipts:
+            raise TransactionNotMinedError(f'{tx_hash} not mined')
+        return self.receipts[tx_hash]
+
+
+def fake_skale(chain, concurrent_signing=False):
+    skale = mock.Mock()
+    skale.web3.eth = chain
+    skale.wallet.wait = chain.wait
+    skale.wallet.concurrent_signing = concurrent_signing
+    skale.wallet.sign = mock.Mock(side_effect=lambda tx: mock.Mock(
+        rawTransaction=f'{tx["data"]}:{tx["nonce"]}'.encode()
+    ))
+    return skale
+
+
+@pytest.fixture(autouse=True)
+def fake_tools():
+    with mock.patch('core.pipeline.transaction_from_method', fake_transaction_from_method), \
+            mock.patch('core.pipeline.estimate_gas', fake_estimate_gas), \
+            mock.patch('core.pipeline.call_at_block', fake_call_at_block), \
+            mock.patch('core.pipeline.raw_tx_hash', lambda raw_tx: raw_tx.hex()):
+        yield
+
+
+def run_pipeline(chain, labels, fee=None):
+    txs = [PipelineTx(label=label, method=label) for label in labels]
+    Pipeline(fake_skale(chain), fee or TxFee(gas_price=TEST_GAS_PRICE)).run(txs)
+    return {tx.label: tx for tx in txs}
+
+
+def test_pipeline_assigns_nonces_locally():
+    chain = FakeChain(nonce=5, reverted=['3'])
+    txs = run_pipeline(chain, ['1', 'bad', '2', '3'])
+
+    assert chain.sent == [b'1:5', b'2:6', b'3:7']
+    assert [txs[label].nonce for label in ['1', '2', '3']] == [5, 6, 7]
+    assert txs['1'].status == TxStatus.SUCCESS
+    assert txs['2'].status == TxStatus.SUCCESS
+    assert txs['3'].status == TxStatus.REVERTED
+    assert txs['bad'].status == TxStatus.SKIPPED
+    assert txs['bad'].tx_hash is None
+    assert 'Delegation is not pending' in txs['bad'].error
+
+
+def test_pipeline_simulates_at_one_block():
+    chain = FakeChain(nonce=5)
+    calls = []
+    with mock.patch('core.pipeline.call_at_block',
+                    side_effect=lambda method, opts, block: calls.append((method, block))):
+        txs = run_pipeline(chain, ['1', '2'])
+    assert sorted(calls) == [('1', 100), ('2', 100)]
+    assert all(tx.status == TxStatus.SUCCESS for tx in txs.values())
+
+
+def test_pipeline_simulation_transport_errors():
+    chain = FakeChain(nonce=5)
+    txs = run_pipeline(chain, ['poor', 'timeout', 'limited', '1'])
+    # Only the transaction that would execute is sent
+    assert chain.sent == [b'1:5']
+    assert txs['poor'].status == TxStatus.SKIPPED
+    assert (txs['timeout'].status, txs['timeout'].error) == (TxStatus.FAILED, 'Read timed out')
+    assert (txs['limited'].status, txs['limited'].error) == (TxStatus.FAILED, 'Too many requests')
+
+
+def test_is_execution_error():
+    assert is_execution_error(ValueError({'code': 3, 'message': 'Delegation is not pending'}))
+    assert is_execution_error(ValueError('execution reverted'))
+    assert not is_execution_error(ValueError({'code': -32000, 'message': 'header not found'}))
+    assert not is_execution_error(TimeoutError('timed out'))
+
+
+def test_pipeline_skips_failed_simulation_with_fixed_gas_limit():
+    chain = FakeChain(nonce=5)
+    txs = [PipelineTx(label=label, method=label) for label in ['bad', '1']]
+    Pipeline(fake_skale(chain), TxFee(gas_price=TEST_GAS_PRICE), gas_limit=50000).run(txs)
+    assert chain.sent == [b'1:5']
+    assert txs[0].status == TxStatus.SKIPPED
+    assert txs[1].gas_limit == 50000
+
+
+def test_pipeline_fee():
+    skale = fake_skale(FakeChain())
+    with mock.patch('core.fee_oracle.suggest_fee', return_value=TxFee(gas_price=TEST_GAS_PRICE)):
+        assert Pipeline(skale, TxFee()).fee == {'gas_price': TEST_GAS_PRICE}
+    assert Pipeline(skale, TxFee(max_priority_fee_per_gas=1, max_fee_per_gas=2)).fee == {
+        'max_priority_fee_per_gas': 1,
+        'max_fee_per_gas': 2
+    }
+
+
+def test_pipeline_resyncs_taken_nonce():
+    chain = FakeChain(nonce=5, taken=[6])
+    txs = run_pipeline(chain, ['1', '2', '3'])
+
+    assert chain.sent == [b'1:5', b'2:7', b'3:8']
+    assert all(tx.status == TxStatus.SUCCESS for tx in txs.values())
+
+
+def test_pipeline_known_tx_is_sent():
+    chain = FakeChain(nonce=5, retried=['2'])
+    txs = run_pipeline(chain, ['1', '2', '3'])
+
+    # Retried transaction is not signed again with the next nonce
+    assert chain.sent == [b'1:5', b'2:6', b'3:7']
+    assert txs['2'].tx_hash == b'2:6'.hex()
+    assert all(tx.status == TxStatus.SUCCESS for tx in txs.values())
+
+
+def test_pipeline_refills_nonce_gap():
+    chain = FakeChain(nonce=5, dropped=['2'])
+    txs = run_pipeline(chain, ['1', '2', '3'])
+
+    assert chain.sent == [b'1:5', b'2:6', b'3:7', b'2:6']
+    assert all(tx.status == TxStatus.SUCCESS for tx in txs.values())
+    assert txs['2'].nonce == 6
+
+
+def test_pipeline_resigns_tx_with_lost_nonce():
+    chain = FakeChain(nonce=5, dropped=['2'])
+    chain.pool[6] = b'external:6'
+    txs = run_pipeline(chain, ['1', '2', '3'])
+
+    assert chain.sent == [b'1:5', b'2:6', b'3:7', b'2:8']
+    assert all(tx.status == TxStatus.SUCCESS for tx in txs.values())
+    assert txs['2'].nonce == 8
+
+
+def test_pipeline_signs_concurrently():
+    chain = FakeChain(nonce=5, taken=[6])
+    skale = fake_skale(chain, concurrent_signing=True)
+    txs = [PipelineTx(label=label, method=label) for label in ['1', '2', '3']]
+    Pipeline(skale, TxFee(gas_price=TEST_GAS_PRICE)).run(txs)
+
+    signed = sorted(f'{call.args[0]["data"]}:{call.args[0]["nonce"]}'
+                    for call in skale.wallet.sign.call_args_list)
+    # Set is signed upfront, transactions after the taken nonce are signed again
+    assert signed == ['1:5', '2:6', '2:7', '3:7', '3:8']
+    assert chain.sent == [b'1:5', b'2:7', b'3:8']
+    assert all(tx.status == TxStatus.SUCCESS for tx in txs)
+
+
+def test_pipeline_not_mined():
+    chain = FakeChain(nonce=5)
+    chain.send_raw_transaction = mock.Mock(side_effect=lambda raw_tx: raw_tx)
+    txs = run_pipeline(chain, ['1', '2'])
+
+    assert txs['1'].status == TxStatus.NOT_MINED
+    assert txs['2'].status == TxStatus.NOT_MINED
+
+
+def test_eth_transfer():
+    web3 = mock.Mock()
+    web3.eth.estimate_gas.return_value = 21000
+    transfer = EthTransfer(web3, '0xreceiver', 1337)
+    opts = {'from': '0xsender', 'value': 10}
+    transfer.call(opts, block_identifier=100)
+    web3.eth.call.assert_called_once_with(
+        {'from': '0xsender', 'value': 10, 'to': '0xreceiver'}, 100)
+    assert transfer.estimateGas(opts, block_identifier='latest') == 21000
+    assert transfer.buildTransaction({'nonce': 5, 'gas': 21000, 'value': 10}) == {
+        'to': '0xreceiver', 'chainId': 1337, 'nonce': 5, 'gas': 21000, 'value': 10
+    }
+
+
+def test_pipeline_wait_errors():
+    chain = FakeChain(nonce=5)
+    skale = fake_skale(chain)
+
+    def wait(tx_hash):
+        if tx_hash == b'2:6'.hex():
+            raise ConnectionError('Endpoint is not available')
+        return chain.wait(tx_hash)
+
+    skale.wallet.wait = wait
+    skale.web3.eth = mock.Mock(wraps=chain)
+    skale.web3.eth.get_transaction_receipt.side_effect = ConnectionError('Still not available')
+    txs = [PipelineTx(label=label, method=label) for label in ['1', '2', '3']]
+    Pipeline(skale, TxFee(gas_price=TEST_GAS_PRICE)).run(txs)
+
+    assert [tx.status for tx in txs] == [TxStatus.SUCCESS, TxStatus.NOT_MINED, TxStatus.SUCCESS]
+    assert txs[1].error == 'Still not available'
@@ -0,0 +1,109 @@
+""" Tests for core/presign.py module """
+
+from unittest import mock
+
+import pytest
+
+from core.pipeline import PipelineTx, TxStatus
+from core.presign import (SignedFileError, check_signed, read_signed, send_signed,
+                          sign_txs)
+from core.transaction import TxFee
+from tests.utils import (TX_RECEIVER, fake_call_at_block, fake_estimate_gas,
+                         fake_transaction_from_method)
+from utils.helper import write_json
+from utils.keccak import keccak256
+
+SENDER = '0x' + '11' * 20
+TEST_FEE = TxFee(gas_price=10 ** 9)
+
+
+def fake_skale(nonce=5, concurrent_signing=False):
+    skale = mock.Mock()
+    skale.wallet.address = SENDER
+    skale.wallet.concurrent_signing = concurrent_signing
+    skale.wallet.sign.side_effect = lambda tx_dict: mock.Mock(
+        rawTransaction=f'{tx_dict["data"]}:{tx_dict["nonce"]}'.encode())
+    skale.web3.eth.get_transaction_count.return_value = nonce
+    return skale
+
+
+@pytest.mark.parametrize('concurrent_signing', [False, True])
+@mock.patch('core.pipeline.call_at_block', fake_call_at_block)
+@mock.patch('core.pipeline.estimate_gas', fake_estimate_gas)
+@mock.patch('core.pipeline.transaction_from_method', fake_transaction_from_method)
+def test_sign_txs(concurrent_signing):
+    skale = fake_skale(concurrent_signing=concurrent_signing)
+    txs = [PipelineTx(label=method, method=method) for method in ('a', 'bad', 'b')]
+    signed = sign_txs(skale, txs, TEST_FEE)
+    assert [tx.status for tx in txs] == [TxStatus.SIGNED, TxStatus.SKIPPED, TxStatus.SIGNED]
+    assert [(entry['label'], entry['nonce']) for entry in signed] == [('a', 5), ('b', 6)]
+    assert signed[0]['raw_tx'] == '0x' + b'a:5'.hex()
+    assert signed[0]['tx_hash'] == '0x' + keccak256(b'a:5').hex()
+    assert signed[1]['tx'] == {
+        'to': TX_RECEIVER, 'nonce': 6, 'gas': 100000, 'gasPrice': 10 ** 9,
+        'maxFeePerGas': None, 'maxPriorityFeePerGas': None, 'value': 0
+    }
+    skale.web3.eth.send_raw_transaction.assert_not_called()
+
+
+def signed_file(tmp_path, nonces=(7, 5, 6)):
+    signed_filepath = str(tmp_path / 'signed.json')
+    write_json(signed_filepath, {
+        'chain_id': 1,
+        'from': SENDER,
+        'transactions': [
+            {'label': str(nonce), 'nonce': nonce, 'tx_hash': f'0x{nonce}',
+             'raw_tx': f'0xraw{nonce}', 'tx': {'nonce': nonce}}
+            for nonce in nonces
+        ]
+    })
+    return signed_filepath
+
+
+def test_read_signed(tmp_path):
+    signed = read_signed(signed_file(tmp_path))
+    assert [tx['nonce'] for tx in signed['transactions']] == [5, 6, 7]
+    with pytest.raises(SignedFileError, match='no signed transactions'):
+        read_signed(signed_file(tmp_path, nonces=()))
+    broken_filepath = tmp_path / 'broken.json'
+    broken_filepath.write_text('{')
+    with pytest.raises(SignedFileError, match='not a valid JSON'):
+        read_signed(str(broken_filepath))
+
+
+def test_check_signed(tmp_path):
+    signed = read_signed(signed_file(tmp_path))
+    web3 = mock.Mock()
+    web3.eth.chain_id = 1
+    web3.eth.get_transaction_count.return_value = 5
+    check_signed(web3, signed)
+    web3.eth.get_transaction_count.return_value = 6
+    with pytest.raises(SignedFileError, match='Nonce 5 is already used'):
+        check_signed(web3, signed)
+    web3.eth.chain_id = 2
+    with pytest.raises(SignedFileError, match='signed for chain 1'):
+        check_signed(web3, signed)
+
+
+def test_send_signed(tmp_path):
+    signed = read_signed(signed_file(tmp_path))
+    sent = []
+
+    def send_raw_transaction(raw_tx):
+        sent.append(raw_tx)
+        if raw_tx == '0xraw5':
+            raise ValueError({'code': -32000, 'message': 'already known'})
+        if raw_tx == '0xraw6':
+            raise ValueError({'code': -32000, 'message': 'insufficient funds'})
+        return mock.Mock(hex=mock.Mock(return_value=raw_tx.replace('raw', '')))
+
+    web3 = mock.Mock()
+    web3.eth.send_raw_transaction.side_effect = send_raw_transaction
+    entries = send_signed(web3, signed)
+    # Transaction with the next nonce is not broadcast after the failure
+    assert sent == ['0xraw5', '0xraw6']
+    assert [entry['tx_hash'] for entry in entries] == ['0x5', '0x6', '0x7']
+    assert [entry.get('error') for entry in entries] == [
+        None, 'insufficient funds', 'not sent because 6 failed'
+    ]
+    assert entries[0]['intent'] == {'label': '5'}
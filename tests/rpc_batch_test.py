@@ -0,0 +1,61 @@
+""" Tests for utils/rpc_batch.py module """
+
+import json
+from unittest import mock
+
+from utils.rpc_batch import batch_call, call_request
+
+ENDPOINT = 'http://localhost:8545'
+
+
+def fake_function(name, address='0x' + '11' * 20):
+    function = mock.Mock(fn_name=name, address=address)
+    function._encode_transaction_data.return_value = f'0x{name}'
+    function.call.return_value = f'single:{name}'
+    return function
+
+
+def fake_web3(endpoint=ENDPOINT):
+    web3 = mock.Mock()
+    web3.provider.endpoint_uri = endpoint
+    web3.provider.get_request_kwargs.return_value = {'headers': {}}
+    return web3
+
+
+def test_call_request():
+    function = fake_function('aa')
+    assert call_request(3, function, 100) == {
+        'jsonrpc': '2.0', 'id': 3, 'method': 'eth_call',
+        'params': [{'to': function.address, 'data': '0xaa'}, '0x64']
+    }
+    assert call_request(0, function, 'latest')['params'][1] == 'latest'
+    assert call_request(0, function, 'latest', '0xsender')['params'][0]['from'] == '0xsender'
+
+
+def test_batch_call():
+    functions = [fake_function('aa'), fake_function('bb')]
+    requests = []
+
+    def make_post_request(endpoint_uri, data, **kwargs):
+        requests.append(json.loads(data))
+        # Nodes may answer batch items in any order
+        return json.dumps([{'id': 1, 'result': '0x02'}, {'id': 0, 'result': '0x01'}]).encode()
+
+    with mock.patch('utils.rpc_batch.make_post_request', make_post_request), \
+            mock.patch('utils.rpc_batch.decode_result',
+                       lambda web3, function, result: (function.fn_name, result)):
+        results = batch_call(fake_web3(), functions)
+    assert len(requests) == 1
+    assert [request['params'][0]['data'] for request in requests[0]] == ['0xaa', '0xbb']
+    assert results == [('aa', '0x01'), ('bb', '0x02')]
+    assert not any(function.call.called for function in functions)
+
+
+def test_batch_call_fallback():
+    functions = [fake_function('aa'), fake_function('bb')]
+    error_response = json.dumps({'id': None, 'error': {'message': 'batch is not supported'}})
+    with mock.patch('utils.rpc_batch.make_post_request', return_value=error_response.encode()):
+        assert batch_call(fake_web3(), functions, 5) == ['single:aa', 'single:bb']
+    functions[0].call.assert_called_once_with({}, block_identifier=5)
+    assert batch_call(fake_web3('ws://localhost:8546'), functions) == ['single:aa', 'single:bb']
+    assert batch_call(fake_web3(), []) == []
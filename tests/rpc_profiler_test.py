@@ -0,0 +1,39 @@
+""" Tests for utils/rpc_profiler.py module """
+
+import pytest
+
+from utils.rpc_profiler import RpcProfiler
+
+
+def fake_make_request(method, params):
+    if method == 'eth_fail':
+        raise ConnectionError('test')
+    return {'jsonrpc': '2.0', 'id': 1, 'result': '0x1'}
+
+
+def test_rpc_profiler_middleware():
+    profiler = RpcProfiler()
+    profiler._call_names = {}
+    middleware = profiler.middleware(fake_make_request, None)
+
+    for _ in range(3):
+        assert middleware('eth_blockNumber', [])['result'] == '0x1'
+    with pytest.raises(ConnectionError):
+        middleware('eth_fail', [])
+
+    summary = profiler.summary()
+    assert list(summary) == ['eth_blockNumber', 'eth_fail']
+    assert summary['eth_blockNumber']['calls'] == 3
+    assert summary['eth_blockNumber']['errors'] == 0
+    assert summary['eth_blockNumber']['request_bytes'] == 6
+    assert sum(summary['eth_blockNumber']['histogram'].values()) == 3
+    assert summary['eth_fail']['errors'] == 1
+
+
+def test_rpc_profiler_call_name():
+    profiler = RpcProfiler()
+    address = '0x1057dc7765e76cd4f4f9c8bb0e57f2f7cb1d0a6c'
+    profiler._call_names = {address: ('validator_service', {'0xb5d89627': 'getValidator'})}
+    params = [{'to': address, 'data': '0xb5d89627' + '0' * 64}, 'latest']
+    assert profiler.call_name('eth_call', params) == 'eth_call validator_service.getValidator'
+    assert profiler.call_name('eth_getBalance', [address, 'latest']) == 'eth_getBalance'
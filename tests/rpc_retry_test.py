@@ -0,0 +1,89 @@
+""" Tests for utils/rpc_retry.py module """
+
+import time
+
+import mock
+import pytest
+
+from utils.rpc_retry import RetryBudget, RetryPolicy, backoff_delay, remove_http_retries
+
+RESPONSE = {'jsonrpc': '2.0', 'id': 1, 'result': '0x1'}
+
+
+class FlakyRequest:
+    def __init__(self, failures, error=ConnectionError):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def __call__(self, method, params):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error('test')
+        return RESPONSE
+
+
+def test_backoff_delay():
+    for attempt in range(10):
+        assert 0 <= backoff_delay(attempt, base=0.5, cap=4) <= min(4, 0.5 * 2 ** attempt)
+
+
+def test_retry_policy_retries_reads():
+    policy = RetryPolicy(budgets={'eth_call': RetryBudget(3, 60)})
+    make_request = FlakyRequest(failures=2)
+    with mock.patch('utils.rpc_retry.time.sleep') as sleep_mock:
+        assert policy.middleware(make_request, None)('eth_call', []) == RESPONSE
+    assert make_request.calls == 3
+    assert sleep_mock.call_count == 2
+
+    make_request = FlakyRequest(failures=3)
+    with mock.patch('utils.rpc_retry.time.sleep'), pytest.raises(ConnectionError):
+        policy.middleware(make_request, None)('eth_call', [])
+    assert make_request.calls == 3
+
+
+def test_retry_policy_skips_writes():
+    policy = RetryPolicy(budgets={'eth_call': RetryBudget(3, 60)})
+    make_request = FlakyRequest(failures=1)
+    with pytest.raises(ConnectionError):
+        policy.middleware(make_request, None)('eth_sendRawTransaction', [])
+    assert make_request.calls == 1
+
+
+def test_retry_policy_hedges_slow_requests():
+    def slow_request(method, params):
+        time.sleep(1)
+        return {**RESPONSE, 'result': 'slow'}
+
+    def outer_middleware(make_request, web3):
+        return make_request
+
+    def inner_middleware(make_request, web3):
+        return make_request
+
+    hedge_provider = mock.Mock()
+    hedge_provider.request_func.return_value = mock.Mock(
+        return_value={**RESPONSE, 'result': 'hedge'})
+    policy = RetryPolicy(budgets={'eth_call': RetryBudget(1, 60)}, hedge_provider=hedge_provider)
+    web3 = mock.Mock()
+    web3.middleware_onion = [outer_middleware, policy.middleware, inner_middleware]
+    with mock.patch.object(policy.latencies, 'p95', return_value=0.05):
+        response = policy.middleware(slow_request, web3)('eth_call', [])
+    assert response['result'] == 'hedge'
+    # Hedged request goes through the middlewares below the policy, not the bare provider
+    hedge_provider.request_func.assert_called_once_with(web3, [inner_middleware])
+    hedge_provider.request_func.return_value.assert_called_once_with('eth_call', [])
+    hedge_provider.make_request.assert_not_called()
+
+
+def test_remove_http_retries():
+    def http_retry_middleware(make_request, web3):
+        return make_request
+
+    def other_middleware(make_request, web3):
+        return make_request
+
+    provider = mock.Mock()
+    provider.middlewares = (http_retry_middleware, other_middleware)
+    remove_http_retries(provider, http_retry_middleware)
+    assert provider.middlewares == [other_middleware]
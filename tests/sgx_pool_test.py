@@ -0,0 +1,41 @@
+""" Tests for core/sgx_pool.py module """
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sgx.sgx_rpc_handler import SgxServerError
+
+from core.sgx_pool import PooledSgxClient, PooledSgxRPCHandler
+from tests.benchmarks.sgx_stub import KEY_NAME, PUBLIC_KEY, SgxStub
+
+
+@pytest.fixture
+def sgx_stub():
+    with SgxStub(sign_delay=0.02) as stub:
+        yield stub
+
+
+def test_pooled_handler_reuses_connections(sgx_stub):
+    handler = PooledSgxRPCHandler(sgx_stub.endpoint, max_concurrency=4)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        signatures = list(executor.map(
+            lambda index: handler.ecdsa_sign(KEY_NAME, hex(index)), range(24)))
+    handler.close()
+    assert signatures == [('0', '1', '2')] * 24
+    assert sgx_stub.calls == {'ecdsaSignMessageHash': 24}
+    assert sgx_stub.max_in_flight <= 4
+    assert len(sgx_stub.connections) <= 4
+
+
+def test_pooled_handler_error(sgx_stub):
+    handler = PooledSgxRPCHandler(sgx_stub.endpoint)
+    with pytest.raises(SgxServerError, match='Unknown method'):
+        handler.send('importECDSAKey')
+
+
+def test_pooled_client_caches_account(sgx_stub):
+    client = PooledSgxClient(sgx_stub.endpoint)
+    for _ in range(3):
+        account = client.get_account(KEY_NAME)
+    assert account.public_key.endswith(PUBLIC_KEY)
+    assert sgx_stub.calls == {'getPublicECDSAKey': 1}
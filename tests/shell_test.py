@@ -0,0 +1,104 @@
+""" Tests for core/shell.py module """
+
+from unittest import mock
+
+import click
+
+from core.shell import SkValShell, complete_args
+from utils.web3_utils import init_skale_w_wallet_from_config, reuse_skale_instances
+
+
+@click.group()
+@click.option('--block')
+def fake_cli(block):
+    pass
+
+
+@fake_cli.group('wallet')
+def fake_wallet():
+    pass
+
+
+@fake_wallet.command('send-eth')
+@click.option('--pk-file')
+@click.option('--yes', is_flag=True)
+@click.option('--type', type=click.Choice(['software', 'ledger']))
+def fake_send_eth(pk_file, yes, type):
+    print(f'sent {pk_file}')
+
+
+LEDGER_INFO = {'address_index': 0, 'keys_type': 'live'}
+
+
+@fake_wallet.command('setup-ledger')
+@click.argument('address_index', type=int)
+def fake_setup_ledger(address_index):
+    LEDGER_INFO['address_index'] = address_index
+
+
+@fake_wallet.command('address')
+def fake_address():
+    print(init_skale_w_wallet_from_config().wallet.address)
+
+
+@fake_cli.command('shell')
+def fake_shell():
+    pass
+
+
+def make_shell(calls):
+    def run_command(args):
+        calls.append(args)
+        fake_cli(args)
+    ctx = click.Context(fake_cli)
+    return SkValShell(run_command, fake_cli, ctx), ctx
+
+
+def test_complete_args():
+    ctx = click.Context(fake_cli)
+    assert complete_args(fake_cli, ctx, [], 'w') == ['wallet']
+    assert complete_args(fake_cli, ctx, [], 's') == []
+    assert complete_args(fake_cli, ctx, ['wallet'], '') == ['address', 'send-eth', 'setup-ledger']
+    assert complete_args(fake_cli, ctx, ['wallet', 'send-eth'], '--p') == ['--pk-file']
+    assert complete_args(fake_cli, ctx, ['wallet', 'send-eth', '--type'], 'l') == ['ledger']
+
+
+def test_shell_runs_commands(capsys):
+    calls = []
+    shell, _ = make_shell(calls)
+    shell.onecmd('wallet send-eth --pk-file "my key.txt"')
+    shell.onecmd('--block 1 wallet unknown')
+    shell.onecmd('shell')
+    assert calls == [['wallet', 'send-eth', '--pk-file', 'my key.txt'],
+                     ['--block', '1', 'wallet', 'unknown']]
+    out = capsys.readouterr().out
+    assert 'sent my key.txt' in out
+    assert 'shell is not available in the shell' in out
+    assert shell.onecmd('exit') is True
+
+
+def test_shell_drops_wallets_on_wallet_setup(capsys):
+    shell, _ = make_shell([])
+    reuse_skale_instances()
+    try:
+        with mock.patch('utils.web3_utils.get_config',
+                        return_value={'endpoint': 'http://localhost', 'wallet': 'ledger'}), \
+                mock.patch('utils.web3_utils.get_ledger_wallet_info',
+                           side_effect=lambda: dict(LEDGER_INFO)), \
+                mock.patch('utils.web3_utils.print_wallet_info'), \
+                mock.patch('utils.web3_utils.init_skale_w_wallet',
+                           side_effect=lambda *args, **kwargs: mock.Mock(
+                               wallet=mock.Mock(address=f'0x{LEDGER_INFO["address_index"]}'))
+                           ) as init_mock:
+            shell.onecmd('wallet address')
+            shell.onecmd('wallet address')
+            assert init_mock.call_count == 1
+            shell.onecmd('wallet setup-ledger 1')
+            shell.onecmd('wallet address')
+            shell.onecmd('wallet setup-ledger 1')
+            shell.onecmd('wallet address')
+            assert init_mock.call_count == 3
+    finally:
+        reuse_skale_instances(False)
+        LEDGER_INFO['address_index'] = 0
+    assert capsys.readouterr().out.split() == ['0x0', '0x0', '0x1', '0x1']
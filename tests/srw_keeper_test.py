@@ -0,0 +1,172 @@
+""" Tests for core/srw_keeper.py module """
+
+import json
+from unittest import mock
+
+import pytest
+from web3.exceptions import TransactionNotFound
+
+from core.pipeline import TxStatus
+from core.srw_keeper import (INSUFFICIENT_FUNDS, OK, PENDING, RECHARGE, Decision, KeeperError,
+                             SrwKeeper, parse_amounts, plan_recharges)
+from core.transaction import TxFee
+from tests.utils import fake_from_wei, fake_to_wei
+
+ETH = 10 ** 18
+ADDRESS = '0x' + '11' * 20
+
+
+@pytest.fixture(autouse=True)
+def fake_units():
+    with mock.patch('core.srw_keeper.to_wei', fake_to_wei), \
+            mock.patch('core.srw_keeper.from_wei', fake_from_wei):
+        yield
+
+
+def test_parse_amounts():
+    assert parse_amounts('0.5', '1.5') == (ETH // 2, 3 * ETH // 2)
+    for threshold, target in [('many', '1'), ('0', '1'), ('1', '0.5')]:
+        with pytest.raises(KeeperError):
+            parse_amounts(threshold, target)
+
+
+def test_plan_recharges():
+    balances = {1: 2 * ETH, 2: ETH // 2, 3: 0, 4: ETH}
+    # Validator 3 is the emptiest and gets funds first, 2 can't be afforded after it
+    assert plan_recharges(balances, threshold=ETH, target=2 * ETH, available=2 * ETH) == [
+        Decision(1, 2 * ETH, OK),
+        Decision(2, ETH // 2, INSUFFICIENT_FUNDS, 3 * ETH // 2),
+        Decision(3, 0, RECHARGE, 2 * ETH),
+        Decision(4, ETH, OK),
+    ]
+
+
+def test_plan_recharges_gas_and_pending():
+    balances = {1: 0, 2: 0, 3: 0}
+    # Recharge of 1 is in flight, gas of the recharge doesn't fit for validator 3
+    assert plan_recharges(balances, threshold=ETH, target=ETH, available=2 * ETH,
+                          gas_cost=ETH // 10, pending={1: ETH}) == [
+        Decision(1, 0, PENDING, ETH),
+        Decision(2, 0, RECHARGE, ETH),
+        Decision(3, 0, INSUFFICIENT_FUNDS, ETH),
+    ]
+
+
+def fake_skale():
+    skale = mock.Mock()
+    skale.wallet.address = ADDRESS
+    skale.web3.eth.block_number = 100
+    skale.web3.eth.get_balance.return_value = 10 * ETH
+    return skale
+
+
+def fake_run(txs):
+    for tx in txs:
+        tx.status, tx.tx_hash = TxStatus.SUCCESS, f'0x{tx.label}'
+    return txs
+
+
+def test_keeper_tick(tmp_path, capsys):
+    skale = fake_skale()
+    state_filepath = str(tmp_path / 'keeper' / 'state.json')
+    keeper = SrwKeeper(skale, [3, 1, 3], ETH, 2 * ETH, TxFee(gas_price=10 ** 9), state_filepath)
+    with mock.patch('core.srw_keeper.batch_call', return_value=[ETH // 2, 3 * ETH]) as batch, \
+            mock.patch('core.srw_keeper.Pipeline') as pipeline:
+        pipeline.return_value.fee = {'gas_price': 10 ** 9}
+        pipeline.return_value.run.side_effect = fake_run
+        keeper.tick()
+    # Balances of all validators are read in one batch at the same block
+    assert batch.call_count == 1
+    assert batch.call_args[0][2] == 100
+    skale.wallets.contract.functions.rechargeValidatorWallet.assert_called_once_with(1)
+    txs = pipeline.return_value.run.call_args[0][0]
+    assert [(tx.label, tx.value) for tx in txs] == [('1', 3 * ETH // 2)]
+    assert '1 of 2 SRW wallets recharged with 1.5 ETH' in capsys.readouterr().out
+
+    with open(state_filepath) as state_file:
+        state = json.load(state_file)
+    assert (state['rounds'], state['recharges'], state['errors']) == (1, 1, 0)
+    assert state['validators']['1']['last_recharge']['tx_hash'] == '0x1'
+    assert state['validators']['3'] == {'balance': 3 * ETH, 'last_action': OK}
+    assert [entry['validator_id'] for entry in state['history'][0]['decisions']] == [1]
+
+
+def test_keeper_tick_error(tmp_path):
+    skale = fake_skale()
+    state_filepath = str(tmp_path / 'state.json')
+    keeper = SrwKeeper(skale, [1], ETH, 2 * ETH, TxFee(gas_price=10 ** 9), state_filepath)
+    with mock.patch('core.srw_keeper.batch_call', side_effect=ConnectionError('node is down')):
+        keeper.tick()
+    with open(state_filepath) as state_file:
+        state = json.load(state_file)
+    assert (state['rounds'], state['errors']) == (0, 1)
+    assert state['last_error']['error'] == 'node is down'
+
+
+def read_state(state_filepath):
+    with open(state_filepath) as state_file:
+        return json.load(state_file)
+
+
+def test_keeper_waits_for_pending_recharge(tmp_path):
+    skale = fake_skale()
+    skale.web3.eth.get_transaction_count.return_value = 7
+    skale.web3.eth.get_transaction_receipt.side_effect = TransactionNotFound('not found')
+    state_filepath = str(tmp_path / 'state.json')
+    keeper = SrwKeeper(skale, [1], ETH, 2 * ETH, TxFee(gas_price=10 ** 9), state_filepath)
+
+    def not_mined(txs):
+        for tx in txs:
+            tx.status, tx.tx_hash, tx.nonce = TxStatus.NOT_MINED, f'0x{tx.label}', 7
+
+    with mock.patch('core.srw_keeper.batch_call', return_value=[0]), \
+            mock.patch('core.srw_keeper.Pipeline') as pipeline:
+        pipeline.return_value.fee = {'gas_price': 10 ** 9}
+        pipeline.return_value.run.side_effect = not_mined
+        keeper.tick()
+        assert read_state(state_filepath)['pending']['1']['tx_hash'] == '0x1'
+        # Same low balance is read again, recharge is still in the mempool
+        keeper.tick()
+        assert pipeline.return_value.run.call_count == 1
+        assert keeper.state['last_round']['decisions'][0]['action'] == PENDING
+        # In-flight value is not available for other recharges
+        assert keeper.state['last_round']['keeper_balance'] == 8 * ETH
+
+        skale.web3.eth.get_transaction_receipt.side_effect = None
+        skale.web3.eth.get_transaction_receipt.return_value = {'status': 1}
+        with mock.patch('core.srw_keeper.batch_call', return_value=[2 * ETH]):
+            keeper.tick()
+    state = read_state(state_filepath)
+    assert state['pending'] == {}
+    assert state['recharges'] == 1
+    assert state['validators']['1']['last_recharge']['status'] == 'success'
+    assert state['validators']['1']['last_action'] == OK
+
+    # Pending recharges survive restarts of the keeper
+    state['pending'] = {'1': {'tx_hash': '0x1', 'nonce': 7, 'amount': ETH, 'time': ''}}
+    with open(state_filepath, 'w') as state_file:
+        json.dump(state, state_file)
+    keeper = SrwKeeper(skale, [1], ETH, 2 * ETH, TxFee(gas_price=10 ** 9), state_filepath)
+    assert keeper.state['pending'] == state['pending']
+
+
+def test_keeper_round_fails_after_broadcast(tmp_path):
+    skale = fake_skale()
+    state_filepath = str(tmp_path / 'state.json')
+    keeper = SrwKeeper(skale, [1], ETH, 2 * ETH, TxFee(gas_price=10 ** 9), state_filepath)
+
+    def sent_and_failed(txs):
+        for tx in txs:
+            tx.tx_hash, tx.nonce = f'0x{tx.label}', 3
+        raise ConnectionError('node is down')
+
+    with mock.patch('core.srw_keeper.batch_call', return_value=[0]), \
+            mock.patch('core.srw_keeper.Pipeline') as pipeline:
+        pipeline.return_value.fee = {'gas_price': 10 ** 9}
+        pipeline.return_value.run.side_effect = sent_and_failed
+        keeper.tick()
+    state = read_state(state_filepath)
+    assert state['errors'] == 1
+    assert state['pending']['1'] == {
+        'tx_hash': '0x1', 'nonce': 3, 'amount': 2 * ETH, 'time': mock.ANY
+    }
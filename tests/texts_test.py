@@ -0,0 +1,53 @@
+""" Tests for utils/texts.py module """
+
+import os
+
+import utils.texts
+from utils.texts import (Texts, compile_text_bundle, get_section, parse_text_file,
+                         read_text_bundle)
+
+
+def reset_catalogue():
+    utils.texts._catalogue = None
+    utils.texts._sections.clear()
+
+
+def test_compile_text_bundle(tmp_path):
+    bundle_filepath = str(tmp_path / 'text.bundle')
+    compile_text_bundle(bundle_filepath=bundle_filepath)
+    bundle = read_text_bundle(bundle_filepath)
+    assert set(bundle['sections']) == set(parse_text_file())
+
+
+def test_stale_bundle_is_ignored(tmp_path):
+    text_filepath = str(tmp_path / 'text.yml')
+    bundle_filepath = str(tmp_path / 'text.bundle')
+    with open(text_filepath, 'w') as f:
+        f.write('info:\n  help: old\n')
+    compile_text_bundle(text_filepath, bundle_filepath)
+    assert read_text_bundle(bundle_filepath, text_filepath) is not None
+    with open(text_filepath, 'w') as f:
+        f.write('info:\n  help: new\n')
+    assert read_text_bundle(bundle_filepath, text_filepath) is None
+    assert read_text_bundle(os.path.join(str(tmp_path), 'missing')) is None
+
+
+def test_sections_are_loaded_lazily(tmp_path, monkeypatch):
+    bundle_filepath = str(tmp_path / 'text.bundle')
+    compile_text_bundle(bundle_filepath=bundle_filepath)
+    monkeypatch.setattr(utils.texts, 'TEXT_BUNDLE_FILE', bundle_filepath)
+    reset_catalogue()
+    try:
+        assert Texts()['holder'] == parse_text_file()['holder']
+        assert set(utils.texts._sections) == {'holder'}
+        assert get_section('missing') is None
+    finally:
+        reset_catalogue()
+
+
+def test_fallback_to_yaml():
+    reset_catalogue()
+    try:
+        assert Texts()['info'] == parse_text_file()['info']
+    finally:
+        reset_catalogue()
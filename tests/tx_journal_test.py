@@ -0,0 +1,131 @@
+""" Tests for core/tx_journal.py module """
+
+from unittest import mock
+
+import click
+from click.testing import CliRunner
+
+from core.tx_journal import (done_message, is_no_wait, journal_wallet, read_tx_journal,
+                             record_tx, recorded_hashes, set_no_wait)
+from utils.helper import transaction_cmd
+
+SENDER = '0x' + '11' * 20
+TX_DICT = {
+    'to': '0x' + '22' * 20,
+    'nonce': 7,
+    'gas': 21000,
+    'maxFeePerGas': 3,
+    'maxPriorityFeePerGas': 1,
+    'value': 10,
+    'data': '0x'
+}
+INTENT = {'command': 'wallet send-eth', 'params': {'amount': 0.1}}
+
+
+def test_record_tx(tmp_path):
+    journal_filepath = str(tmp_path / 'journal' / 'tx_journal.jsonl')
+    set_no_wait(INTENT)
+    try:
+        record_tx(TX_DICT, '0x1', SENDER, journal_filepath=journal_filepath)
+        record_tx(TX_DICT, '0x2', SENDER, label='12', journal_filepath=journal_filepath)
+        assert recorded_hashes() == ['0x1', '0x2']
+    finally:
+        set_no_wait(None)
+    entries = read_tx_journal(journal_filepath)
+    assert [entry['tx_hash'] for entry in entries] == ['0x1', '0x2']
+    assert entries[0]['from'] == SENDER
+    assert entries[0]['nonce'] == 7
+    assert entries[0]['max_fee_per_gas'] == 3
+    assert entries[0]['gas_price'] is None
+    assert entries[0]['intent'] == INTENT
+    assert entries[1]['intent'] == {**INTENT, 'label': '12'}
+    assert 'data' not in entries[0]
+    assert read_tx_journal(str(tmp_path / 'missing.jsonl')) == []
+
+
+def test_journal_wallet(tmp_path):
+    journal_filepath = str(tmp_path / 'tx_journal.jsonl')
+    wallet = mock.Mock()
+    wallet.journaled = False
+    wallet.address = SENDER
+    wallet.sign_and_send.return_value = '0x1'
+    wallet.wait.return_value = {'status': 1}
+    web3 = mock.Mock()
+    web3.eth.get_transaction_count.return_value = 5
+    sign_and_send, wait = wallet.sign_and_send, wallet.wait
+    journal_wallet(wallet, web3, journal_filepath)
+    assert journal_wallet(wallet, web3).sign_and_send is wallet.sign_and_send
+
+    with mock.patch('core.tx_journal.record_tx') as record_tx_mock:
+        assert wallet.sign_and_send(TX_DICT) == '0x1'
+        assert wallet.wait('0x1') == {'status': 1}
+        record_tx_mock.assert_not_called()
+
+        set_no_wait(INTENT)
+        try:
+            assert wallet.sign_and_send(TX_DICT) == '0x1'
+            assert wallet.wait('0x1') is None
+        finally:
+            set_no_wait(None)
+        record_tx_mock.assert_called_once_with(TX_DICT, '0x1', SENDER,
+                                               journal_filepath=journal_filepath)
+    assert sign_and_send.call_count == 2
+    assert wait.call_count == 1
+
+
+def test_journal_wallet_no_wait_nonces(tmp_path):
+    journal_filepath = str(tmp_path / 'tx_journal.jsonl')
+    web3 = mock.Mock()
+    # Node hasn't seen the sent transactions yet, so it reports the same nonce
+    web3.eth.get_transaction_count.return_value = 5
+
+    def new_wallet():
+        wallet = mock.Mock()
+        wallet.journaled = False
+        wallet.address = SENDER
+        wallet.sign_and_send.side_effect = lambda tx_dict: f'0x{tx_dict["nonce"]}'
+        return journal_wallet(wallet, web3, journal_filepath)
+
+    wallet = new_wallet()
+    set_no_wait(INTENT)
+    try:
+        # skale.py sets the nonce of the latest block for every transaction
+        assert wallet.sign_and_send({**TX_DICT, 'nonce': 5}) == '0x5'
+        assert wallet.sign_and_send({**TX_DICT, 'nonce': 5}) == '0x6'
+        # Next --no-wait command continues after the journaled transactions
+        assert new_wallet().sign_and_send({**TX_DICT, 'nonce': 5}) == '0x7'
+        web3.eth.get_transaction_count.return_value = 9
+        assert wallet.sign_and_send({**TX_DICT, 'nonce': 5}) == '0x9'
+    finally:
+        set_no_wait(None)
+    assert [entry['nonce'] for entry in read_tx_journal(journal_filepath)] == [5, 6, 7, 9]
+    web3.eth.get_transaction_count.assert_called_with(SENDER, 'pending')
+    assert wallet.sign_and_send({**TX_DICT, 'nonce': 5}) == '0x5'
+
+
+def test_transaction_cmd_no_wait():
+    calls = []
+
+    @click.command()
+    @transaction_cmd
+    @click.argument('amount')
+    def command(amount, pk_file, fee):
+        calls.append(is_no_wait())
+
+    runner = CliRunner()
+    result = runner.invoke(command, ['1', '--no-wait'])
+    assert result.exit_code == 0
+    result = runner.invoke(command, ['1'])
+    assert result.exit_code == 0
+    assert calls == [True, False]
+    assert not is_no_wait()
+
+
+def test_done_message():
+    assert done_message('✔ Wallet recharged') == '✔ Wallet recharged'
+    set_no_wait(INTENT)
+    try:
+        assert done_message('✔ Wallet recharged') == \
+            '✔ Transaction sent, check its status with < sk-val tx status >'
+    finally:
+        set_no_wait(None)
@@ -0,0 +1,100 @@
+""" Tests for core/tx.py module """
+
+from unittest import mock
+
+from web3.exceptions import TransactionNotFound
+
+from core.tx import find_entries, resolve_statuses, wait_statuses
+
+SENDER = '0x' + '11' * 20
+
+
+class FakeEth:
+    def __init__(self, receipts, mempool, nonce):
+        self.receipts, self.mempool, self.nonce = receipts, mempool, nonce
+
+    def get_transaction_receipt(self, tx_hash):
+        if tx_hash not in self.receipts:
+            raise TransactionNotFound(tx_hash)
+        return self.receipts[tx_hash]
+
+    def get_transaction(self, tx_hash):
+        if tx_hash not in self.mempool:
+            raise TransactionNotFound(tx_hash)
+        return {'hash': tx_hash}
+
+    def get_transaction_count(self, address):
+        return self.nonce
+
+
+def fake_web3(receipts=None, mempool=(), nonce=0):
+    return mock.Mock(eth=FakeEth(receipts or {}, set(mempool), nonce))
+
+
+def entry(tx_hash, nonce):
+    return {'tx_hash': tx_hash, 'from': SENDER, 'nonce': nonce}
+
+
+def test_find_entries():
+    entries = [entry('0xA', 1), entry('0xb', 2), entry('0xc', 3)]
+    with mock.patch('core.tx.read_tx_journal', return_value=entries):
+        assert find_entries((), 2) == entries[1:]
+        assert find_entries(('0xa', '0xd'), 2) == [entries[0], {'tx_hash': '0xd'}]
+
+
+def test_resolve_statuses():
+    web3 = fake_web3(
+        receipts={
+            '0x1': {'status': 1, 'blockNumber': 10},
+            '0x2': {'status': 0, 'blockNumber': 11}
+        },
+        mempool=['0x4'],
+        nonce=4
+    )
+    entries = [entry('0x1', 1), entry('0x2', 2), entry('0x3', 3), entry('0x4', 4),
+               entry('0x5', 5), {'tx_hash': '0x6'}]
+    assert [(status['status'], status['block'])
+            for status in resolve_statuses(web3, entries)] == [
+        ('success', 10), ('reverted', 11), ('replaced', None), ('pending', None),
+        ('not found', None), ('not found', None)
+    ]
+
+
+def test_wait_statuses():
+    web3 = fake_web3(mempool=['0x1', '0x2'])
+    entries = [entry('0x1', 0), entry('0x2', 1)]
+
+    def mine(_):
+        # 0x1 is mined, 0x2 is replaced by a transaction with the same nonce
+        web3.eth.receipts['0x1'] = {'status': 1, 'blockNumber': 10}
+        web3.eth.mempool.clear()
+        web3.eth.nonce = 2
+
+    with mock.patch('core.tx.time.sleep', side_effect=mine) as sleep_mock:
+        statuses = wait_statuses(web3, entries, timeout=100)
+    assert [status['status'] for status in statuses] == ['success', 'replaced']
+    sleep_mock.assert_called_once()
+
+
+def test_wait_statuses_timeout():
+    web3 = fake_web3(mempool=['0x1'])
+    with mock.patch('core.tx.time.sleep') as sleep_mock:
+        statuses = wait_statuses(web3, [entry('0x1', 0)], timeout=0)
+    assert statuses == [{'status': 'pending', 'block': None}]
+    sleep_mock.assert_not_called()
+
+
+def test_wait_statuses_on_pushed_heads():
+    web3 = fake_web3(mempool=['0x1'])
+    heads = mock.Mock()
+
+    def next_head(timeout):
+        web3.eth.receipts['0x1'] = {'status': 1, 'blockNumber': 10}
+        return {'number': hex(10)}
+
+    heads.get.side_effect = next_head
+    with mock.patch('core.tx.time.sleep') as sleep_mock:
+        statuses = wait_statuses(web3, [entry('0x1', 0)], timeout=100, heads=heads)
+    assert statuses == [{'status': 'success', 'block': 10}]
+    heads.get.assert_called_once()
+    sleep_mock.assert_not_called()
@@ -1,4 +1,5 @@
 import os
+from decimal import Decimal
 
 from cli.validator import _register
 
@@ -17,11 +18,50 @@ TEST_FEE_OPTIONS = [
     ()
 ]
 
+WEI = 10 ** 18
+TX_RECEIVER = '0x' + '11' * 20
+
 
 def str_contains(string, values):
     return all(x in string for x in values)
 
 
+def write_csv(tmp_path, content, filename='data.csv'):
+    csv_filepath = tmp_path / filename
+    csv_filepath.write_text(content)
+    return str(csv_filepath)
+
+
+def fake_to_wei(amount):
+    return int(Decimal(amount) * WEI)
+
+
+def fake_from_wei(amount):
+    return Decimal(amount) / WEI
+
+
+def fake_transaction_from_method(method, gas_limit, nonce, value, **fee):
+    return {'to': TX_RECEIVER, 'gas': gas_limit, 'nonce': nonce, 'value': value, 'data': method,
+            **{'gasPrice' if key == 'gas_price' else key: value for key, value in fee.items()}}
+
+
+def fake_call_at_block(method, opts, block):
+    if method == 'bad':
+        raise ValueError({'code': 3, 'message': 'execution reverted: Delegation is not pending'})
+    if method == 'poor':
+        raise ValueError({'code': -32000, 'message': 'insufficient funds for gas * price + value'})
+    if method == 'timeout':
+        raise ConnectionError('Read timed out')
+    if method == 'limited':
+        raise ValueError({'code': -32005, 'message': 'Too many requests'})
+
+
+def fake_estimate_gas(web3, method, opts):
+    if method == 'bad':
+        raise ValueError({'code': 3, 'message': 'execution reverted: Delegation is not pending'})
+    return 100000
+
+
 def create_new_validator_wallet_pk(skale, runner, new_wallet_pk):
     wallet, pk = new_wallet_pk
     result = runner.invoke(
@@ -0,0 +1,56 @@
+""" Tests for utils/validations.py module """
+
+import subprocess
+import sys
+
+import pytest
+
+from tests.constants import PROJECT_DIR
+from utils.keccak import keccak256
+from utils.validations import is_address, to_checksum_address
+
+# EIP-55 test vectors
+CHECKSUM_ADDRESSES = [
+    '0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAed',
+    '0xfB6916095ca1df60bB79Ce92cE3Ea74c37c5d359',
+    '0xdbF03B407c01E7cD3CBea99509d93f8DDDC8C6FB',
+    '0xD1220A0cf47c7B9Be7A2E6BA89F429762e7b9aDb',
+]
+
+
+def test_keccak256():
+    assert keccak256(b'').hex() == \
+        'c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470'
+    assert keccak256(b'x' * 135).hex() == \
+        '16570bdb055e663ea1cb57ac6f09194f4bc7b7070847971fc0b86710366dc34f'
+    assert keccak256(b'x' * 136).hex() == \
+        '50da8ef3747b7a7f01d08563aa11c72a2a668563fb928adc6e8d2a1ab4e36096'
+
+
+def test_to_checksum_address():
+    for address in CHECKSUM_ADDRESSES:
+        assert to_checksum_address(address.lower()) == address
+        assert to_checksum_address(address[2:].upper()) == address
+    with pytest.raises(ValueError):
+        to_checksum_address('0x123')
+
+
+def test_is_address():
+    for address in CHECKSUM_ADDRESSES:
+        assert is_address(address)
+        assert is_address(address.lower())
+        assert is_address(address[2:])
+        i = max(i for i, char in enumerate(address) if char.isalpha() and i > 1)
+        assert not is_address(address[:i] + address[i].swapcase() + address[i + 1:])
+    assert not is_address('0x' + 'g' * 40)
+    assert not is_address('0x' + 'a' * 39)
+    assert not is_address(None)
+
+
+def test_validation_does_not_import_web3():
+    code = (
+        'import sys; from utils.validations import EthAddressType; '
+        f'EthAddressType().convert("{CHECKSUM_ADDRESSES[0]}", None, None); '
+        'assert "web3" not in sys.modules and "eth_utils" not in sys.modules'
+    )
+    subprocess.run([sys.executable, '-c', code], cwd=PROJECT_DIR, check=True)
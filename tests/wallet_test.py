@@ -0,0 +1,158 @@
+""" Tests for core/wallet.py module """
+
+import csv
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+
+from core.pipeline import EthTransfer, PipelineTx, TxStatus
+from core.wallet import (PayoutRow, check_payouts, payout_totals, payout_tx, read_payouts_csv,
+                         send_payouts, write_payout_statuses)
+from tests.utils import fake_from_wei, fake_to_wei, write_csv
+from utils.helper import CsvFileError
+
+ADDRESS = '0x' + '11' * 20
+SKL = 10 ** 18
+
+
+def test_read_payouts_csv(tmp_path):
+    csv_filepath = write_csv(tmp_path, '\n'.join([
+        'address,amount,token',
+        f'{ADDRESS},0.5,ETH',
+        '# second payout',
+        f'{ADDRESS}, 100 ,skl',
+    ]))
+    with mock.patch('core.wallet.to_checksum_address', side_effect=str.upper) as checksum:
+        rows = read_payouts_csv(csv_filepath)
+    assert checksum.call_count == 2
+    assert rows == [
+        PayoutRow(2, ADDRESS.upper(), Decimal('0.5'), 'eth'),
+        PayoutRow(4, ADDRESS.upper(), Decimal(100), 'skl')
+    ]
+
+
+@pytest.mark.parametrize('content,message', [
+    ('', 'File has no rows'),
+    ('0x12,1,eth', 'Line 1: 0x12 is not a valid address'),
+    (f'{ADDRESS},many,eth', 'amount should be a number'),
+    (f'{ADDRESS},0,eth', 'amount should be positive'),
+    (f'{ADDRESS},1,usdc', 'token should be one of eth, skl'),
+    (f'{ADDRESS},1,', 'token should be one of eth, skl'),
+])
+def test_read_payouts_csv_errors(tmp_path, content, message):
+    def checksum(address):
+        if len(address) != 42:
+            raise ValueError(address)
+        return address
+
+    with mock.patch('core.wallet.to_checksum_address', checksum), \
+            pytest.raises(CsvFileError, match=message):
+        read_payouts_csv(write_csv(tmp_path, content))
+
+
+@mock.patch('core.wallet.to_wei', fake_to_wei)
+@mock.patch('core.wallet.from_wei', fake_from_wei)
+def test_check_payouts():
+    skale = mock.Mock()
+    skale.web3.eth.get_balance.return_value = 1 * SKL
+    skale.token.contract.functions.balanceOf.return_value.call.return_value = 500 * SKL
+    rows = [
+        PayoutRow(1, ADDRESS, Decimal('0.6'), 'eth'),
+        PayoutRow(2, ADDRESS, Decimal(300), 'skl'),
+        PayoutRow(3, ADDRESS, Decimal('0.6'), 'eth'),
+    ]
+    fee = {'gas_price': 0}
+    assert check_payouts(skale, rows, fee) == [
+        f'Total amount 1.2 ETH (including up to 0 ETH of fees) exceeds the balance '
+        f'of {skale.wallet.address} (1 ETH)'
+    ]
+    assert check_payouts(skale, rows[:2], fee) == []
+    # SKL balance is not requested for ETH only payouts
+    skale.token.contract.functions.balanceOf.reset_mock()
+    assert check_payouts(skale, rows[:1], fee) == []
+    skale.token.contract.functions.balanceOf.assert_not_called()
+    # Gas of 21000 + 100000 at 4000 gwei doesn't fit into the rest of the ETH balance
+    errors = check_payouts(skale, rows[:2], {'max_fee_per_gas': 4000 * 10 ** 9})
+    assert errors == [
+        f'Total amount 1.084 ETH (including up to 0.484 ETH of fees) exceeds the balance '
+        f'of {skale.wallet.address} (1 ETH)'
+    ]
+
+
+def test_payout_totals():
+    rows = [
+        PayoutRow(1, ADDRESS, Decimal('0.6'), 'eth'),
+        PayoutRow(2, ADDRESS, Decimal(300), 'skl'),
+        PayoutRow(3, ADDRESS, Decimal('0.5'), 'eth'),
+    ]
+    assert payout_totals(rows) == {'eth': Decimal('1.1'), 'skl': Decimal(300)}
+    assert payout_totals(rows[1:2]) == {'skl': Decimal(300)}
+
+
+@mock.patch('core.wallet.to_wei', fake_to_wei)
+def test_payout_tx():
+    skale = mock.Mock()
+    eth_tx = payout_tx(skale, PayoutRow(2, ADDRESS, Decimal('0.5'), 'eth'), 1337)
+    assert isinstance(eth_tx.method, EthTransfer)
+    assert (eth_tx.label, eth_tx.value, eth_tx.method.address) == ('2', SKL // 2, ADDRESS)
+    skl_tx = payout_tx(skale, PayoutRow(3, ADDRESS, Decimal(100), 'skl'), 1337)
+    skale.token.contract.functions.transfer.assert_called_once_with(ADDRESS, 100 * SKL)
+    assert skl_tx.value == 0
+
+
+def test_write_payout_statuses(tmp_path):
+    rows = [
+        PayoutRow(2, ADDRESS, Decimal('0.5'), 'eth'),
+        PayoutRow(3, ADDRESS, Decimal(100), 'skl')
+    ]
+    txs = [
+        PipelineTx('2', None, nonce=7, tx_hash='0xaa', status=TxStatus.SUCCESS),
+        PipelineTx('3', None, status=TxStatus.SKIPPED, error='execution reverted')
+    ]
+    status_filepath = tmp_path / 'statuses' / 'payouts.csv'
+    write_payout_statuses(str(status_filepath), rows, txs)
+    with open(status_filepath) as status_file:
+        assert list(csv.reader(status_file)) == [
+            ['line', 'address', 'amount', 'token', 'status', 'nonce', 'tx_hash', 'error'],
+            ['2', ADDRESS, '0.5', 'eth', 'success', '7', '0xaa', ''],
+            ['3', ADDRESS, '100', 'skl', 'skipped', '', '', 'execution reverted']
+        ]
+
+
+@mock.patch('core.wallet.to_wei', fake_to_wei)
+@mock.patch('core.wallet.from_wei', fake_from_wei)
+def test_send_payouts_interrupted(tmp_path):
+    csv_filepath = write_csv(tmp_path, f'{ADDRESS},0.5,eth\n{ADDRESS},1,skl\n')
+    status_filepath = str(tmp_path / 'statuses.csv')
+    skale = mock.Mock()
+    skale.web3.eth.get_balance.return_value = 1 * SKL
+    skale.token.contract.functions.balanceOf.return_value.call.return_value = 1 * SKL
+
+    def interrupted(txs):
+        txs[0].status, txs[0].nonce, txs[0].tx_hash = TxStatus.SUCCESS, 1, '0xaa'
+        raise KeyboardInterrupt
+
+    with mock.patch('core.wallet.init_skale_w_wallet_from_config', return_value=skale), \
+            mock.patch('core.wallet.Pipeline') as pipeline, \
+            mock.patch('core.wallet.click.confirm', return_value=True) as confirm:
+        pipeline.return_value.fee = {'gas_price': 10 ** 9}
+        pipeline.return_value.run.side_effect = interrupted
+        with pytest.raises(KeyboardInterrupt):
+            send_payouts(csv_filepath, None, None, status_filepath=status_filepath)
+    assert '2 transfer(s) of 0.5 ETH, 1 SKL' in confirm.call_args[0][0]
+    with open(status_filepath) as status_file:
+        assert [row[4:7] for row in csv.reader(status_file)][1:] == [
+            ['success', '1', '0xaa'], ['', '', '']
+        ]
+
+
+def test_send_payouts_canceled(tmp_path):
+    csv_filepath = write_csv(tmp_path, f'{ADDRESS},0.5,eth\n')
+    skale = mock.Mock()
+    with mock.patch('core.wallet.init_skale_w_wallet_from_config', return_value=skale), \
+            mock.patch('core.wallet.check_payouts', return_value=[]), \
+            mock.patch('core.wallet.Pipeline') as pipeline, \
+            mock.patch('core.wallet.click.confirm', return_value=False):
+        send_payouts(csv_filepath, None, None)
+    pipeline.return_value.run.assert_not_called()
@@ -0,0 +1,120 @@
+""" Tests for utils/ws_subscriptions.py module """
+
+import asyncio
+import json
+import threading
+import time
+
+import mock
+import pytest
+import websockets
+
+from utils.ws_subscriptions import WsSubscriber
+
+WS_PORT = 18546
+BLOCK_TIME = 0.05
+
+
+class FakeNode:
+    """Minimal stand-in for a node that pushes newHeads and drops the first connection"""
+
+    def __init__(self):
+        self.head = 1
+        self.connections = 0
+        self.clients = set()
+        self.loop = asyncio.new_event_loop()
+
+    def start(self):
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(websockets.serve(self.handle, '127.0.0.1', WS_PORT))
+        self.loop.create_task(self.produce_blocks())
+        self.loop.run_forever()
+
+    async def produce_blocks(self):
+        while True:
+            await asyncio.sleep(BLOCK_TIME)
+            self.head += 1
+            for ws in list(self.clients):
+                await ws.send(json.dumps({
+                    'jsonrpc': '2.0', 'method': 'eth_subscription',
+                    'params': {'subscription': '0x1', 'result': self.block(self.head)}
+                }))
+
+    def block(self, number):
+        return {'number': hex(number), 'hash': hex(number)}
+
+    async def handle(self, ws, path):
+        self.connections += 1
+        connection = self.connections
+        async for message in ws:
+            request = json.loads(message)
+            method, params = request['method'], request['params']
+            if method == 'eth_subscribe':
+                result = '0x1'
+                self.clients.add(ws)
+            elif method == 'eth_blockNumber':
+                result = hex(self.head)
+            elif method == 'eth_getBlockByNumber':
+                result = self.block(int(params[0], 16))
+            else:
+                result = True
+            await ws.send(json.dumps({'jsonrpc': '2.0', 'id': request['id'], 'result': result}))
+            if connection == 1 and method == 'eth_subscribe':
+                await asyncio.sleep(BLOCK_TIME * 3)
+                self.clients.discard(ws)
+                await ws.close()
+        self.clients.discard(ws)
+
+
+@pytest.fixture(scope='module')
+def fake_node():
+    node = FakeNode()
+    node.start()
+    time.sleep(0.2)
+    return node
+
+
+def test_subscriber_reconnects_and_backfills(fake_node):
+    subscriber = WsSubscriber(f'ws://127.0.0.1:{WS_PORT}')
+    heads = subscriber.subscribe('newHeads')
+    numbers = []
+    while len(numbers) < 20:
+        head = heads.get(timeout=10)
+        assert head is not None
+        numbers.append(int(head['number'], 16))
+    subscriber.close()
+
+    assert fake_node.connections >= 2
+    assert numbers == list(range(numbers[0], numbers[0] + len(numbers)))
+
+
+class FakeConnection:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+
+def test_subscriber_survives_unexpected_errors():
+    subscriber = WsSubscriber('ws://127.0.0.1:1')
+    sessions = []
+
+    async def session(ws):
+        sessions.append(ws)
+        if len(sessions) == 1:
+            raise KeyError('subscription')
+        # Stops the reconnection loop
+        raise asyncio.CancelledError()
+
+    with mock.patch('utils.ws_subscriptions.websockets.connect', return_value=FakeConnection()), \
+            mock.patch('utils.ws_subscriptions.backoff_delay', return_value=0), \
+            mock.patch.object(subscriber, '_session', session):
+        loop = asyncio.new_event_loop()
+        with pytest.raises(asyncio.CancelledError):
+            loop.run_until_complete(subscriber._keep_connected())
+        loop.close()
+    assert len(sessions) == 2
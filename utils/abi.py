@@ -0,0 +1,161 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of validator-cli
+#
+#   Copyright (C) 2022 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import hashlib
+import json
+import logging
+import marshal
+import os
+
+from utils.constants import SKALE_VAL_ABI_FILE, SKALE_VAL_ABI_BUNDLE_FILE
+
+logger = logging.getLogger(__name__)
+
+_loaded_bundles = {}
+
+ABI_BUNDLE_VERSION = 2
+
+# Key prefixes (as used in the SKALE Manager abi.json) of the contracts the CLI calls
+ABI_BUNDLE_CONTRACTS = [
+    'contract_manager',
+    'skale_token',
+    'skale_manager',
+    'constants_holder',
+    'nodes',
+    'validator_service',
+    'delegation_controller',
+    'delegation_period_manager',
+    'token_state',
+    'distributor',
+    'wallets',
+    'time_helpers_with_debug'
+]
+
+
+class AbiBundleError(Exception):
+    pass
+
+
+def file_hash(filepath):
+    with open(filepath, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def file_stamp(filepath):
+    stat = os.stat(filepath)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_raw_abi(abi_filepath=SKALE_VAL_ABI_FILE):
+    with open(abi_filepath, encoding='utf-8') as abi_file:
+        return json.load(abi_file)
+
+
+def compose_abi_bundle(raw_abi, source_hash):
+    if not isinstance(raw_abi, dict):
+        raise AbiBundleError('ABI file should contain a JSON object')
+    from eth_utils import event_abi_to_log_topic, function_abi_to_4byte_selector
+
+    abi, selectors, topics, addresses = {}, {}, {}, {}
+    for contract in ABI_BUNDLE_CONTRACTS:
+        address_key, abi_key = f'{contract}_address', f'{contract}_abi'
+        if abi_key not in raw_abi:
+            continue
+        abi[abi_key] = raw_abi[abi_key]
+        if address_key in raw_abi:
+            abi[address_key] = raw_abi[address_key]
+            addresses[raw_abi[address_key].lower()] = contract
+        selectors[contract] = {
+            '0x' + function_abi_to_4byte_selector(entry).hex(): entry['name']
+            for entry in raw_abi[abi_key] if entry.get('type') == 'function'
+        }
+        topics[contract] = {
+            '0x' + event_abi_to_log_topic(entry).hex(): entry['name']
+            for entry in raw_abi[abi_key]
+            if entry.get('type') == 'event' and not entry.get('anonymous')
+        }
+    return {
+        'version': ABI_BUNDLE_VERSION,
+        'source_hash': source_hash,
+        'abi': abi,
+        'selectors': selectors,
+        'topics': topics,
+        'addresses': addresses
+    }
+
+
+def compile_abi_bundle(abi_filepath=SKALE_VAL_ABI_FILE,
+                       bundle_filepath=SKALE_VAL_ABI_BUNDLE_FILE):
+    """Compile abi.json into a compact marshal bundle with precomputed selectors"""
+    logger.info(f'Compiling ABI bundle {bundle_filepath} from {abi_filepath}')
+    source_stamp = file_stamp(abi_filepath)
+    bundle = compose_abi_bundle(read_raw_abi(abi_filepath), file_hash(abi_filepath))
+    bundle['source_stamp'] = source_stamp
+    write_abi_bundle(bundle, bundle_filepath)
+    return bundle
+
+
+def write_abi_bundle(bundle, bundle_filepath=SKALE_VAL_ABI_BUNDLE_FILE):
+    tmp_filepath = f'{bundle_filepath}.tmp'
+    with open(tmp_filepath, 'wb') as bundle_file:
+        marshal.dump(bundle, bundle_file)
+    os.replace(tmp_filepath, bundle_filepath)
+
+
+def read_abi_bundle(bundle_filepath=SKALE_VAL_ABI_BUNDLE_FILE):
+    if not os.path.isfile(bundle_filepath):
+        return None
+    try:
+        with open(bundle_filepath, 'rb') as bundle_file:
+            bundle = marshal.load(bundle_file)
+    except (EOFError, ValueError, TypeError) as err:
+        logger.warning(f'ABI bundle {bundle_filepath} is corrupted: {err}')
+        return None
+    if not isinstance(bundle, dict) or bundle.get('version') != ABI_BUNDLE_VERSION:
+        return None
+    return bundle
+
+
+def load_abi_bundle(abi_filepath=SKALE_VAL_ABI_FILE,
+                    bundle_filepath=SKALE_VAL_ABI_BUNDLE_FILE):
+    """
+    Load the ABI bundle, recompiling it if it doesn't match abi.json.
+    Bundles are memoized in-process and validated by abi.json mtime and size,
+    the file is hashed only when its mtime or size changed.
+    """
+    source_stamp = file_stamp(abi_filepath)
+    key = (abi_filepath, bundle_filepath)
+    if key in _loaded_bundles and _loaded_bundles[key]['source_stamp'] == source_stamp:
+        return _loaded_bundles[key]
+    bundle = read_abi_bundle(bundle_filepath)
+    if bundle is None:
+        bundle = compile_abi_bundle(abi_filepath, bundle_filepath)
+    elif bundle['source_stamp'] != source_stamp:
+        if bundle['source_hash'] == file_hash(abi_filepath):
+            bundle['source_stamp'] = source_stamp
+            write_abi_bundle(bundle, bundle_filepath)
+        else:
+            bundle = compile_abi_bundle(abi_filepath, bundle_filepath)
+    _loaded_bundles[key] = bundle
+    return bundle
+
+
+def load_abi(abi_filepath=SKALE_VAL_ABI_FILE,
+             bundle_filepath=SKALE_VAL_ABI_BUNDLE_FILE):
+    return load_abi_bundle(abi_filepath, bundle_filepath)['abi']
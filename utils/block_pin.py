@@ -0,0 +1,70 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of validator-cli
+#
+#   Copyright (C) 2022 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Index of the block identifier in params of the state reading methods
+BLOCK_PARAM_INDEX = {
+    'eth_call': 1,
+    'eth_getBalance': 1,
+    'eth_getCode': 1,
+    'eth_getStorageAt': 2,
+}
+
+_pinned_block = None
+
+
+def pin_block(block):
+    """Pin state reads of the read-only SKALE instances to a block number or tag"""
+    global _pinned_block
+    _pinned_block = block
+
+
+def get_pinned_block():
+    return _pinned_block
+
+
+def resolve_block_number(web3, block):
+    if isinstance(block, int):
+        return block
+    return web3.eth.get_block(block)['number']
+
+
+def make_block_pin_middleware(block_number):
+    block_hex = hex(block_number)
+
+    def block_pin_middleware(make_request, web3):
+        def middleware(method, params):
+            index = BLOCK_PARAM_INDEX.get(method)
+            if index is not None and len(params) > index and params[index] == 'latest':
+                params = [*params[:index], block_hex, *params[index + 1:]]
+            return make_request(method, params)
+        return middleware
+    return block_pin_middleware
+
+
+def apply_block_pin(web3, block):
+    """Resolve block once (e.g. 'finalized') and rewrite all `latest` state reads to it"""
+    block_number = resolve_block_number(web3, block)
+    logger.info(f'State reads are pinned to block {block_number} ({block})')
+    web3.middleware_onion.inject(
+        make_block_pin_middleware(block_number), name='block_pin', layer=0)
+    return block_number
@@ -0,0 +1,282 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of validator-cli
+#
+#   Copyright (C) 2022 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Static bash/zsh/fish completion scripts rendered from the click command tree"""
+
+import os
+from typing import Dict, List, NamedTuple
+
+import click
+
+PROG_NAME = 'sk-val'
+COMPLETION_FILES = {
+    'bash': 'sk-val.bash',
+    'zsh': '_sk-val',
+    'fish': 'sk-val.fish',
+}
+
+
+class CommandSpec(NamedTuple):
+    help: str
+    commands: List[str]
+    options: List[click.Option]
+
+
+def collect_specs(group, ctx=None) -> Dict[str, CommandSpec]:
+    """Command path (space separated, '' for the root) -> its subcommands and options"""
+    ctx = ctx or click.Context(group, info_name=PROG_NAME)
+    specs = {}
+
+    def walk(command, path):
+        commands = []
+        if isinstance(command, click.MultiCommand):
+            for name in command.list_commands(ctx):
+                subcommand = command.get_command(ctx, name)
+                if subcommand is None or subcommand.hidden:
+                    continue
+                commands.append(name)
+                walk(subcommand, f'{path} {name}'.strip())
+        options = [
+            param for param in command.params
+            if isinstance(param, click.Option) and not param.hidden
+        ]
+        specs[path] = CommandSpec(command.get_short_help_str(), commands, options)
+
+    walk(group, '')
+    return specs
+
+
+def option_names(option):
+    return option.opts + option.secondary_opts
+
+
+def option_choices(option):
+    return [str(choice) for choice in getattr(option.type, 'choices', None) or []]
+
+
+def case_lines(specs):
+    """Shell `case` branches with subcommands, options and option choices of every command"""
+    commands_cases, options_cases, choices_cases = [], [], []
+    for path, spec in sorted(specs.items()):
+        if spec.commands:
+            commands_cases.append(f'        "{path}") echo "{" ".join(spec.commands)}" ;;')
+        names = [name for option in spec.options for name in option_names(option)]
+        options_cases.append(f'        "{path}") echo "{" ".join(names + ["--help"])}" ;;')
+        for option in spec.options:
+            choices = option_choices(option)
+            if choices:
+                for name in option.opts:
+                    choices_cases.append(f'        "{path}|{name}") echo "{" ".join(choices)}" ;;')
+    return commands_cases, options_cases, choices_cases
+
+
+def case_functions(commands_cases, options_cases, choices_cases):
+    return [
+        '_sk_val_commands() {',
+        '    case "$1" in',
+        *commands_cases,
+        '    esac',
+        '}',
+        '',
+        '_sk_val_options() {',
+        '    case "$1" in',
+        *options_cases,
+        '    esac',
+        '}',
+        '',
+        '_sk_val_choices() {',
+        '    case "$1" in',
+        *choices_cases,
+        '    esac',
+        '}',
+        '',
+    ]
+
+
+def render_bash(specs):
+    return '\n'.join([
+        f'# {PROG_NAME} completion, generated by scripts/build.sh',
+        '',
+        *case_functions(*case_lines(specs)),
+        '_sk_val() {',
+        '    local cur prev path word i choices',
+        '    cur="${COMP_WORDS[COMP_CWORD]}"',
+        '    prev="${COMP_WORDS[COMP_CWORD-1]}"',
+        '    path=""',
+        '    for ((i=1; i<COMP_CWORD; i++)); do',
+        '        word="${COMP_WORDS[i]}"',
+        '        if [[ " $(_sk_val_commands "$path") " == *" $word "* ]]; then',
+        '            path="${path:+$path }$word"',
+        '        fi',
+        '    done',
+        '    choices="$(_sk_val_choices "$path|$prev")"',
+        '    if [[ -n "$choices" ]]; then',
+        '        COMPREPLY=($(compgen -W "$choices" -- "$cur"))',
+        '    elif [[ "$cur" == -* ]]; then',
+        '        COMPREPLY=($(compgen -W "$(_sk_val_options "$path")" -- "$cur"))',
+        '    else',
+        '        COMPREPLY=($(compgen -W "$(_sk_val_commands "$path")" -- "$cur"))',
+        '    fi',
+        '}',
+        '',
+        f'complete -o default -F _sk_val {PROG_NAME}',
+        ''
+    ])
+
+
+def zsh_quote(text):
+    return "'" + text.replace("'", "'\\''") + "'"
+
+
+def render_zsh(specs):
+    """
+    Native completion function: zsh autoloads the file from $fpath and runs it
+    as the body of _sk-val on every Tab, so it completes on the first one.
+    `path` is tied to $PATH in zsh, hence `cmd_path`.
+    """
+    described_cases = []
+    for path, spec in sorted(specs.items()):
+        if spec.commands:
+            described = ' '.join(
+                zsh_quote(f'{name}:{specs[f"{path} {name}".strip()].help}')
+                for name in spec.commands
+            )
+            described_cases.append(f'        "{path}") reply=({described}) ;;')
+    return '\n'.join([
+        f'#compdef {PROG_NAME}',
+        f'# {PROG_NAME} completion, generated by scripts/build.sh',
+        '',
+        *case_functions(*case_lines(specs)),
+        '_sk_val_described_commands() {',
+        '    case "$1" in',
+        *described_cases,
+        '    esac',
+        '}',
+        '',
+        'local cur prev cmd_path word i choices',
+        'local -a reply',
+        'cur="${words[CURRENT]}"',
+        'prev="${words[CURRENT-1]}"',
+        'cmd_path=""',
+        'for ((i=2; i<CURRENT; i++)); do',
+        '    word="${words[i]}"',
+        '    if [[ " $(_sk_val_commands "$cmd_path") " == *" $word "* ]]; then',
+        '        cmd_path="${cmd_path:+$cmd_path }$word"',
+        '    fi',
+        'done',
+        'choices="$(_sk_val_choices "$cmd_path|$prev")"',
+        'if [[ -n "$choices" ]]; then',
+        '    compadd -- ${=choices}',
+        'elif [[ "$cur" == -* ]]; then',
+        '    compadd -- ${=$(_sk_val_options "$cmd_path")}',
+        'else',
+        '    reply=()',
+        '    _sk_val_described_commands "$cmd_path"',
+        '    if (( ${#reply} )); then',
+        "        _describe -t commands 'sk-val command' reply",
+        '    else',
+        '        _files',
+        '    fi',
+        'fi',
+        ''
+    ])
+
+
+def fish_escape(text):
+    return text.replace('\\', '\\\\').replace("'", "\\'")
+
+
+def fish_option(option):
+    parts = []
+    for name in option_names(option):
+        if name.startswith('--'):
+            parts.append(f'-l {name[2:]}')
+        elif len(name) == 2:
+            parts.append(f'-s {name[1]}')
+        else:
+            parts.append(f'-o {name[1:]}')
+    choices = option_choices(option)
+    if choices:
+        parts.append(f"-x -a '{' '.join(choices)}'")
+    elif not option.is_flag:
+        parts.append('-r -F')
+    if option.help:
+        parts.append(f"-d '{fish_escape(option.help.splitlines()[0])}'")
+    return ' '.join(parts)
+
+
+def render_fish(specs):
+    commands_cases = []
+    for path, spec in sorted(specs.items()):
+        if spec.commands:
+            commands_cases.append(f"        case '{path}'")
+            commands_cases.append(f"            printf '%s\\n' {' '.join(spec.commands)}")
+    lines = [
+        f'# {PROG_NAME} completion, generated by scripts/build.sh',
+        '',
+        'function __sk_val_commands',
+        '    switch "$argv[1]"',
+        *commands_cases,
+        '    end',
+        'end',
+        '',
+        'function __sk_val_path',
+        '    set -l tokens (commandline -opc)',
+        '    set -e tokens[1]',
+        '    set -l path ""',
+        '    for token in $tokens',
+        '        if contains -- $token (__sk_val_commands "$path")',
+        '            set path (string trim -- "$path $token")',
+        '        end',
+        '    end',
+        '    echo $path',
+        'end',
+        '',
+        'function __sk_val_path_is',
+        '    set -l path (__sk_val_path)',
+        '    test "$path" = "$argv"',
+        'end',
+        '',
+        f'complete -c {PROG_NAME} -f',
+    ]
+    for path, spec in sorted(specs.items()):
+        condition = f"-n '__sk_val_path_is {path}'" if path else "-n '__sk_val_path_is'"
+        for name in spec.commands:
+            help_text = specs[f'{path} {name}'.strip()].help
+            lines.append(
+                f"complete -c {PROG_NAME} {condition} -a {name} -d '{fish_escape(help_text)}'")
+        for option in spec.options:
+            lines.append(f'complete -c {PROG_NAME} {condition} {fish_option(option)}')
+    lines.append('')
+    return '\n'.join(lines)
+
+
+RENDERERS = {
+    'bash': render_bash,
+    'zsh': render_zsh,
+    'fish': render_fish,
+}
+
+
+def write_completion_scripts(group, output_dir):
+    specs = collect_specs(group)
+    os.makedirs(output_dir, exist_ok=True)
+    for shell, filename in COMPLETION_FILES.items():
+        with open(os.path.join(output_dir, filename), 'w') as f:
+            f.write(RENDERERS[shell](specs))
@@ -23,11 +23,15 @@ from pathlib import Path
 
 
 def _get_env():
-    try:
-        sys._MEIPASS
-    except AttributeError:
-        return 'dev'
-    return 'prod'
+    if getattr(sys, 'frozen', False):
+        return 'prod'
+    return 'dev'
+
+
+def _get_bundle_dir():
+    # One-file builds point _MEIPASS to the temp dir they are unpacked to,
+    # one-dir builds - to the directory with the executable libraries
+    return getattr(sys, '_MEIPASS', os.path.dirname(os.path.realpath(sys.executable)))
 
 
 ENV = _get_env()
@@ -36,9 +40,10 @@ CURRENT_FILE_LOCATION = os.path.dirname(os.path.realpath(__file__))
 if ENV == 'dev':
     ROOT_DIR = os.path.join(CURRENT_FILE_LOCATION, os.pardir)
 else:
-    ROOT_DIR = os.path.join(sys._MEIPASS, 'data')
+    ROOT_DIR = os.path.join(_get_bundle_dir(), 'data')
 
 TEXT_FILE = os.path.join(ROOT_DIR, 'text.yml')
+TEXT_BUNDLE_FILE = os.path.join(ROOT_DIR, 'text.bundle')
 
 LONG_LINE = '-' * 50
 SPIN_COLOR = 'yellow'
@@ -49,9 +54,18 @@ SKALE_VAL_CONFIG_FOLDER = os.path.join(HOME_DIR, '.skale-val-cli')
 SKALE_VAL_CONFIG_FILE = os.path.join(SKALE_VAL_CONFIG_FOLDER, 'config.json')
 SKALE_VAL_LEDGER_INFO_FILE = os.path.join(SKALE_VAL_CONFIG_FOLDER, 'ledger_info.json')
 SKALE_VAL_ABI_FILE = os.path.join(SKALE_VAL_CONFIG_FOLDER, 'abi.json')
+SKALE_VAL_ABI_BUNDLE_FILE = os.path.join(SKALE_VAL_CONFIG_FOLDER, 'abi.bundle')
+SKALE_VAL_DAEMON_SOCKET = os.path.join(SKALE_VAL_CONFIG_FOLDER, 'daemon.sock')
+SKALE_VAL_SHELL_HISTORY_FILE = os.path.join(SKALE_VAL_CONFIG_FOLDER, 'shell_history')
+SKALE_VAL_BATCH_JOURNALS_FOLDER = os.path.join(SKALE_VAL_CONFIG_FOLDER, 'batch')
+SKALE_VAL_PAYOUTS_FOLDER = os.path.join(SKALE_VAL_CONFIG_FOLDER, 'payouts')
+SKALE_VAL_SRW_KEEPER_STATE_FILE = os.path.join(SKALE_VAL_CONFIG_FOLDER, 'srw_keeper.json')
+SKALE_VAL_TX_JOURNAL_FILE = os.path.join(SKALE_VAL_CONFIG_FOLDER, 'tx_journal.jsonl')
 SGX_DATA_DIR = os.getenv('SGX_DATA_DIR') or os.path.join(SKALE_VAL_CONFIG_FOLDER, 'sgx')
 SGX_INFO_PATH = os.path.join(SGX_DATA_DIR, 'info.json')
 SGX_SSL_CERTS_PATH = os.path.join(SGX_DATA_DIR, 'ssl')
+# Maximum number of signing requests that are sent to the SGX server at once
+SGX_MAX_CONCURRENT_SIGNS = int(os.getenv('SGX_MAX_CONCURRENT_SIGNS') or 8)
 
 WALLET_TYPES = ['software', 'ledger', 'sgx']
 LEDGER_KEYS_TYPES = ['legacy', 'live']
@@ -59,6 +73,9 @@ LEDGER_KEYS_TYPES = ['legacy', 'live']
 DELEGATION_PERIOD_OPTIONS = ['2']  # strings because of click.Choice design
 
 PERMILLE_MULTIPLIER = 10
+ZERO_ADDRESS = '0x' + '0' * 40
+
+BLOCK_TAGS = ['latest', 'safe', 'finalized']
 
 
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -72,3 +89,56 @@ LOG_FILEPATH = os.path.join(LOG_DATA_PATH, 'sk-val.log')
 DEBUG_LOG_FILEPATH = os.path.join(LOG_DATA_PATH, 'debug-sk-val.log')
 
 D_ADDRESS_INDEX = 0
+
+PROFILE_RPC = os.getenv('PROFILE_RPC')
+RPC_PROFILE_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+RPC_PROFILE_LOG_PREFIX = 'RPC profile: '
+
+RPC_BACKOFF_BASE = 0.5  # seconds
+RPC_BACKOFF_CAP = 10
+RPC_HEDGE_DEFAULT_DELAY = 1
+RPC_HEDGE_MIN_SAMPLES = 20
+RPC_RATE_LIMIT_ERROR_CODES = (-32005, 429)
+
+WS_MAX_MESSAGE_SIZE = 5 * 1024 * 1024
+WS_REQUEST_TIMEOUT = 30
+
+NO_DAEMON = os.getenv('SKALE_VAL_NO_DAEMON')
+# Commands that are never forwarded to the resident daemon (`group command` for subcommands)
+DAEMON_LOCAL_COMMANDS = ['daemon', 'init', 'info', 'shell', 'srw keeper']
+DAEMON_MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+# Commands after which wallets cached by the daemon and the shell are dropped
+WALLET_CONFIG_COMMANDS = ['init', 'sgx init', 'wallet setup-ledger']
+
+SHELL_HISTORY_LENGTH = 1000
+# Commands that can't be started from the interactive shell
+SHELL_EXCLUDED_COMMANDS = ['shell', 'daemon']
+
+# Pipelined transactions, see core/pipeline.py
+PIPELINE_MAX_WORKERS = 16
+PIPELINE_RECOVERY_ROUNDS = 2
+
+# EIP-1559 fee oracle, see core/fee_oracle.py
+FEE_ORACLE_BLOCKS = int(os.getenv('FEE_ORACLE_BLOCKS') or 10)
+FEE_ORACLE_REWARD_PERCENTILE = float(os.getenv('FEE_ORACLE_REWARD_PERCENTILE') or 50)
+# Base fee can grow by 12.5% per block, 1.27 covers two full blocks in a row
+FEE_ORACLE_BASE_FEE_MULTIPLIER = float(os.getenv('FEE_ORACLE_BASE_FEE_MULTIPLIER') or 1.27)
+FEE_ORACLE_MIN_PRIORITY_FEE = int(os.getenv('FEE_ORACLE_MIN_PRIORITY_FEE') or 10 ** 8)  # wei
+FEE_ORACLE_TTL = float(os.getenv('FEE_ORACLE_TTL') or 12)  # seconds
+
+# Transactions sent with --no-wait, see core/tx.py
+TX_RESOLVE_MAX_WORKERS = 16
+TX_WAIT_POLL_INTERVAL = 3  # seconds
+TX_WAIT_TIMEOUT = 600  # seconds
+
+# Bounties not above this amount (SKL) are not withdrawn by `holder sweep-bounties`
+BOUNTY_SWEEP_MIN_AMOUNT = 0
+
+# SRW auto-recharge keeper, see core/srw_keeper.py
+SRW_KEEPER_INTERVAL = 60  # seconds
+SRW_KEEPER_HISTORY_LENGTH = 100
+# Gas reserved for every recharge when the keeper balance is checked
+SRW_KEEPER_RECHARGE_GAS = 100000
+
+# Gas reserved for every transfer of `wallet send-batch` when the ETH balance is checked
+PAYOUT_TRANSFER_GAS = {'eth': 21000, 'skl': 100000}
@@ -1,6 +1,8 @@
 import logging
 import time
 
+from utils.rpc_retry import backoff_delay
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,12 +31,12 @@ class SkaleFilter:
 
     def get_events(self):
         events = None
-        for _ in range(self.retries):
+        for attempt in range(self.retries):
             try:
                 events = self.web3_filter.get_all_entries()
             except Exception as err:
-                self.create_filter()
-                time.sleep(self.timeout)
+                self.web3_filter = self.create_filter()
+                time.sleep(backoff_delay(attempt, base=self.timeout))
                 logger.error(
                     f'Retrieving events from filter failed with {err}'
                 )
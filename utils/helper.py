@@ -17,6 +17,8 @@
 #   You should have received a copy of the GNU Affero General Public License
 #   along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import copy
+import csv
 import functools
 import json
 import logging
@@ -27,19 +29,24 @@ from decimal import Decimal
 
 
 import click
-from web3 import Web3
 
 from core.transaction import TxFee
+from core.tx_journal import recorded_hashes, set_no_wait
+from utils.abi import file_stamp, load_abi
 from utils.exit_codes import CLIExitCodes
-from utils.constants import (SKALE_VAL_CONFIG_FILE, SKALE_VAL_ABI_FILE, PERMILLE_MULTIPLIER,
-                             DEBUG_LOG_FILEPATH)
-from utils.texts import Texts
+from utils.constants import (SKALE_VAL_CONFIG_FILE, PERMILLE_MULTIPLIER,
+                             DEBUG_LOG_FILEPATH, DISABLE_SPIN, SPIN_COLOR)
+from utils.texts import TEXTS
 
 
-TEXTS = Texts()
+logger = logging.getLogger(__name__)
 
+_parsed_files = {}
+_spinners_disabled = bool(DISABLE_SPIN)
 
-logger = logging.getLogger(__name__)
+
+class CsvFileError(Exception):
+    pass
 
 
 def safe_mk_dirs(path):
@@ -54,11 +61,41 @@ def read_json(path):
         return json.loads(data_file.read())
 
 
+def read_json_cached(path):
+    """Parsed JSON file memoized in-process until its mtime or size changes"""
+    stamp = file_stamp(path)
+    if path not in _parsed_files or _parsed_files[path][0] != stamp:
+        _parsed_files[path] = (stamp, read_json(path))
+    return copy.deepcopy(_parsed_files[path][1])
+
+
 def write_json(path, content):
     with open(path, 'w') as outfile:
         json.dump(content, outfile, indent=4)
 
 
+def read_csv_rows(filepath, columns):
+    """
+    Non-empty rows of the CSV file as (line number, {column: value}). Header row
+    (starting with the first column name) and lines starting with # are skipped,
+    missing trailing columns are empty strings.
+    """
+    rows = []
+    with open(filepath, newline='') as csv_file:
+        for line, row in enumerate(csv.reader(csv_file), start=1):
+            row = [cell.strip() for cell in row]
+            if not any(row) or row[0].startswith('#') or (not rows and row[0] == columns[0]):
+                continue
+            if len(row) > len(columns):
+                raise CsvFileError(
+                    f'Line {line}: expected at most {len(columns)} columns '
+                    f'({", ".join(columns)}), got {len(row)}')
+            rows.append((line, dict(zip(columns, row + [''] * (len(columns) - len(row))))))
+    if not rows:
+        raise CsvFileError('File has no rows')
+    return rows
+
+
 def download_file(url, filepath):
     try:
         return urllib.request.urlretrieve(url, filepath)
@@ -70,10 +107,24 @@ def config_exists():
     return os.path.exists(SKALE_VAL_CONFIG_FILE)
 
 
+class Config(dict):
+    """config.json content, `abi` is loaded from the ABI bundle only when accessed"""
+
+    def __missing__(self, key):
+        if key != 'abi':
+            raise KeyError(key)
+        self['abi'] = load_abi()
+        return self['abi']
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
 def read_config():
-    config = read_json(SKALE_VAL_CONFIG_FILE)
-    config['abi'] = read_json(SKALE_VAL_ABI_FILE)
-    return config
+    return Config(read_json_cached(SKALE_VAL_CONFIG_FILE))
 
 
 def get_config():
@@ -81,6 +132,35 @@ def get_config():
         return read_config()
 
 
+class NoSpinner:
+    """Stand-in for yaspin spinner that prints only the messages"""
+
+    def __init__(self, text=''):
+        self.text = text
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def write(self, text):
+        print(text)
+
+
+def disable_spinners():
+    global _spinners_disabled
+    _spinners_disabled = True
+
+
+def spinner(text):
+    """yaspin spinner, plain output with DISABLE_SPIN and in the daemon"""
+    if _spinners_disabled:
+        return NoSpinner(text)
+    from yaspin import yaspin
+    return yaspin(text=text, color=SPIN_COLOR)
+
+
 def abort_if_false(ctx, param, value):
     if not value:
         ctx.abort()
@@ -91,18 +171,21 @@ def to_skl(wei, unit='ether'):  # todo: replace with from_wei()
         return None
     if wei == 0:
         return Decimal(wei)
+    from web3 import Web3
     return Web3.fromWei(Decimal(wei), unit)
 
 
 def from_wei(val, unit='ether'):
     if val is None:
         return None
+    from web3 import Web3
     return Web3.fromWei(Decimal(val), unit)
 
 
 def to_wei(val, unit='ether'):
     if val is None:
         return None
+    from web3 import Web3
     return Web3.toWei(Decimal(val), unit)
 
 
@@ -150,12 +233,18 @@ def transaction_cmd(func):
         '--max-priority-fee',
         help=TEXTS['max_priority_fee']['help']
     )
+    @click.option(
+        '--no-wait',
+        is_flag=True,
+        help=TEXTS['no_wait']['help']
+    )
     @functools.wraps(func)
     def wrapper(
             *args,
             gas_price=None,
             max_priority_fee=None,
             max_fee=None,
+            no_wait=False,
             **kwargs
     ):
         fee = TxFee(
@@ -163,5 +252,20 @@ def transaction_cmd(func):
             max_priority_fee_per_gas=to_wei(max_priority_fee, 'gwei'),
             max_fee_per_gas=to_wei(max_fee, 'gwei')
         )
-        return func(*args, fee=fee, **kwargs)
+        set_no_wait(command_intent(click.get_current_context()) if no_wait else None)
+        try:
+            return func(*args, fee=fee, **kwargs)
+        finally:
+            if no_wait and recorded_hashes():
+                print(f'\n{len(recorded_hashes())} transaction(s) sent without waiting for '
+                      'receipts, check them with < sk-val tx status >')
+            set_no_wait(None)
     return wrapper
+
+
+def command_intent(ctx):
+    """Command and its params recorded to the transaction journal"""
+    return {
+        'command': ' '.join(ctx.command_path.split()[1:]),
+        'params': {key: value for key, value in ctx.params.items() if key != 'no_wait'}
+    }
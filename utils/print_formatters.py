@@ -251,3 +251,214 @@ def print_srw_balance(validator_id, amount, wei=False):
         symbol = 'ETH'
         amount = from_wei(amount)
     print(f'SRW balance for validator with id {validator_id} - {amount} {symbol}')
+
+
+def print_rpc_profile(summary):
+    headers = [
+        'Method',
+        'Calls',
+        'Errors',
+        'Sent (bytes)',
+        'Received (bytes)',
+        'Total (ms)',
+        'p50 (ms)',
+        'p95 (ms)',
+        'Max (ms)'
+    ]
+    rows = []
+    for method, stats in summary.items():
+        rows.append([
+            method,
+            stats['calls'],
+            stats['errors'],
+            stats['request_bytes'],
+            stats['response_bytes'],
+            stats['total_ms'],
+            stats['p50_ms'],
+            stats['p95_ms'],
+            stats['max_ms']
+        ])
+    print('\nRPC profile:')
+    print(Formatter().table(headers, rows))
+
+
+def print_pipeline_results(txs, label_header='Label'):
+    headers = [
+        label_header,
+        'Status',
+        'Nonce',
+        'Transaction hash',
+        'Error'
+    ]
+    rows = []
+    for tx in txs:
+        rows.append([
+            tx.label,
+            tx.status.value if tx.status else '',
+            '' if tx.nonce is None else tx.nonce,
+            tx.tx_hash or '',
+            tx.error or ''
+        ])
+    print(Formatter().table(headers, rows))
+
+
+def print_tx_statuses(entries, statuses):
+    headers = [
+        'Transaction hash',
+        'Command',
+        'Nonce',
+        'Sent',
+        'Status',
+        'Block'
+    ]
+    rows = []
+    for entry, status in zip(entries, statuses):
+        intent = entry.get('intent') or {}
+        rows.append([
+            entry['tx_hash'],
+            ' '.join(filter(None, [intent.get('command'), intent.get('label')])),
+            '' if entry.get('nonce') is None else entry['nonce'],
+            entry.get('timestamp', ''),
+            status['status'],
+            '' if status['block'] is None else status['block']
+        ])
+    print(Formatter().table(headers, rows))
+
+
+def print_delegation_batch_results(rows, txs):
+    headers = [
+        'Line',
+        'Validator Id',
+        'Amount (SKL)',
+        'Delegation period (months)',
+        'Status',
+        'Nonce',
+        'Transaction hash',
+        'Error'
+    ]
+    table_rows = []
+    for row, tx in zip(rows, txs):
+        table_rows.append([
+            row.line,
+            row.validator_id,
+            row.amount,
+            row.delegation_period,
+            tx.status.value if tx.status else '',
+            '' if tx.nonce is None else tx.nonce,
+            tx.tx_hash or '',
+            tx.error or ''
+        ])
+    print(Formatter().table(headers, table_rows))
+    sent = [row.amount for row, tx in zip(rows, txs) if tx.tx_hash]
+    print(f'\n{len(sent)} of {len(rows)} delegation requests sent, total amount: {sum(sent)} SKL')
+
+
+def print_payout_results(rows, txs):
+    headers = [
+        'Line',
+        'Address',
+        'Amount',
+        'Token',
+        'Status',
+        'Nonce',
+        'Transaction hash',
+        'Error'
+    ]
+    table_rows = []
+    for row, tx in zip(rows, txs):
+        table_rows.append([
+            row.line,
+            row.address,
+            row.amount,
+            row.token.upper(),
+            tx.status.value if tx.status else '',
+            '' if tx.nonce is None else tx.nonce,
+            tx.tx_hash or '',
+            tx.error or ''
+        ])
+    print(Formatter().table(headers, table_rows))
+    sent = [row for row, tx in zip(rows, txs) if tx.tx_hash]
+    totals = [
+        f'{sum(row.amount for row in sent if row.token == token)} {token.upper()}'
+        for token in ('eth', 'skl') if any(row.token == token for row in sent)
+    ]
+    print(f'\n{len(sent)} of {len(rows)} transfers sent, total amount: {", ".join(totals) or 0}')
+
+
+def print_srw_keeper_state(state):
+    last_round = state.get('last_round') or {}
+    last_error = state.get('last_error') or {}
+    print('\n'.join([
+        f'Keeper address: {state["address"]}',
+        f'Threshold: {from_wei(state["threshold"])} ETH, target: {from_wei(state["target"])} ETH',
+        f'Started: {state["started"]}',
+        f'Rounds: {state["rounds"]}, recharges: {state["recharges"]}, errors: {state["errors"]}',
+        f'Pending recharges: {len(state.get("pending") or {})}',
+        f'Last round: {last_round.get("time", "")} (block {last_round.get("block", "")})',
+        f'Last error: {last_error["time"]} {last_error["error"]}' if last_error
+        else 'Last error: none'
+    ]) + '\n')
+    headers = [
+        'Validator Id',
+        'SRW balance (ETH)',
+        'Last action',
+        'Last recharge',
+        'Amount (ETH)',
+        'Status',
+        'Transaction hash'
+    ]
+    rows = []
+    for validator_id, validator in sorted(state['validators'].items(),
+                                          key=lambda item: int(item[0])):
+        recharge = validator.get('last_recharge') or {}
+        rows.append([
+            validator_id,
+            from_wei(validator['balance']),
+            validator['last_action'],
+            recharge.get('time', ''),
+            from_wei(recharge['amount']) if recharge else '',
+            recharge.get('status') or '',
+            recharge.get('tx_hash') or ''
+        ])
+    print(Formatter().table(headers, rows))
+
+
+def print_earned_bounties(earned, min_amount):
+    headers = [
+        'Validator Id',
+        'Earned (SKL)',
+        'Action'
+    ]
+    rows = []
+    for validator_id, amount in earned.items():
+        rows.append([
+            validator_id,
+            from_wei(amount),
+            'withdraw' if amount > min_amount else 'skip (below minimum)'
+        ])
+    print(Formatter().table(headers, rows))
+
+
+def print_bounty_sweep_results(earned, txs):
+    headers = [
+        'Validator Id',
+        'Amount (SKL)',
+        'Status',
+        'Nonce',
+        'Transaction hash',
+        'Error'
+    ]
+    rows = []
+    for tx in txs:
+        rows.append([
+            tx.label,
+            from_wei(earned[int(tx.label)]),
+            tx.status.value if tx.status else '',
+            '' if tx.nonce is None else tx.nonce,
+            tx.tx_hash or '',
+            tx.error or ''
+        ])
+    print(Formatter().table(headers, rows))
+    sent = [tx for tx in txs if tx.tx_hash]
+    total = from_wei(sum(earned[int(tx.label)] for tx in sent))
+    print(f'\n{len(sent)} of {len(txs)} bounty withdrawals sent, total amount: {total} SKL')
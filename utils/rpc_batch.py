@@ -0,0 +1,106 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of validator-cli
+#
+#   Copyright (C) 2022 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Contract reads in one JSON-RPC batch request. Calls are decoded without web3 result
+normalizers, so returned addresses are not checksummed.
+"""
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Union
+
+from web3._utils.abi import get_abi_output_types
+from web3._utils.request import make_post_request
+
+from utils.constants import PIPELINE_MAX_WORKERS
+
+logger = logging.getLogger(__name__)
+
+
+class BatchCallError(Exception):
+    pass
+
+
+def block_param(block: Union[int, str]) -> str:
+    return hex(block) if isinstance(block, int) else block
+
+
+def call_request(request_id: int, function, block: Union[int, str],
+                 from_address: Optional[str] = None) -> dict:
+    call = {'to': function.address, 'data': function._encode_transaction_data()}
+    if from_address:
+        call['from'] = from_address
+    return {
+        'jsonrpc': '2.0',
+        'id': request_id,
+        'method': 'eth_call',
+        'params': [call, block_param(block)]
+    }
+
+
+def decode_result(web3, function, result: str):
+    output_types = get_abi_output_types(function.abi)
+    values = web3.codec.decode_abi(output_types, bytes.fromhex(result[2:]))
+    return values[0] if len(values) == 1 else list(values)
+
+
+def send_batch(web3, functions: list, block: Union[int, str],
+               from_address: Optional[str] = None) -> list:
+    provider = web3.provider
+    payload = [
+        call_request(i, function, block, from_address) for i, function in enumerate(functions)
+    ]
+    raw_response = make_post_request(
+        provider.endpoint_uri,
+        json.dumps(payload).encode(),
+        **provider.get_request_kwargs()
+    )
+    responses = json.loads(raw_response)
+    if not isinstance(responses, list):
+        raise BatchCallError(f'Batch requests are not supported: {responses}')
+    by_id = {response.get('id'): response for response in responses}
+    results = []
+    for i, function in enumerate(functions):
+        response = by_id.get(i) or {}
+        if 'result' not in response:
+            raise BatchCallError(f'{function.fn_name} call failed: {response.get("error")}')
+        results.append(decode_result(web3, function, response['result']))
+    return results
+
+
+def batch_call(web3, functions: list, block: Union[int, str] = 'latest',
+               from_address: Optional[str] = None) -> List:
+    """
+    Results of contract functions (e.g. contract.functions.validators(1)) in one request,
+    from_address is msg.sender of the calls.
+    Websocket endpoints and nodes without batch support get concurrent single calls.
+    """
+    if not functions:
+        return []
+    if (getattr(web3.provider, 'endpoint_uri', None) or '').startswith('http'):
+        try:
+            return send_batch(web3, functions, block, from_address)
+        except Exception as err:
+            logger.info(f'Batch call failed, falling back to single calls: {err}')
+    opts = {'from': from_address} if from_address else {}
+    with ThreadPoolExecutor(max_workers=min(len(functions), PIPELINE_MAX_WORKERS)) as executor:
+        return list(executor.map(
+            lambda function: function.call(opts, block_identifier=block), functions))
@@ -0,0 +1,164 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of validator-cli
+#
+#   Copyright (C) 2022 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import atexit
+import bisect
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from utils.constants import RPC_PROFILE_BUCKETS_MS, RPC_PROFILE_LOG_PREFIX
+
+logger = logging.getLogger(__name__)
+
+_profiler = None
+
+
+class MethodStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.latencies = []
+        self.histogram = [0] * (len(RPC_PROFILE_BUCKETS_MS) + 1)
+
+    def add(self, latency_ms, request_bytes, response_bytes, error):
+        self.calls += 1
+        self.errors += int(error)
+        self.request_bytes += request_bytes
+        self.response_bytes += response_bytes
+        self.latencies.append(latency_ms)
+        self.histogram[bisect.bisect_left(RPC_PROFILE_BUCKETS_MS, latency_ms)] += 1
+
+    def percentile(self, pct):
+        latencies = sorted(self.latencies)
+        index = min(len(latencies) - 1, int(len(latencies) * pct / 100))
+        return latencies[index]
+
+    def to_dict(self):
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'request_bytes': self.request_bytes,
+            'response_bytes': self.response_bytes,
+            'total_ms': round(sum(self.latencies), 3),
+            'p50_ms': round(self.percentile(50), 3),
+            'p95_ms': round(self.percentile(95), 3),
+            'max_ms': round(max(self.latencies), 3),
+            'histogram': dict(zip(
+                [f'le_{bucket}' for bucket in RPC_PROFILE_BUCKETS_MS] + ['inf'],
+                self.histogram
+            ))
+        }
+
+
+class RpcProfiler:
+    def __init__(self):
+        self.stats = defaultdict(MethodStats)
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._call_names = None
+
+    def record(self, method, latency_ms, request_bytes, response_bytes, error=False):
+        with self._lock:
+            self.stats[method].add(latency_ms, request_bytes, response_bytes, error)
+
+    def call_name(self, method, params):
+        """Label eth_call/eth_estimateGas with the contract function using the ABI bundle"""
+        if method not in ('eth_call', 'eth_estimateGas') or not params:
+            return method
+        tx = params[0] if isinstance(params[0], dict) else {}
+        to, data = str(tx.get('to') or '').lower(), str(tx.get('data') or '')
+        if self._call_names is None:
+            self._call_names = load_call_names()
+        contract, selectors = self._call_names.get(to, (None, {}))
+        if contract is None:
+            return method
+        return f'{method} {contract}.{selectors.get(data[:10], data[:10])}'
+
+    def middleware(self, make_request, web3):
+        def middleware(method, params):
+            request_bytes = len(json.dumps(params, default=str))
+            start = time.perf_counter()
+            try:
+                response = make_request(method, params)
+            except Exception:
+                self.record(self.call_name(method, params),
+                            (time.perf_counter() - start) * 1000, request_bytes, 0, error=True)
+                raise
+            latency_ms = (time.perf_counter() - start) * 1000
+            self.record(
+                self.call_name(method, params),
+                latency_ms,
+                request_bytes,
+                len(json.dumps(response, default=str)),
+                error='error' in response
+            )
+            return response
+        return middleware
+
+    def summary(self):
+        with self._lock:
+            return {method: stats.to_dict() for method, stats in sorted(self.stats.items())}
+
+    def report(self):
+        from utils.print_formatters import print_rpc_profile
+        summary = self.summary()
+        logger.debug(RPC_PROFILE_LOG_PREFIX + json.dumps({
+            'started': self.started,
+            'duration_ms': round((time.time() - self.started) * 1000, 3),
+            'methods': summary
+        }))
+        if summary:
+            print_rpc_profile(summary)
+
+
+def load_call_names():
+    from utils.abi import load_abi_bundle
+    try:
+        bundle = load_abi_bundle()
+    except (OSError, ValueError) as err:
+        logger.debug(f'Contract calls will not be labeled: {err}')
+        return {}
+    return {
+        address: (contract, bundle['selectors'].get(contract, {}))
+        for address, contract in bundle['addresses'].items()
+    }
+
+
+def enable_rpc_profiling():
+    global _profiler
+    if _profiler is None:
+        _profiler = RpcProfiler()
+        atexit.register(_profiler.report)
+    return _profiler
+
+
+def get_rpc_profiler():
+    return _profiler
+
+
+def instrument_web3(web3):
+    """Attach the RPC profiling middleware to web3 when profiling is enabled"""
+    if _profiler is not None:
+        web3.middleware_onion.inject(_profiler.middleware, name='rpc_profiler', layer=0)
+    return web3
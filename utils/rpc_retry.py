@@ -0,0 +1,184 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of validator-cli
+#
+#   Copyright (C) 2022 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import NamedTuple
+
+from utils.constants import (RPC_BACKOFF_BASE, RPC_BACKOFF_CAP, RPC_HEDGE_DEFAULT_DELAY,
+                             RPC_HEDGE_MIN_SAMPLES, RPC_RATE_LIMIT_ERROR_CODES)
+
+logger = logging.getLogger(__name__)
+
+
+class RetryBudget(NamedTuple):
+    attempts: int
+    time_budget: float  # seconds
+
+
+# Only idempotent reads are retried or hedged, transactions are always sent once
+READ_BUDGETS = {
+    'eth_blockNumber': RetryBudget(5, 15),
+    'eth_chainId': RetryBudget(5, 15),
+    'eth_gasPrice': RetryBudget(5, 15),
+    'eth_feeHistory': RetryBudget(5, 15),
+    'eth_getBalance': RetryBudget(5, 15),
+    'eth_getCode': RetryBudget(5, 15),
+    'eth_getTransactionCount': RetryBudget(5, 15),
+    'eth_call': RetryBudget(5, 30),
+    'eth_estimateGas': RetryBudget(3, 30),
+    'eth_getBlockByNumber': RetryBudget(6, 60),
+    'eth_getBlockByHash': RetryBudget(6, 60),
+    'eth_getTransactionByHash': RetryBudget(6, 60),
+    'eth_getTransactionReceipt': RetryBudget(6, 60),
+    'eth_getLogs': RetryBudget(6, 120),
+}
+
+RETRIABLE_EXCEPTIONS = (OSError, TimeoutError)
+
+
+def backoff_delay(attempt, base=RPC_BACKOFF_BASE, cap=RPC_BACKOFF_CAP):
+    """Exponential backoff with full jitter"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def is_rate_limited(response):
+    error = response.get('error')
+    return isinstance(error, dict) and error.get('code') in RPC_RATE_LIMIT_ERROR_CODES
+
+
+class LatencyTracker:
+    def __init__(self, window=200):
+        self._latencies = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+
+    def add(self, method, latency):
+        with self._lock:
+            self._latencies[method].append(latency)
+
+    def p95(self, method):
+        with self._lock:
+            latencies = sorted(self._latencies[method])
+        if len(latencies) < RPC_HEDGE_MIN_SAMPLES:
+            return RPC_HEDGE_DEFAULT_DELAY
+        return latencies[int(len(latencies) * 0.95) - 1]
+
+
+class RetryPolicy:
+    def __init__(self, budgets=READ_BUDGETS, hedge_provider=None):
+        self.budgets = budgets
+        self.hedge_provider = hedge_provider
+        self.latencies = LatencyTracker()
+        self._executor = ThreadPoolExecutor(max_workers=8) if hedge_provider else None
+
+    def middleware(self, make_request, web3):
+        hedge_request = self.hedge_request_func(web3) if self.hedge_provider else None
+
+        def middleware(method, params):
+            budget = self.budgets.get(method)
+            if budget is None:
+                return make_request(method, params)
+            return self.request_with_retries(make_request, method, params, budget,
+                                             hedge_request)
+        return middleware
+
+    def hedge_request_func(self, web3):
+        """Hedged requests pass the same middlewares as the primary ones below this policy"""
+        middlewares = list(web3.middleware_onion)
+        inner = []
+        if self.middleware in middlewares:
+            inner = middlewares[middlewares.index(self.middleware) + 1:]
+        return self.hedge_provider.request_func(web3, inner)
+
+    def request_with_retries(self, make_request, method, params, budget, hedge_request=None):
+        deadline = time.monotonic() + budget.time_budget
+        for attempt in range(budget.attempts):
+            try:
+                response = self.request(make_request, method, params, hedge_request)
+                if not is_rate_limited(response):
+                    return response
+                error = RuntimeError(f'Rate limited: {response["error"]}')
+            except RETRIABLE_EXCEPTIONS as err:
+                error = err
+            delay = backoff_delay(attempt)
+            last_attempt = attempt + 1 == budget.attempts
+            if last_attempt or time.monotonic() + delay > deadline:
+                logger.error(f'{method} failed after {attempt + 1} attempt(s): {error}')
+                if isinstance(error, RETRIABLE_EXCEPTIONS):
+                    raise error
+                return response
+            logger.warning(f'{method} attempt {attempt + 1} failed: {error}, '
+                           f'retrying in {delay:.2f}s')
+            time.sleep(delay)
+
+    def request(self, make_request, method, params, hedge_request=None):
+        if self._executor is None or hedge_request is None:
+            return self.timed_request(make_request, method, params)
+        primary = self._executor.submit(self.timed_request, make_request, method, params)
+        done, _ = wait([primary], timeout=self.latencies.p95(method))
+        if done:
+            return primary.result()
+        logger.info(f'Hedging {method}, no answer after p95 delay')
+        hedge = self._executor.submit(hedge_request, method, params)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            succeeded = [future for future in done if future.exception() is None]
+            if succeeded:
+                return succeeded[0].result()
+            if not pending:
+                return done.pop().result()
+
+    def timed_request(self, make_request, method, params):
+        start = time.monotonic()
+        response = make_request(method, params)
+        self.latencies.add(method, time.monotonic() - start)
+        return response
+
+
+def remove_http_retries(provider, http_retry_middleware):
+    """HTTPProvider retries on its own provider-level middleware, outside of the onion"""
+    provider.middlewares = [
+        middleware for middleware in provider.middlewares
+        if middleware is not http_retry_middleware
+    ]
+
+
+def add_retry_middleware(web3, hedge_endpoint=None):
+    """Replace web3 default HTTP retries with the jittered backoff and hedging policy"""
+    from web3 import HTTPProvider
+    from web3.middleware import http_retry_request_middleware
+    from skale.utils.web3_utils import get_provider
+
+    try:
+        web3.middleware_onion.remove(http_retry_request_middleware)
+    except ValueError:
+        pass
+    remove_http_retries(web3.provider, http_retry_request_middleware)
+    hedge_provider = None
+    if hedge_endpoint and isinstance(web3.provider, HTTPProvider):
+        hedge_provider = get_provider(hedge_endpoint)
+        remove_http_retries(hedge_provider, http_retry_request_middleware)
+    policy = RetryPolicy(hedge_provider=hedge_provider)
+    web3.middleware_onion.inject(policy.middleware, name='rpc_retry', layer=0)
+    return web3
@@ -17,20 +17,96 @@
 #   You should have received a copy of the GNU Affero General Public License
 #   along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import yaml
-from utils.constants import TEXT_FILE
+import hashlib
+import logging
+import marshal
+import os
+
+from utils.constants import ENV, TEXT_FILE, TEXT_BUNDLE_FILE
+
+logger = logging.getLogger(__name__)
+
+TEXT_BUNDLE_VERSION = 1
+
+_sections = {}
+_catalogue = None
+
+
+def text_file_hash(text_filepath=TEXT_FILE):
+    with open(text_filepath, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def parse_text_file(text_filepath=TEXT_FILE):
+    import yaml
+    with open(text_filepath, 'r') as stream:
+        try:
+            return yaml.safe_load(stream)
+        except yaml.YAMLError as exc:
+            print(exc)
+
+
+def compile_text_bundle(text_filepath=TEXT_FILE, bundle_filepath=TEXT_BUNDLE_FILE):
+    """Compile text.yml into a marshal bundle, each top-level section is stored separately"""
+    texts = parse_text_file(text_filepath)
+    bundle = {
+        'version': TEXT_BUNDLE_VERSION,
+        'source_hash': text_file_hash(text_filepath),
+        'sections': {key: marshal.dumps(value) for key, value in texts.items()}
+    }
+    tmp_filepath = f'{bundle_filepath}.tmp'
+    with open(tmp_filepath, 'wb') as bundle_file:
+        marshal.dump(bundle, bundle_file)
+    os.replace(tmp_filepath, bundle_filepath)
+    return bundle
+
+
+def read_text_bundle(bundle_filepath=TEXT_BUNDLE_FILE, text_filepath=TEXT_FILE):
+    if not os.path.isfile(bundle_filepath):
+        return None
+    try:
+        with open(bundle_filepath, 'rb') as bundle_file:
+            bundle = marshal.load(bundle_file)
+    except (EOFError, ValueError, TypeError) as err:
+        logger.warning(f'Text bundle {bundle_filepath} is corrupted: {err}')
+        return None
+    if not isinstance(bundle, dict) or bundle.get('version') != TEXT_BUNDLE_VERSION:
+        return None
+    # The binary ships text.yml and the bundle from the same build, only sources can go stale
+    if ENV == 'dev' and bundle['source_hash'] != text_file_hash(text_filepath):
+        return None
+    return bundle
+
+
+def load_catalogue():
+    """Section name -> marshalled section, falls back to text.yml if there is no fresh bundle"""
+    global _catalogue
+    if _catalogue is None:
+        bundle = read_text_bundle(TEXT_BUNDLE_FILE, TEXT_FILE)
+        if bundle is not None:
+            _catalogue = bundle['sections']
+        else:
+            _catalogue = {}
+            _sections.update(parse_text_file() or {})
+    return _catalogue
+
+
+def get_section(key):
+    if key not in _sections:
+        catalogue = load_catalogue()
+        if key in _sections:
+            return _sections[key]
+        if key not in catalogue:
+            return None
+        _sections[key] = marshal.loads(catalogue[key])
+    return _sections[key]
 
 
 class Texts():
-    def __init__(self):
-        self._texts = self._load()
+    """Process-wide text catalogue, sections are decoded on the first access"""
 
     def __getitem__(self, key):
-        return self._texts.get(key)
-
-    def _load(self):
-        with open(TEXT_FILE, 'r') as stream:
-            try:
-                return yaml.safe_load(stream)
-            except yaml.YAMLError as exc:
-                print(exc)
+        return get_section(key)
+
+
+TEXTS = Texts()
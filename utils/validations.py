@@ -17,17 +17,44 @@
 #   You should have received a copy of the GNU Affero General Public License
 #   along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import re
 from urllib.parse import urlparse
 
 import click
-from web3.auto import w3
+
+from utils.constants import BLOCK_TAGS
+from utils.keccak import keccak256
+
+HEX_ADDRESS_RE = re.compile(r'^(0x|0X)?[0-9a-fA-F]{40}$')
+
+
+def to_checksum_address(address):
+    """EIP-55 mixed-case checksum encoding of a hex address"""
+    if not isinstance(address, str) or not HEX_ADDRESS_RE.match(address):
+        raise ValueError(f'Unknown format {address}, attempted to normalize to a hex address')
+    address = address[2:].lower() if address[:2] in ('0x', '0X') else address.lower()
+    address_hash = keccak256(address.encode('ascii')).hex()
+    return '0x' + ''.join(
+        char.upper() if int(address_hash[i], 16) >= 8 else char
+        for i, char in enumerate(address)
+    )
+
+
+def is_address(value):
+    """Same rules as web3 isAddress: 40 hex chars, mixed-case ones should match EIP-55"""
+    if not isinstance(value, str) or not HEX_ADDRESS_RE.match(value):
+        return False
+    unprefixed = value[2:] if value[:2] in ('0x', '0X') else value
+    if unprefixed.lower() == unprefixed or unprefixed.upper() == unprefixed:
+        return True
+    return to_checksum_address(value)[2:] == unprefixed
 
 
 class EthAddressType(click.ParamType):
     name = 'eth_address'
 
     def convert(self, value, param, ctx):
-        if w3.isAddress(value):
+        if is_address(value):
             return value
         else:
             self.fail(f'Wrong Ethereum address provided: {value}', param, ctx)
@@ -93,3 +120,22 @@ class UrlType(click.ParamType):
         if not all([result.scheme, result.netloc]):
             self.fail(f'Expected valid url. Got {value}', param, ctx)
         return value
+
+
+class BlockIdentifierType(click.ParamType):
+    name = 'block'
+
+    def convert(self, value, param, ctx):
+        if value in BLOCK_TAGS:
+            return value
+        try:
+            block_number = int(value)
+        except ValueError:
+            block_number = -1
+        if block_number < 0:
+            self.fail(
+                f'Wrong block provided: {value}, should be a block number or one of {BLOCK_TAGS}',
+                param,
+                ctx
+            )
+        return block_number
@@ -20,42 +20,96 @@
 import os
 import sys
 import logging
+from functools import partial
 
-from yaspin import yaspin
 
 from skale import Skale
+from skale.contracts.contract_manager import ContractManager
+from skale.skale_manager import CONTRACTS_INFO, DEBUG_CONTRACTS_INFO
 from skale.utils.exceptions import IncompatibleAbiError
+from skale.utils.helper import get_contracts_info
 from skale.utils.web3_utils import init_web3
-from skale.wallets import LedgerWallet, SgxWallet, Web3Wallet
+from skale.wallets import LedgerWallet, Web3Wallet
 from skale.wallets.ledger_wallet import LedgerCommunicationError
 
+from core.tx_journal import journal_wallet
 from core.wallet_tools import get_ledger_wallet_info
+from core.sgx_pool import PooledSgxWallet
 from core.sgx_tools import get_sgx_info, sgx_inited
-from utils.constants import SGX_SSL_CERTS_PATH, SKALE_VAL_ABI_FILE, SPIN_COLOR
-from utils.helper import get_config, print_err_with_log_path
+from utils.abi import file_stamp, load_abi, read_raw_abi
+from utils.block_pin import apply_block_pin, get_pinned_block
+from utils.constants import SGX_SSL_CERTS_PATH, SKALE_VAL_ABI_FILE
+from utils.helper import config_exists, get_config, print_err_with_log_path, spinner
+from utils.rpc_profiler import instrument_web3
+from utils.rpc_retry import add_retry_middleware
+from utils.ws_subscriptions import get_subscriber, is_ws_endpoint, wait_for_receipt_by_heads
 
 DISABLE_SPIN = os.getenv('DISABLE_SPIN')
 logger = logging.getLogger(__name__)
 
-
-def init_skale(endpoint, wallet=None, disable_spin=DISABLE_SPIN):
+_skale_instances = {}
+_reuse_instances = False
+
+
+class BundledSkale(Skale):
+    """SKALE library instance that takes contract ABIs from the precompiled bundle"""
+
+    def __init__(self, endpoint, abi_filepath, wallet=None, **kwargs):
+        self._abi = load_abi(abi_filepath)
+        self._raw_abi = None
+        super().__init__(endpoint, abi_filepath, wallet, **kwargs)
+
+    def set_contracts_info(self):
+        self.add_lib_contract('contract_manager', ContractManager, self._abi)
+        self._SkaleBase__contracts_info = get_contracts_info(CONTRACTS_INFO)
+        if self._abi.get('time_helpers_with_debug_address'):
+            self._SkaleBase__contracts_info.update(
+                get_contracts_info(DEBUG_CONTRACTS_INFO))
+
+    def _abi_for(self, contract_info):
+        if f'{contract_info.name}_abi' in self._abi or \
+                f'skale_{contract_info.name}_abi' in self._abi:
+            return self._abi
+        # Contracts that are not used by the CLI are not bundled
+        if self._raw_abi is None:
+            self._raw_abi = read_raw_abi(self._abi_filepath)
+        return self._raw_abi
+
+    def __getattr__(self, name):
+        contracts = self._SkaleBase__contracts
+        if name not in contracts:
+            contract_info = self._SkaleBase__contracts_info.get(name)
+            if not contract_info:
+                logger.warning(f'{name} method/contract wasn\'t found')
+                return None
+            self._SkaleBase__init_contract_from_info(
+                self._abi_for(contract_info), contract_info)
+        return contracts[name]
+
+
+def init_skale(endpoint, wallet=None, disable_spin=DISABLE_SPIN, hedge_endpoint=None):
     """Init read-only instance of SKALE library"""
     try:
         if disable_spin:
-            return Skale(endpoint, SKALE_VAL_ABI_FILE, wallet)
-        with yaspin(text="Loading", color=SPIN_COLOR) as sp:
-            sp.text = 'Connecting to SKALE Manager contracts'
-            skale = Skale(endpoint, SKALE_VAL_ABI_FILE, wallet)
-            return skale
+            skale = BundledSkale(endpoint, SKALE_VAL_ABI_FILE, wallet)
+        else:
+            with spinner("Loading") as sp:
+                sp.text = 'Connecting to SKALE Manager contracts'
+                skale = BundledSkale(endpoint, SKALE_VAL_ABI_FILE, wallet)
+        add_retry_middleware(skale.web3, hedge_endpoint)
+        if wallet is None and get_pinned_block() is not None:
+            apply_block_pin(skale.web3, get_pinned_block())
+        instrument_web3(skale.web3)
+        return skale
     except IncompatibleAbiError:
         print('Version of validator-cli you use is incompatible with a given ABI!')
         sys.exit(0)
 
 
 def init_skale_w_wallet(endpoint, wallet_type, pk_file=None, ledger_config={},
-                        disable_spin=DISABLE_SPIN):
+                        disable_spin=DISABLE_SPIN, hedge_endpoint=None):
     """Init instance of SKALE library with wallet"""
-    web3 = init_web3(endpoint)
+    web3 = instrument_web3(add_retry_middleware(init_web3(endpoint), hedge_endpoint))
     if wallet_type == 'ledger':
         try:
             legacy = ledger_config['keys_type'] == 'legacy'
@@ -66,16 +120,24 @@ def init_skale_w_wallet(endpoint, wallet_type, pk_file=None, ledger_config={},
             sys.exit(1)
     elif wallet_type == 'sgx':
         info = get_sgx_info()
-        wallet = SgxWallet(info['server_url'],
-                           web3,
-                           key_name=info['key'],
-                           path_to_cert=SGX_SSL_CERTS_PATH)
+        wallet = PooledSgxWallet(info['server_url'],
+                                 web3,
+                                 key_name=info['key'],
+                                 path_to_cert=SGX_SSL_CERTS_PATH)
     else:
         with open(pk_file, 'r') as f:
             pk = str(f.read()).strip()
         wallet = Web3Wallet(pk, web3)
+    if is_ws_endpoint(endpoint):
+        use_pushed_heads(wallet, web3, endpoint)
+    journal_wallet(wallet, web3)
     print_wallet_info(wallet)
-    return init_skale(endpoint, wallet, disable_spin)
+    return init_skale(endpoint, wallet, disable_spin, hedge_endpoint)
+
+
+def use_pushed_heads(wallet, web3, endpoint):
+    """Wait for transaction receipts on newHeads subscription instead of polling"""
+    wallet.wait = partial(wait_for_receipt_by_heads, web3, get_subscriber(endpoint))
 
 
 def print_wallet_info(wallet):
@@ -83,12 +145,60 @@ def print_wallet_info(wallet):
     print(f'Wallet type: {type(wallet).__name__}')
 
 
+def reuse_skale_instances(enabled=True):
+    """Keep initialized SKALE instances between commands run by one long-lived process"""
+    global _reuse_instances
+    _reuse_instances = enabled
+    if not enabled:
+        _skale_instances.clear()
+
+
+def drop_skale_instances():
+    _skale_instances.clear()
+
+
+def init_resident_skale():
+    """Enable instance reuse and connect the read-only instance in advance"""
+    reuse_skale_instances()
+    if config_exists():
+        init_skale_from_config()
+
+
+def abi_mtime():
+    try:
+        return os.path.getmtime(SKALE_VAL_ABI_FILE)
+    except OSError:
+        return None
+
+
+def get_or_init_skale(key, init):
+    if not _reuse_instances:
+        return init()
+    if key in _skale_instances:
+        return _skale_instances[key]
+    skale = init()
+    # Block tags (e.g. finalized) are resolved once on init so they can't be reused
+    if skale is not None and not isinstance(get_pinned_block(), str):
+        _skale_instances[key] = skale
+    return skale
+
+
 def init_skale_from_config():
     config = get_config()
     if not config:
         print('You should run < init > first')
         return
-    return init_skale(config['endpoint'])
+    key = ('read', config['endpoint'], config.get('hedge_endpoint'), abi_mtime(),
+           get_pinned_block())
+    return get_or_init_skale(key, partial(
+        init_skale, config['endpoint'], hedge_endpoint=config.get('hedge_endpoint')))
+
+
+def sgx_key(wallet_type):
+    if wallet_type != 'sgx':
+        return None
+    info = get_sgx_info()
+    return info['key'], info['server_url']
 
 
 def init_skale_w_wallet_from_config(pk_file=None):
@@ -108,7 +218,14 @@ def init_skale_w_wallet_from_config(pk_file=None):
         print('You should initialize sgx wallet first with <sk-val sgx init>')
         return
 
-    return init_skale_w_wallet(config['endpoint'], config['wallet'], pk_file, ledger_config)
+    key = ('wallet', config['endpoint'], config.get('hedge_endpoint'), abi_mtime(),
+           config['wallet'], pk_file and (os.path.abspath(pk_file), *file_stamp(pk_file)),
+           tuple(sorted(ledger_config.items())), sgx_key(config['wallet']))
+    if _reuse_instances and key in _skale_instances:
+        print_wallet_info(_skale_instances[key].wallet)
+    return get_or_init_skale(key, partial(
+        init_skale_w_wallet, config['endpoint'], config['wallet'], pk_file, ledger_config,
+        hedge_endpoint=config.get('hedge_endpoint')))
 
 
 def get_data_from_config():
@@ -0,0 +1,263 @@
+#   -*- coding: utf-8 -*-
+#
+#   This file is part of validator-cli
+#
+#   Copyright (C) 2022 SKALE Labs
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import itertools
+import json
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+import websockets
+
+from utils.constants import WS_MAX_MESSAGE_SIZE, WS_REQUEST_TIMEOUT
+from utils.rpc_retry import backoff_delay
+
+logger = logging.getLogger(__name__)
+
+_subscribers = {}
+
+
+class SubscriptionError(Exception):
+    pass
+
+
+def is_ws_endpoint(endpoint):
+    return urlparse(endpoint).scheme in ('ws', 'wss')
+
+
+class Subscription:
+    """Events pushed by the node for one eth_subscribe call"""
+
+    def __init__(self, kind, params=None):
+        self.kind = kind
+        self.params = params
+        self.server_id = None
+        self.connection = None
+        self.last_block = None
+        self._events = queue.Queue()
+
+    def push(self, event):
+        block_number = event.get('number') if self.kind == 'newHeads' \
+            else event.get('blockNumber')
+        if block_number is not None:
+            block_number = int(block_number, 16)
+            if self.kind == 'newHeads' and self.last_block is not None and \
+                    block_number <= self.last_block:
+                return
+            self.last_block = max(block_number, self.last_block or 0)
+        self._events.put(event)
+
+    def get(self, timeout=None):
+        """Next event or None if nothing arrived before timeout"""
+        try:
+            return self._events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def __iter__(self):
+        while True:
+            yield self._events.get()
+
+
+class WsSubscriber:
+    """
+    Persistent websocket connection with eth_subscribe support.
+    Reconnects automatically, resubscribes and back-fills blocks and logs
+    missed while the connection was down.
+    """
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self._ids = itertools.count(1)
+        self._subscriptions = []
+        self._pending = {}
+        self._ws = None
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+
+    def subscribe(self, kind, params=None):
+        subscription = Subscription(kind, params)
+        with self._lock:
+            self._subscriptions.append(subscription)
+            self._ensure_started()
+        if self._ws is not None:
+            self._run_coro(self._subscribe(self._ws, subscription))
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+        if self._ws is not None and subscription.server_id:
+            self._run_coro(self._call(self._ws, 'eth_unsubscribe', [subscription.server_id]))
+
+    def close(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, daemon=True)
+        self._thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.create_task(self._keep_connected())
+        self._loop.run_forever()
+
+    def _run_coro(self, coro):
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout=WS_REQUEST_TIMEOUT)
+        except Exception as err:
+            logger.warning(f'Websocket request failed: {err}')
+
+    async def _keep_connected(self):
+        attempt = 0
+        while True:
+            try:
+                async with websockets.connect(self.endpoint, max_size=WS_MAX_MESSAGE_SIZE) as ws:
+                    attempt = 0
+                    await self._session(ws)
+            except (OSError, asyncio.TimeoutError, SubscriptionError,
+                    websockets.exceptions.WebSocketException) as err:
+                logger.warning(f'Websocket connection to {self.endpoint} lost: {err}')
+            except Exception as err:
+                # E.g. a malformed message, the subscriber must keep reconnecting anyway
+                logger.exception(f'Websocket session with {self.endpoint} failed: {err}')
+            finally:
+                self._ws = None
+                for future in self._pending.values():
+                    future.cancel()
+                self._pending.clear()
+            await asyncio.sleep(backoff_delay(attempt))
+            attempt += 1
+
+    async def _session(self, ws):
+        reader = asyncio.ensure_future(self._read(ws))
+        self._ws = ws
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            await self._subscribe(ws, subscription)
+        await reader
+
+    async def _read(self, ws):
+        async for message in ws:
+            data = json.loads(message)
+            if data.get('method') == 'eth_subscription':
+                self._dispatch(data['params'])
+            elif data.get('id') in self._pending:
+                self._pending.pop(data['id']).set_result(data)
+
+    def _dispatch(self, params):
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            if subscription.server_id == params['subscription']:
+                subscription.push(params['result'])
+
+    async def _call(self, ws, method, params):
+        request_id = next(self._ids)
+        future = asyncio.get_event_loop().create_future()
+        self._pending[request_id] = future
+        await ws.send(json.dumps({
+            'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params
+        }))
+        response = await asyncio.wait_for(future, WS_REQUEST_TIMEOUT)
+        if 'error' in response:
+            raise SubscriptionError(f'{method} failed: {response["error"]}')
+        return response['result']
+
+    async def _subscribe(self, ws, subscription):
+        if subscription.connection is ws:
+            return
+        subscription.connection = ws
+        args = [subscription.kind] + ([subscription.params] if subscription.params else [])
+        subscription.server_id = await self._call(ws, 'eth_subscribe', args)
+        if subscription.last_block is not None:
+            await self._backfill(ws, subscription)
+
+    async def _backfill(self, ws, subscription):
+        head = int(await self._call(ws, 'eth_blockNumber', []), 16)
+        from_block = subscription.last_block + 1
+        if from_block > head:
+            return
+        logger.info(f'Back-filling {subscription.kind} for blocks {from_block}-{head}')
+        if subscription.kind == 'newHeads':
+            for number in range(from_block, head + 1):
+                subscription.push(await self._call(
+                    ws, 'eth_getBlockByNumber', [hex(number), False]))
+        elif subscription.kind == 'logs':
+            logs = await self._call(ws, 'eth_getLogs', [{
+                **subscription.params, 'fromBlock': hex(from_block), 'toBlock': hex(head)
+            }])
+            for log in logs:
+                subscription.push(log)
+
+
+def get_subscriber(endpoint):
+    if endpoint not in _subscribers:
+        _subscribers[endpoint] = WsSubscriber(endpoint)
+    return _subscribers[endpoint]
+
+
+@contextmanager
+def pushed_heads(endpoint):
+    """newHeads subscription for websocket endpoints, None for HTTP ones"""
+    if not is_ws_endpoint(endpoint):
+        yield None
+        return
+    subscriber = get_subscriber(endpoint)
+    heads = subscriber.subscribe('newHeads')
+    try:
+        yield heads
+    finally:
+        subscriber.unsubscribe(heads)
+
+
+def wait_for_receipt_by_heads(web3, subscriber, tx_hash, blocks_to_wait=None, timeout=None):
+    """Wait for a receipt checking it on every pushed new head instead of polling"""
+    from skale.transactions.exceptions import TransactionNotMinedError
+    from skale.utils.web3_utils import DEFAULT_BLOCKS_TO_WAIT, MAX_WAITING_TIME, get_receipt
+    from web3.exceptions import TransactionNotFound
+
+    blocks_to_wait = blocks_to_wait or DEFAULT_BLOCKS_TO_WAIT
+    deadline = time.time() + (timeout or MAX_WAITING_TIME)
+    heads = subscriber.subscribe('newHeads')
+    try:
+        for _ in range(blocks_to_wait + 1):
+            try:
+                return get_receipt(web3, tx_hash)
+            except TransactionNotFound:
+                pass
+            if heads.get(timeout=max(0, deadline - time.time())) is None:
+                break
+    finally:
+        subscriber.unsubscribe(heads)
+    raise TransactionNotMinedError(
+        f'Transaction with hash: {tx_hash} not found in {blocks_to_wait} blocks.'
+    )